@@ -1,24 +1,44 @@
 from flask import Flask
-from app.config import Config
+from app.config import get_config
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_bcrypt import Bcrypt
 from flask_mail import Mail
 from flask_jwt_extended import JWTManager
+from app.db_routing import RoutingSession
 
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 bcrypt = Bcrypt()
 mail = Mail()
 jwt = JWTManager()
 
-def create_app(config_class=Config):
-    """Membuat dan mengkonfigurasi instance aplikasi Flask."""
+def create_app(config_class=None, cli=True):
+    """
+    Membuat dan mengkonfigurasi instance aplikasi Flask.
+    Tanpa argumen, profil konfigurasi dipilih dari APP_PROFILE.
+    cli=False dipakai proses server (wsgi.py): Flask-Migrate (yang ikut memuat
+    Alembic) dan perintah CLI kustom tidak dimuat agar worker lebih cepat siap.
+    """
     app = Flask(__name__, static_folder='static', static_url_path='/static')
-    app.config.from_object(config_class)
+    app.config.from_object(config_class or get_config())
+
+    # Logging asinkron (antrean + thread penulis), JSON lines dan sampling per logger
+    from .logs import init_logging
+    init_logging(app)
+
+    # Pool MySQL memakai QueuePool yang mencatat waktu tunggu checkout (lihat /admin/db/health)
+    engine_options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if 'pool_size' in engine_options:
+        from .db_pool import InstrumentedQueuePool
+        engine_options.setdefault('poolclass', InstrumentedQueuePool)
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+
+    # Read replica opsional: GET request membaca dari sini (lihat app/db_routing.py)
+    if app.config.get('DB_REPLICA_URI'):
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        binds['replica'] = {"url": app.config['DB_REPLICA_URI'], **engine_options}
+        app.config['SQLALCHEMY_BINDS'] = binds
 
     db.init_app(app)
-    migrate.init_app(app, db)
     bcrypt.init_app(app)
     mail.init_app(app)
     jwt.init_app(app)
@@ -30,6 +50,8 @@ def create_app(config_class=Config):
     from .routes.user_routes import user_bp
     from .routes.reservations import reservation_bp
     from app.routes.product_routes import product_bp
+    from .routes.checkin_routes import checkin_bp
+    from .routes.batch_routes import batch_bp
 
     # Daftarkan semua blueprint ke aplikasi
     app.register_blueprint(product_bp)
@@ -37,5 +59,32 @@ def create_app(config_class=Config):
     app.register_blueprint(admin_bp)
     app.register_blueprint(user_bp, url_prefix="/user")
     app.register_blueprint(reservation_bp, url_prefix='/reservations')
+    app.register_blueprint(checkin_bp)
+    app.register_blueprint(batch_bp)
     # -------------------------
-    return app
\ No newline at end of file
+
+    # Latensi, status code dan query SQL per endpoint, disajikan di /metrics
+    from .metrics import init_metrics
+    init_metrics(app)
+
+    # Feed perubahan status meja per event untuk stream SSE /user/events/<id>/stream
+    from .pubsub import init_pubsub
+    init_pubsub(app)
+
+    # Kompresi gzip/brotli untuk payload JSON besar (katalog, daftar event)
+    from .compression import init_compression
+    init_compression(app)
+
+    # Handler /static dengan cache header panjang dan dukungan X-Sendfile/X-Accel-Redirect
+    from .static_files import serve_static
+    app.view_functions['static'] = serve_static
+
+    if cli:
+        # Flask-Migrate hanya dibutuhkan untuk perintah `flask db ...`
+        from flask_migrate import Migrate
+        Migrate(app, db)
+
+        # Perintah CLI kustom (flask data ...)
+        from .cli import register_cli
+        register_cli(app)
+    return app
@@ -0,0 +1,85 @@
+# /app/archive.py
+
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, literal, select
+from app import db
+from app.models import (
+    Event, EventTable, Reservation, OrderItem, Ticket,
+    ReservationArchive, OrderItemArchive, TicketArchive,
+)
+
+BATCH_SIZE = 1000
+
+
+def _copy(source, target, where, now):
+    """INSERT INTO target (...) SELECT ... FROM source WHERE ...; kolom arsip = kolom asli + archived_at."""
+    columns = [column.name for column in source.__table__.columns]
+    query = select(*[source.__table__.c[name] for name in columns], literal(now)).where(where)
+    return target.__table__.insert().from_select(columns + ['archived_at'], query)
+
+
+def _archive_reservations(conn, ids, now):
+    conn.execute(_copy(Reservation, ReservationArchive, Reservation.id.in_(ids), now))
+    conn.execute(_copy(OrderItem, OrderItemArchive, OrderItem.reservation_id.in_(ids), now))
+    items = conn.execute(delete(OrderItem).where(OrderItem.reservation_id.in_(ids))).rowcount
+    conn.execute(delete(Reservation).where(Reservation.id.in_(ids)))
+    return items
+
+
+def _archive_tickets(conn, ids, now):
+    conn.execute(_copy(Ticket, TicketArchive, Ticket.id.in_(ids), now))
+    conn.execute(delete(Ticket).where(Ticket.id.in_(ids)))
+
+
+def archive_past_events(retention_days, batch_size=BATCH_SIZE, dry_run=False, progress=None):
+    """
+    Memindahkan reservasi (beserta order item) dan tiket milik event yang tanggalnya
+    lebih lama dari `retention_days` hari ke tabel *_archive.
+
+    Setiap batch berjalan dalam transaksinya sendiri (salin lalu hapus), jadi lock di
+    tabel aktif hanya dipegang sebentar dan job bisa dihentikan/diulang kapan saja.
+    Mengembalikan jumlah baris yang dipindahkan per tabel.
+    """
+    cutoff = datetime.utcnow().date() - timedelta(days=retention_days)
+    old_reservations = (
+        select(Reservation.id)
+        .join(EventTable, EventTable.id == Reservation.event_table_id)
+        .join(Event, Event.id == EventTable.event_id)
+        .where(Event.event_date < cutoff)
+        .order_by(Reservation.id)
+    )
+    old_tickets = (
+        select(Ticket.id)
+        .join(Event, Event.id == Ticket.event_id)
+        .where(Event.event_date < cutoff)
+        .order_by(Ticket.id)
+    )
+
+    counts = {"reservations": 0, "order_items": 0, "tickets": 0}
+    start = time.perf_counter()
+    if dry_run:
+        with db.engine.connect() as conn:
+            counts["reservations"] = conn.execute(select(func.count()).select_from(old_reservations.subquery())).scalar()
+            counts["order_items"] = conn.execute(
+                select(func.count(OrderItem.id)).where(OrderItem.reservation_id.in_(old_reservations.order_by(None)))
+            ).scalar()
+            counts["tickets"] = conn.execute(select(func.count()).select_from(old_tickets.subquery())).scalar()
+        return counts
+
+    for key, query, archive in (("reservations", old_reservations, _archive_reservations),
+                                ("tickets", old_tickets, _archive_tickets)):
+        while True:
+            with db.engine.begin() as conn:
+                ids = conn.execute(query.limit(batch_size)).scalars().all()
+                if not ids:
+                    break
+                items = archive(conn, ids, datetime.utcnow())
+            counts[key] += len(ids)
+            if items:
+                counts["order_items"] += items
+            if progress:
+                progress(counts)
+
+    counts["seconds"] = round(time.perf_counter() - start, 2)
+    return counts
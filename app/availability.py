@@ -0,0 +1,40 @@
+# /app/availability.py
+
+from sqlalchemy import case, func, select
+from app import db
+from app.models import EventTable, EventTableStatus, Table
+
+EMPTY_SUMMARY = {"total_tables": 0, "available_tables": 0, "booked_tables": 0, "min_price": None}
+
+
+def summarize_tables(event_ids):
+    """
+    Ringkasan meja per event dalam satu query GROUP BY:
+    {event_id: {total_tables, available_tables, booked_tables, min_price}}.
+    min_price adalah harga termurah di antara meja yang masih tersedia (None jika habis).
+    Event tanpa meja tidak ada di hasil; pakai EMPTY_SUMMARY sebagai default.
+    """
+    if not event_ids:
+        return {}
+    available = EventTable.status == EventTableStatus.AVAILABLE
+    rows = db.session.execute(
+        select(
+            EventTable.event_id,
+            func.count(EventTable.id),
+            func.sum(case((available, 1), else_=0)),
+            func.sum(case((EventTable.status == EventTableStatus.BOOKED, 1), else_=0)),
+            func.min(case((available, Table.price))),
+        )
+        .join(Table, Table.id == EventTable.table_id)
+        .where(EventTable.event_id.in_(event_ids))
+        .group_by(EventTable.event_id)
+    )
+    return {
+        event_id: {
+            "total_tables": total,
+            "available_tables": int(available_count or 0),
+            "booked_tables": int(booked_count or 0),
+            "min_price": min_price,
+        }
+        for event_id, total, available_count, booked_count, min_price in rows
+    }
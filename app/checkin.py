@@ -0,0 +1,220 @@
+# /app/checkin.py
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import update, select, bindparam
+from . import db
+from .models import Ticket
+from .ticket_codes import is_signed_code, verify_ticket, event_key
+
+# Hasil scan tiket
+CHECKED_IN = "checked_in"
+ALREADY_USED = "already_used"
+NOT_FOUND = "not_found"
+WRONG_EVENT = "wrong_event"
+EXPIRED = "expired"
+INVALID = "invalid"
+
+SYNC_CHUNK_SIZE = 500
+
+
+class ScannedCodes:
+    """
+    Set kode tiket yang sudah dipakai, per event, disimpan di memori proses.
+    Dipakai untuk menolak scan ulang tanpa menyentuh database. Database tetap
+    menjadi sumber kebenaran: set ini hanya pernah ditambah, tidak pernah dipakai
+    untuk menerima tiket.
+    """
+
+    def __init__(self, max_events=32):
+        self.max_events = max_events
+        self._events = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _codes_for(self, event_id):
+        with self._lock:
+            codes = self._events.get(event_id)
+            if codes is not None:
+                self._events.move_to_end(event_id)
+                return codes
+
+        # Pemanasan: muat semua kode yang sudah dipakai untuk event ini sekali saja
+        loaded = set(db.session.scalars(
+            select(Ticket.ticket_code).where(Ticket.event_id == event_id, Ticket.is_used == True)
+        ))
+        with self._lock:
+            codes = self._events.setdefault(event_id, loaded)
+            self._events.move_to_end(event_id)
+            while len(self._events) > self.max_events:
+                self._events.popitem(last=False)
+            return codes
+
+    def contains(self, event_id, ticket_code):
+        return ticket_code in self._codes_for(event_id)
+
+    def add(self, event_id, ticket_code):
+        self._codes_for(event_id).add(ticket_code)
+
+    def forget(self, event_id=None):
+        with self._lock:
+            if event_id is None:
+                self._events.clear()
+            else:
+                self._events.pop(event_id, None)
+
+
+scanned_codes = ScannedCodes()
+
+
+def check_in(event_id, ticket_code, now=None):
+    """
+    Menandai tiket sebagai terpakai dengan satu UPDATE bersyarat pada ticket_code
+    (unik), sehingga dua scanner yang men-scan tiket yang sama bersamaan tidak
+    mungkin sama-sama berhasil. Mengembalikan (status, detail).
+    """
+    now = now or datetime.utcnow()
+
+    # Kode bertanda tangan bisa ditolak tanpa menyentuh database
+    if is_signed_code(ticket_code):
+        claims = verify_ticket(ticket_code)
+        if claims is None:
+            return INVALID, {"ticket_code": ticket_code}
+        if claims["event_id"] != event_id:
+            return WRONG_EVENT, {"ticket_code": ticket_code, "event_id": claims["event_id"]}
+        if claims["expired"]:
+            return EXPIRED, {"ticket_code": ticket_code}
+
+    if scanned_codes.contains(event_id, ticket_code):
+        return ALREADY_USED, {"ticket_code": ticket_code}
+
+    result = db.session.execute(
+        update(Ticket)
+        .where(
+            Ticket.ticket_code == ticket_code,
+            Ticket.event_id == event_id,
+            Ticket.is_used == False,
+            Ticket.expires_at > now,
+        )
+        .values(is_used=True, used_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+    if result.rowcount == 1:
+        scanned_codes.add(event_id, ticket_code)
+        return CHECKED_IN, {"ticket_code": ticket_code, "used_at": now.isoformat()}
+
+    # Jalur gagal: cari tahu alasannya (jarang terjadi dibanding jalur sukses)
+    ticket = db.session.execute(
+        select(Ticket.event_id, Ticket.is_used, Ticket.used_at, Ticket.expires_at)
+        .where(Ticket.ticket_code == ticket_code)
+    ).first()
+
+    if ticket is None:
+        return NOT_FOUND, {"ticket_code": ticket_code}
+    if ticket.event_id != event_id:
+        return WRONG_EVENT, {"ticket_code": ticket_code, "event_id": ticket.event_id}
+    if ticket.is_used:
+        scanned_codes.add(event_id, ticket_code)
+        return ALREADY_USED, {
+            "ticket_code": ticket_code,
+            "used_at": ticket.used_at.isoformat() if ticket.used_at else None,
+        }
+    return EXPIRED, {"ticket_code": ticket_code, "expires_at": ticket.expires_at.isoformat()}
+
+
+def build_manifest(event):
+    """
+    Manifest untuk perangkat scanner satu event: kunci HMAC event tersebut dan
+    daftar tiket yang masih berlaku. Dengan ini scanner bisa memverifikasi tiket
+    secara lokal saat jaringan lambat, lalu mengirim hasil scan lewat sync_scans.
+    """
+    rows = db.session.execute(
+        select(Ticket.id, Ticket.is_used).where(Ticket.event_id == event.id)
+    ).all()
+    return {
+        "event_id": event.id,
+        "event_name": event.name,
+        "generated_at": datetime.utcnow().isoformat(),
+        "signature": {
+            "algorithm": "HMAC-SHA256",
+            "key": event_key(event.id).hex(),
+            "code_format": "TIX-<base32(ticket_id:u32 | event_id:u32 | expires_at:u32 | mac[:12])>",
+        },
+        "valid_ticket_ids": [row.id for row in rows if not row.is_used],
+        "used_ticket_ids": [row.id for row in rows if row.is_used],
+    }
+
+
+def sync_scans(event_id, scans):
+    """
+    Menyimpan hasil scan offline dari scanner secara batch.
+    scans: list of {"ticket_code": ..., "used_at": datetime naive UTC}.
+    Tiket yang ternyata sudah dipakai di gerbang lain dilaporkan sebagai konflik (kecuali
+    used_at-nya sama persis dengan waktu scan ini, yaitu batch yang dikirim ulang),
+    tiket yang tidak ada (dihapus/diarsipkan) ditolak dengan alasan not_found.
+    """
+    report = {"accepted": 0, "conflicts": [], "rejected": []}
+    valid = {}
+    for scan in scans:
+        code = scan["ticket_code"]
+        claims = verify_ticket(code) if is_signed_code(code) else None
+        if claims is None or claims["event_id"] != event_id:
+            report["rejected"].append({"ticket_code": code, "reason": INVALID})
+            continue
+        # Dibulatkan ke detik seperti kolom DATETIME MySQL, agar bisa dicocokkan setelah UPDATE
+        scanned_at = scan["used_at"].replace(microsecond=0)
+        # Jika satu tiket di-scan beberapa kali, yang tercatat adalah scan pertama
+        if code not in valid or scanned_at < valid[code]:
+            valid[code] = scanned_at
+
+    codes = list(valid)
+    for start in range(0, len(codes), SYNC_CHUNK_SIZE):
+        chunk = codes[start:start + SYNC_CHUNK_SIZE]
+        already_used = dict(db.session.execute(
+            select(Ticket.ticket_code, Ticket.used_at)
+            .where(Ticket.ticket_code.in_(chunk), Ticket.is_used == True)
+        ).all())
+        pending = [
+            {"code": code, "scanned_at": valid[code]}
+            for code in chunk if code not in already_used
+        ]
+        stored = {}
+        if pending:
+            db.session.execute(
+                update(Ticket.__table__)
+                .where(Ticket.__table__.c.ticket_code == bindparam('code'), Ticket.__table__.c.is_used == False)
+                .values(is_used=True, used_at=bindparam('scanned_at')),
+                pending,
+            )
+            # Baca ulang (locking read, agar melihat commit gerbang lain di antara SELECT dan
+            # UPDATE): hanya tiket yang used_at-nya sama dengan waktu scan ini yang diterima
+            stored = dict(db.session.execute(
+                select(Ticket.ticket_code, Ticket.used_at)
+                .where(Ticket.ticket_code.in_([row["code"] for row in pending]))
+                .with_for_update()
+            ).all())
+
+        for row in pending:
+            code = row["code"]
+            if code not in stored:
+                report["rejected"].append({"ticket_code": code, "reason": NOT_FOUND})
+            elif stored[code] == row["scanned_at"]:
+                scanned_codes.add(event_id, code)
+                report["accepted"] += 1
+            else:
+                already_used[code] = stored[code]
+        for code, used_at in already_used.items():
+            scanned_codes.add(event_id, code)
+            # Batch yang sama dikirim ulang (mis. respons sebelumnya tidak sampai ke scanner):
+            # tiket tercatat dengan waktu scan ini sendiri, jadi tetap dihitung diterima
+            if used_at == valid[code]:
+                report["accepted"] += 1
+                continue
+            report["conflicts"].append({
+                "ticket_code": code,
+                "used_at": used_at.isoformat() if used_at else None,
+            })
+    db.session.commit()
+    return report
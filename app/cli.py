@@ -0,0 +1,293 @@
+# /app/cli.py
+
+import json
+import os
+import click
+from concurrent.futures import as_completed
+from flask import current_app
+from flask.cli import AppGroup
+from . import db
+from .importer import import_rows, IMPORTERS, CHUNK_SIZE
+from .images import render_variants, forget_variants, VARIANT_FOLDER
+from .models import Product, Event, Ticket
+from .storage import dedupe_folder, prune_orphans, ORPHAN_GRACE_SECONDS
+from .qr import pregenerate, enforce_cache_limit
+from .workers import get_process_pool
+from .startup import profile_startup
+from .datagen import PRESETS, CHUNK_SIZE as SEED_CHUNK_SIZE, DEFAULT_PASSWORD, generate, reset_database
+from .query_budget import check_query_budgets, DEFAULT_SCALES
+from .sync import prune_tombstones
+from .archive import archive_past_events, BATCH_SIZE as ARCHIVE_BATCH_SIZE
+
+data_cli = AppGroup('data', help="Perintah pengelolaan data (import massal, dll).")
+images_cli = AppGroup('images', help="Perintah pengelolaan gambar upload.")
+tickets_cli = AppGroup('tickets', help="Perintah pengelolaan tiket.")
+
+
+@data_cli.command('import')
+@click.argument('kind', type=click.Choice(sorted(IMPORTERS)))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--dry-run', is_flag=True, help="Hanya validasi, tidak menyimpan ke database.")
+@click.option('--chunk-size', default=CHUNK_SIZE, show_default=True, help="Jumlah baris per batch insert.")
+def import_command(kind, path, dry_run, chunk_size):
+    """Import meja/produk dari file CSV, JSON, atau JSONL."""
+    with open(path, 'rb') as f:
+        try:
+            report = import_rows(kind, f, path, dry_run=dry_run, chunk_size=chunk_size)
+        except (ValueError, UnicodeDecodeError) as e:
+            db.session.rollback()
+            raise click.ClickException(f"File tidak dapat dibaca: {e}")
+
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+
+    click.echo(json.dumps(report, indent=2, ensure_ascii=False))
+    if report["error_count"]:
+        click.echo(f"{report['error_count']} baris dilewati karena tidak valid.", err=True)
+
+@data_cli.command('seed')
+@click.option('--preset', type=click.Choice(list(PRESETS)), default='small', show_default=True,
+              help="Volume data (large = 1 juta user, 10 ribu event, jutaan reservasi).")
+@click.option('--users', type=int, help="Override jumlah user.")
+@click.option('--events', type=int, help="Override jumlah event.")
+@click.option('--tables', type=int, help="Override jumlah meja.")
+@click.option('--tables-per-event', type=int, help="Override jumlah meja per event.")
+@click.option('--products', type=int, help="Override jumlah produk.")
+@click.option('--booking-rate', type=float, help="Override proporsi meja-event yang dipesan (0-1).")
+@click.option('--seed', 'seed_value', default=42, show_default=True, help="Seed RNG; hasil selalu sama untuk seed yang sama.")
+@click.option('--chunk-size', default=SEED_CHUNK_SIZE, show_default=True, help="Jumlah baris per batch insert.")
+@click.option('--yes', is_flag=True, help="Jangan minta konfirmasi sebelum mengosongkan database.")
+def seed_command(preset, users, events, tables, tables_per_event, products, booking_rate, seed_value, chunk_size, yes):
+    """Mengosongkan database lalu mengisinya dengan data sintetis dalam jumlah besar."""
+    overrides = {
+        "users": users, "events": events, "tables": tables, "tables_per_event": tables_per_event,
+        "products": products, "booking_rate": booking_rate,
+    }
+    volume = PRESETS[preset]._replace(**{k: v for k, v in overrides.items() if v is not None})
+    if volume.users < 1 or volume.tables < 1 or volume.products < 1:
+        raise click.BadParameter("users, tables dan products minimal 1")
+
+    if not yes:
+        click.confirm(f"Semua data di {db.engine.url.render_as_string(hide_password=True)} akan dihapus. Lanjutkan?", abort=True)
+
+    click.echo(f"Volume: {volume._asdict()}")
+    reset_database()
+
+    def progress(counts):
+        click.echo("\r" + ", ".join(f"{table}: {count}" for table, count in counts.items()), nl=False)
+
+    counts = generate(volume, seed=seed_value, chunk_size=chunk_size, progress=progress)
+    click.echo("")
+    click.echo(json.dumps(counts, indent=2))
+    click.echo(f"Login admin: admin@example.com / {DEFAULT_PASSWORD}; user: user1@example.com / {DEFAULT_PASSWORD}")
+
+
+@data_cli.command('prune-tombstones')
+@click.option('--days', type=int, help="Masa simpan tombstone (default SYNC_TOMBSTONE_RETENTION_DAYS).")
+def prune_tombstones_command(days):
+    """Menghapus tombstone delta sync yang sudah melewati masa simpan."""
+    if days is None:
+        days = current_app.config.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30)
+    count = prune_tombstones(days)
+    click.echo(f"{count} tombstone lebih tua dari {days} hari dihapus.")
+
+
+@data_cli.command('archive')
+@click.option('--retention-days', type=int, help="Event yang lebih lama dari ini diarsipkan (default ARCHIVE_RETENTION_DAYS).")
+@click.option('--batch-size', default=ARCHIVE_BATCH_SIZE, show_default=True, help="Jumlah baris per transaksi.")
+@click.option('--dry-run', is_flag=True, help="Hanya hitung baris yang akan dipindahkan.")
+def archive_command(retention_days, batch_size, dry_run):
+    """Memindahkan reservasi, order item dan tiket event lama ke tabel arsip."""
+    if retention_days is None:
+        retention_days = current_app.config.get('ARCHIVE_RETENTION_DAYS', 180)
+
+    def progress(counts):
+        click.echo("\r" + ", ".join(f"{table}: {count}" for table, count in counts.items()), nl=False)
+
+    counts = archive_past_events(retention_days, batch_size=batch_size, dry_run=dry_run, progress=progress)
+    click.echo("")
+    click.echo(json.dumps(counts, indent=2))
+
+
+
+@images_cli.command('rebuild-variants')
+@click.option('--force', is_flag=True, help="Buat ulang varian meskipun sudah ada.")
+def rebuild_variants_command(force):
+    """Membuat varian thumb/medium/full untuk semua gambar produk dan event yang sudah ada."""
+    paths = []
+    for kind in ('products', 'events'):
+        folder = current_app.config['UPLOAD_FOLDERS'][kind]
+        if not os.path.isdir(folder):
+            continue
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if not os.path.isfile(path):
+                continue
+            manifest = os.path.join(folder, VARIANT_FOLDER, f"{os.path.splitext(name)[0]}.json")
+            if force or not os.path.exists(manifest):
+                paths.append(path)
+
+    pool = get_process_pool(current_app.config.get('WORKER_PROCESSES') or None)
+    futures = {pool.submit(render_variants, path): path for path in paths}
+    failed = 0
+    for future in as_completed(futures):
+        error = future.exception()
+        if error:
+            failed += 1
+            click.echo(f"Gagal memproses {futures[future]}: {error}", err=True)
+    click.echo(f"{len(paths) - failed} gambar diproses, {failed} gagal.")
+
+
+@images_cli.command('dedupe')
+@click.option('--dry-run', is_flag=True, help="Tampilkan perubahan tanpa menyentuh file atau database.")
+def dedupe_command(dry_run):
+    """
+    Migrasi satu kali ke penyimpanan berbasis hash isi: menggabungkan file gambar
+    yang isinya sama lalu memperbarui image_url produk dan event.
+    """
+    mappings = {}
+    stale_files = []
+    for kind, model in (('products', Product), ('events', Event)):
+        mapping, stale = dedupe_folder(kind, dry_run=dry_run)
+        mappings[model] = mapping
+        stale_files.extend(stale)
+        if dry_run:
+            for old_url, new_url in mapping.items():
+                click.echo(f"[{kind}] {old_url} -> {new_url}")
+
+    if dry_run:
+        click.echo("Dry run: tidak ada perubahan.")
+        return
+
+    updated = 0
+    for model, mapping in mappings.items():
+        for old_url, new_url in mapping.items():
+            updated += model.query.filter(model.image_url == old_url).update(
+                {model.image_url: new_url}, synchronize_session=False
+            )
+    db.session.commit()
+
+    # File lama (dan variannya) baru dihapus setelah database menunjuk ke file baru
+    for model, mapping in mappings.items():
+        for old_url in mapping:
+            forget_variants(old_url)
+    for path in stale_files:
+        os.remove(path)
+
+    unique_files = sum(len(set(mapping.values())) for mapping in mappings.values())
+    click.echo(
+        f"{len(stale_files)} file diganti namanya menjadi {unique_files} file unik, "
+        f"{updated} image_url diperbarui. Jalankan 'flask images rebuild-variants' untuk membuat ulang varian."
+    )
+
+
+@images_cli.command('prune-orphans')
+@click.option('--grace-minutes', default=ORPHAN_GRACE_SECONDS // 60, show_default=True,
+              help="File yang diubah dalam rentang ini dilewati (upload yang belum commit).")
+@click.option('--dry-run', is_flag=True, help="Hanya tampilkan file yang akan dihapus.")
+def prune_orphans_command(grace_minutes, dry_run):
+    """Menghapus gambar upload yang tidak lagi dipakai produk/event. Jalankan berkala (cron)."""
+    total = 0
+    for kind in ('products', 'events'):
+        removed = prune_orphans(kind, grace_seconds=grace_minutes * 60, dry_run=dry_run)
+        total += len(removed)
+        for url in removed:
+            click.echo(f"[{kind}] {url}")
+    click.echo(f"{total} file yatim {'akan dihapus' if dry_run else 'dihapus'}.")
+
+
+@tickets_cli.command('pregenerate-qr')
+@click.option('--event-id', type=int, help="Hanya tiket untuk event ini.")
+def pregenerate_qr_command(event_id):
+    """Membuat QR semua tiket yang belum dipakai, misalnya sebelum pintu dibuka."""
+    query = db.session.query(Ticket.ticket_code).filter(Ticket.is_used == False)
+    if event_id:
+        query = query.filter(Ticket.event_id == event_id)
+    codes = [code for (code,) in query]
+
+    failed = 0
+    rendered = 0
+    for future in pregenerate(codes):
+        try:
+            rendered += future.result()
+        except Exception as e:
+            failed += 1
+            click.echo(f"Batch gagal: {e}", err=True)
+    enforce_cache_limit(force=True)
+    click.echo(f"{len(codes)} tiket diperiksa, {rendered} QR baru dibuat, {failed} batch gagal.")
+
+
+@click.command('startup-profile')
+@click.option('--top', default=15, show_default=True, help="Jumlah modul terlambat yang ditampilkan.")
+@click.option('--repeat', default=3, show_default=True, help="Jumlah percobaan; yang tercepat dipakai.")
+@click.option('--cli/--server', 'with_cli', default=False, show_default=True,
+              help="Ukur create_app() versi CLI (dengan Flask-Migrate) atau versi server.")
+@click.option('--budget', type=float, help="Batas waktu create_app() dalam ms; exit code 1 jika terlampaui.")
+def startup_profile_command(top, repeat, with_cli, budget):
+    """Laporan cold start create_app() berbasis `python -X importtime`."""
+    try:
+        report = profile_startup(cli=with_cli, repeat=repeat)
+    except RuntimeError as e:
+        raise click.ClickException(f"create_app() gagal dijalankan: {e}")
+
+    # Waktu import dijumlahkan per paket teratas (sqlalchemy, flask, alembic, ...)
+    packages = {}
+    for m in report["modules"]:
+        package = m["module"].split('.')[0]
+        packages[package] = packages.get(package, 0.0) + m["self_ms"]
+    click.echo(f"{'paket':40} {'total ms':>14}")
+    for package, total in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        click.echo(f"{package:40} {total:14.1f}")
+
+    slowest = sorted(report["modules"], key=lambda m: m["self_ms"], reverse=True)
+    click.echo(f"\n{'modul (waktu sendiri)':40} {'self ms':>14}")
+    for m in slowest[:top]:
+        click.echo(f"{m['module']:40} {m['self_ms']:14.1f}")
+
+    timings = ", ".join(f"{t:.0f}" for t in report["timings_ms"])
+    click.echo(f"\ncreate_app(cli={with_cli}): {report['create_app_ms']:.0f} ms (percobaan: {timings})")
+
+    budget = budget if budget is not None else current_app.config.get('STARTUP_BUDGET_MS')
+    if budget and report["create_app_ms"] > budget:
+        click.echo(f"Melebihi batas {budget:.0f} ms.", err=True)
+        raise SystemExit(1)
+
+@click.command('check-queries')
+@click.option('--scale', 'scales', type=int, multiple=True,
+              help=f"Skala data yang dibandingkan (default: {', '.join(map(str, DEFAULT_SCALES))}).")
+def check_queries_command(scales):
+    """
+    Guard N+1: menghitung query SQL per endpoint di database SQLite sementara
+    pada beberapa skala data. Exit code 1 jika jumlah query bertambah seiring
+    jumlah data atau melebihi budget di app/query_budget.py.
+    """
+    scales = tuple(sorted(set(scales))) or DEFAULT_SCALES
+    if len(scales) < 2:
+        raise click.BadParameter("minimal dua skala berbeda", param_hint='--scale')
+    report = check_query_budgets(scales)
+
+    header = " ".join(f"{'n=' + str(scale):>6}" for scale in scales)
+    click.echo(f"{'endpoint':56} {header} {'budget':>6}  status")
+    failed = 0
+    for row in report:
+        counts = " ".join(f"{row['counts'][scale]:6d}" for scale in scales)
+        status = "OK" if not row["problems"] else "; ".join(row["problems"])
+        failed += bool(row["problems"])
+        label = f"{row['endpoint']}?{row['query']}" if row["query"] else row["endpoint"]
+        click.echo(f"{label:56} {counts} {row['budget']:6d}  {status}")
+
+    if failed:
+        click.echo(f"{failed} endpoint bermasalah.", err=True)
+        raise SystemExit(1)
+
+
+
+def register_cli(app):
+    """Mendaftarkan semua perintah CLI kustom ke aplikasi."""
+    app.cli.add_command(data_cli)
+    app.cli.add_command(images_cli)
+    app.cli.add_command(tickets_cli)
+    app.cli.add_command(startup_profile_command)
+    app.cli.add_command(check_queries_command)
@@ -0,0 +1,130 @@
+# /app/compression.py
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import request
+
+try:
+    import brotli  # opsional: pip install brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/csv', 'text/css', 'application/javascript'}
+
+
+class CompressedCache:
+    """
+    LRU hasil kompresi, dibatasi total byte. Kuncinya hash isi body + encoding,
+    jadi respons katalog/event yang sama persis tidak dikompres ulang setiap request.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache(max_bytes):
+    global _cache
+    with _cache_lock:
+        if _cache is None or _cache.max_bytes != max_bytes:
+            _cache = CompressedCache(max_bytes)
+        return _cache
+
+
+def choose_encoding(accept_encodings):
+    """Memilih 'br' atau 'gzip' sesuai Accept-Encoding (brotli hanya jika terpasang)."""
+    if brotli is not None and accept_encodings['br'] > 0:
+        return 'br'
+    if accept_encodings['gzip'] > 0:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding, gzip_level=6, brotli_quality=5):
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    # mtime=0 agar hasilnya deterministik (dan bisa di-cache)
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+def _compress_response(response, config):
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    # Apa pun hasilnya, isi respons bergantung pada Accept-Encoding
+    response.vary.add('Accept-Encoding')
+
+    if (response.direct_passthrough or response.is_streamed
+            or not 200 <= response.status_code < 300 or response.status_code == 204
+            or 'Content-Encoding' in response.headers
+            or response.cache_control.no_transform
+            or request.method == 'HEAD'):
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < config.get('COMPRESS_MIN_SIZE', 1024):
+        return response
+
+    cache = get_cache(config.get('COMPRESS_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+    key = (hashlib.blake2b(data, digest_size=16).digest(), encoding)
+    compressed = cache.get(key)
+    if compressed is None:
+        compressed = compress(data, encoding, config.get('COMPRESS_LEVEL', 6), config.get('COMPRESS_BR_QUALITY', 5))
+        cache.put(key, compressed)
+
+    if len(compressed) >= len(data):
+        return response
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        # ETag harus berbeda antar representasi
+        response.set_etag(f"{etag}-{encoding}", weak=weak)
+    return response
+
+
+def init_compression(app):
+    """Memasang kompresi gzip/brotli untuk respons JSON/teks di atas COMPRESS_MIN_SIZE."""
+    if not app.config.get('COMPRESS_ENABLED'):
+        return
+
+    @app.after_request
+    def compress_response(response):
+        return _compress_response(response, app.config)
@@ -3,8 +3,50 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Driver MySQL yang tersedia di requirements.txt
+DB_DRIVERS = {
+    "mysqlconnector": "mysql+mysqlconnector",  # mysql-connector-python
+    "mysqldb": "mysql+mysqldb",                # mysqlclient
+    "pymysql": "mysql+pymysql",                # PyMySQL
+}
+
+# Nama argumen connect timeout berbeda untuk setiap driver
+CONNECT_TIMEOUT_ARGS = {
+    "mysqlconnector": "connection_timeout",
+    "mysqldb": "connect_timeout",
+    "pymysql": "connect_timeout",
+}
+
+
+def database_uri(driver, user, password, host, name):
+    """Menyusun URI SQLAlchemy untuk driver MySQL yang dipilih."""
+    if driver not in DB_DRIVERS:
+        raise ValueError(f"DB_DRIVER '{driver}' tidak dikenal. Pilihan: {', '.join(DB_DRIVERS)}")
+    return f"{DB_DRIVERS[driver]}://{user}:{password}@{host}/{name}"
+
+
+def engine_options(driver, pool_size, max_overflow, pool_timeout, pool_recycle, connect_timeout=10):
+    """
+    Opsi engine SQLAlchemy untuk sebuah profil. Setiap nilai bisa ditimpa lewat
+    environment variable (DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE, DB_CONNECT_TIMEOUT).
+    """
+    return {
+        "pool_size": int(os.getenv('DB_POOL_SIZE', pool_size)),
+        "max_overflow": int(os.getenv('DB_MAX_OVERFLOW', max_overflow)),
+        "pool_timeout": int(os.getenv('DB_POOL_TIMEOUT', pool_timeout)),
+        # Harus lebih kecil dari wait_timeout MySQL agar tidak "MySQL server has gone away"
+        "pool_recycle": int(os.getenv('DB_POOL_RECYCLE', pool_recycle)),
+        "pool_pre_ping": True,
+        "connect_args": {
+            CONNECT_TIMEOUT_ARGS[driver]: int(os.getenv('DB_CONNECT_TIMEOUT', connect_timeout)),
+        },
+    }
+
+
 class Config:
     """Memuat konfigurasi aplikasi dari environment variables."""
+    PROFILE_NAME = 'default'
     APP_API_KEY = os.getenv('APP_API_KEY')
     XENDIT_API_KEY = os.getenv('XENDIT_SECRET_KEY')
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "my-jwt-secret")
@@ -15,6 +57,10 @@ class Config:
     DB_PASS = os.getenv('DB_PASS')
     DB_HOST = os.getenv('DB_HOST')
     DB_NAME = os.getenv('DB_NAME')
+    DB_DRIVER = os.getenv('DB_DRIVER', 'mysqlconnector')
+    # Read replica opsional, isi DB_REPLICA_HOST (user/password/nama database sama)
+    # atau langsung DB_REPLICA_URI, misalnya sqlite:///replica.db untuk uji lokal
+    DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST')
 
     MAIL_SERVER = os.getenv('MAIL_SERVER')
     MAIL_PORT = int(os.getenv('MAIL_PORT', 587))
@@ -23,9 +69,14 @@ class Config:
     MAIL_USERNAME = os.getenv('MAIL_USERNAME')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_USERNAME') 
+    MAIL_WORKER_THREADS = int(os.getenv('MAIL_WORKER_THREADS', 4))
     ADMIN_WHATSAPP_NUMBER = os.getenv("ADMIN_WHATSAPP")
     
-    SQLALCHEMY_DATABASE_URI = f"mysql+mysqlconnector://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}"
+    SQLALCHEMY_DATABASE_URI = database_uri(DB_DRIVER, DB_USER, DB_PASS, DB_HOST, DB_NAME)
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(DB_DRIVER, pool_size=5, max_overflow=10, pool_timeout=30, pool_recycle=280)
+    DB_REPLICA_URI = os.getenv('DB_REPLICA_URI') or (
+        database_uri(DB_DRIVER, DB_USER, DB_PASS, DB_REPLICA_HOST, DB_NAME) if DB_REPLICA_HOST else None
+    )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     BASE_STATIC = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'static')
 
@@ -35,4 +86,105 @@ class Config:
        "banners": os.path.join(BASE_STATIC, "qrcodes")
     }
     
-    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
\ No newline at end of file
+    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+
+    # Jumlah proses untuk pekerjaan berat di luar request (resize gambar, dll).
+    # Isi 0 untuk menjalankannya langsung di request (berguna saat testing).
+    WORKER_PROCESSES = int(os.getenv('WORKER_PROCESSES', 2))
+
+    # Logging: record dikirim lewat antrean ke thread penulis JSON lines (lihat app/logs.py).
+    # LOG_SAMPLING contoh: 'app=0.1' -> hanya 10% log INFO/DEBUG logger 'app' yang ditulis.
+    LOG_ASYNC = os.getenv('LOG_ASYNC', 'true').lower() in ('1', 'true', 'yes')
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FILE = os.getenv('LOG_FILE')
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+    LOG_SAMPLING = os.getenv('LOG_SAMPLING', '')
+
+    # Kompresi gzip (dan brotli jika paket `brotli` terpasang) untuk respons JSON/teks
+    # di atas COMPRESS_MIN_SIZE byte. Hasil kompresi disimpan di LRU per proses.
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
+    COMPRESS_BR_QUALITY = int(os.getenv('COMPRESS_BR_QUALITY', 5))
+    COMPRESS_CACHE_MAX_BYTES = int(os.getenv('COMPRESS_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+    # Stream SSE status meja: heartbeat tiap SSE_HEARTBEAT_SECONDS, poll database
+    # (untuk perubahan dari worker lain) tiap SSE_POLL_INTERVAL detik per proses.
+    # Setiap koneksi SSE menahan satu thread; untuk ribuan penonton pakai worker gevent.
+    SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', 15))
+    SSE_POLL_INTERVAL = float(os.getenv('SSE_POLL_INTERVAL', 2))
+    SSE_QUEUE_SIZE = int(os.getenv('SSE_QUEUE_SIZE', 256))
+    SSE_MAX_SECONDS = int(os.getenv('SSE_MAX_SECONDS', 600))
+
+    # Delta sync GET /user/sync: tombstone disimpan SYNC_TOMBSTONE_RETENTION_DAYS hari
+    # (klien yang lebih lama tidak sync mendapat data penuh); next_since dimundurkan
+    # SYNC_OVERLAP_SECONDS agar transaksi yang terlambat commit tidak terlewat.
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+    SYNC_OVERLAP_SECONDS = int(os.getenv('SYNC_OVERLAP_SECONDS', 60))
+
+    # Pencarian GET /user/search: batas hasil per halaman
+    SEARCH_MAX_PER_PAGE = int(os.getenv('SEARCH_MAX_PER_PAGE', 100))
+
+    # `flask data archive`: reservasi/tiket event yang lebih lama dari ini dipindah ke tabel *_archive
+    ARCHIVE_RETENTION_DAYS = int(os.getenv('ARCHIVE_RETENTION_DAYS', 180))
+
+    # POST /batch: jumlah maksimum sub-request dan thread untuk mode "concurrent"
+    BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', 10))
+    BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', 4))
+
+    # Metrik Prometheus di /metrics. Tanpa METRICS_TOKEN hanya bisa diakses dari localhost.
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+    # Batas waktu cold start create_app() untuk tests/test_startup.py dan `flask startup-profile` (ms)
+    STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', 1500))
+
+    # Penyajian file /static: '' (dikirim oleh Flask), 'sendfile' (X-Sendfile)
+    # atau 'accel' (X-Accel-Redirect nginx, diarahkan ke STATIC_ACCEL_PREFIX).
+    STATIC_OFFLOAD = os.getenv('STATIC_OFFLOAD', '')
+    STATIC_ACCEL_PREFIX = os.getenv('STATIC_ACCEL_PREFIX', '/_protected_static')
+    STATIC_MAX_AGE = int(os.getenv('STATIC_MAX_AGE', 3600))
+
+    # Cache PNG QR tiket. Default di folder instance (tidak publik lewat /static).
+    QR_CACHE_FOLDER = os.getenv('QR_CACHE_FOLDER')
+    QR_CACHE_MAX_BYTES = int(os.getenv('QR_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+
+    # Kunci utama HMAC untuk kode tiket; kunci per event diturunkan dari sini
+    TICKET_SIGNING_KEY = os.getenv('TICKET_SIGNING_KEY', JWT_SECRET_KEY)
+
+
+class DevelopmentConfig(Config):
+    """Profil development: pool kecil, cepat gagal jika koneksi habis."""
+    PROFILE_NAME = 'development'
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(Config.DB_DRIVER, pool_size=2, max_overflow=3, pool_timeout=10, pool_recycle=280)
+
+
+class TestingConfig(Config):
+    """Profil testing: database terpisah (default SQLite in-memory), tanpa process pool."""
+    PROFILE_NAME = 'testing'
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URL', 'sqlite://')
+    DB_REPLICA_URI = os.getenv('TEST_DATABASE_REPLICA_URL')
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    WORKER_PROCESSES = 0
+
+
+class ProductionConfig(Config):
+    """Profil production: pool lebih besar, timeout checkout pendek agar beban berlebih cepat terlihat."""
+    PROFILE_NAME = 'production'
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(Config.DB_DRIVER, pool_size=10, max_overflow=20, pool_timeout=5, pool_recycle=280, connect_timeout=5)
+
+
+CONFIG_PROFILES = {
+    "development": DevelopmentConfig,
+    "testing": TestingConfig,
+    "production": ProductionConfig,
+}
+
+
+def get_config(profile=None):
+    """Memilih kelas konfigurasi berdasarkan APP_PROFILE (default: development)."""
+    profile = profile or os.getenv('APP_PROFILE', 'development')
+    if profile not in CONFIG_PROFILES:
+        raise ValueError(f"APP_PROFILE '{profile}' tidak dikenal. Pilihan: {', '.join(CONFIG_PROFILES)}")
+    return CONFIG_PROFILES[profile]
@@ -0,0 +1,262 @@
+# /app/datagen.py
+
+import random
+import time
+import uuid
+from collections import namedtuple
+from datetime import date, datetime, timedelta, time as dtime
+from sqlalchemy import text
+from . import db, bcrypt
+from .models import (User, Event, Table, EventTable, EventTableStatus, Product, Invoice, InvoiceStatus,
+                     Reservation, PaymentStatus, OrderItem, Ticket)
+from .ticket_codes import event_key, sign_ticket
+
+CHUNK_SIZE = 5000
+DEFAULT_PASSWORD = "password123"
+
+# tables_per_event: jumlah meja yang dijadwalkan per event (maksimal = tables)
+# booking_rate: proporsi meja-event yang dipesan; max_items: jumlah order item per reservasi (0..max)
+Volume = namedtuple('Volume', 'users events tables tables_per_event products booking_rate max_items')
+
+PRESETS = {
+    'tiny': Volume(users=20, events=8, tables=11, tables_per_event=8, products=11, booking_rate=0.3, max_items=3),
+    'small': Volume(users=10_000, events=200, tables=60, tables_per_event=40, products=100, booking_rate=0.5, max_items=3),
+    'medium': Volume(users=100_000, events=2_000, tables=120, tables_per_event=100, products=300, booking_rate=0.6, max_items=3),
+    'large': Volume(users=1_000_000, events=10_000, tables=250, tables_per_event=200, products=500, booking_rate=0.6, max_items=4),
+}
+
+# Katalog dasar (dari seeds.py lama); baris berikutnya memakai nama yang sama dengan nomor urut
+TABLE_TYPES = [
+    ("Sofa VVIP", "Sofa", 10, 3500000),
+    ("Sofa VIP", "Sofa", 8, 2500000),
+    ("Round Table A", "Round", 4, 1200000),
+    ("Round Table B", "Round", 6, 1800000),
+    ("High Chair C", "High Chair", 2, 800000),
+    ("High Chair D", "High Chair", 3, 1000000),
+    ("Standing Area", "Standing", 50, 450000),
+]
+PRODUCT_CATALOG = [
+    ("Chivas Regal 12", "1 Botol 750ml", 1500000),
+    ("Johnnie Walker Black Label", "1 Botol 750ml", 1400000),
+    ("Jack Daniel's Old No. 7", "1 Botol 750ml", 1300000),
+    ("Heineken Tower", "3 Liter", 550000),
+    ("Bintang Bucket", "5 Botol", 250000),
+    ("Wagyu Steak", "200gr Wagyu MB5+ with sauce", 350000),
+    ("Truffle Pizza", "8 slices with black truffle", 180000),
+    ("Calamari Rings", "Crispy fried calamari with tartar", 95000),
+    ("French Fries", "Classic shoestring fries", 55000),
+    ("Mineral Water", "Aqua Reflection 380ml", 35000),
+    ("Coca-cola", "Can 330ml", 40000),
+]
+EVENT_THEMES = [
+    "Acoustic Night", "EDM Festival", "Ladies Night Out", "Tribute to Queen", "Hip Hop Friday",
+    "Jazz Session", "Throwback 90s", "Latin Night", "Techno Underground", "Karaoke Battle",
+]
+FIRST_NAMES = ["Andi", "Budi", "Citra", "Dewi", "Eko", "Fajar", "Gita", "Hadi", "Indah", "Joko",
+               "Kartika", "Lestari", "Made", "Nina", "Oki", "Putri", "Rizky", "Sari", "Tono", "Wulan"]
+LAST_NAMES = ["Budiman", "Lestari", "Anggraini", "Prasetyo", "Saputra", "Wijaya", "Hidayat",
+              "Siregar", "Nugroho", "Santoso", "Kusuma", "Pratama"]
+PAYMENT_WEIGHTS = [
+    (PaymentStatus.PAID, 70),
+    (PaymentStatus.WAITING_MANUAL_PAYMENT, 20),
+    (PaymentStatus.EXPIRED, 10),
+]
+
+
+def reset_database():
+    """
+    Mengosongkan semua tabel model. MySQL memakai TRUNCATE (jauh lebih cepat dari
+    DELETE dan me-reset AUTO_INCREMENT) dengan FOREIGN_KEY_CHECKS dimatikan sementara.
+    """
+    tables = list(reversed(db.metadata.sorted_tables))
+    with db.engine.connect() as conn:
+        if conn.dialect.name == 'mysql':
+            conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+            try:
+                for table in tables:
+                    conn.execute(text(f"TRUNCATE TABLE `{table.name}`"))
+            finally:
+                conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+        else:
+            for table in tables:
+                conn.execute(table.delete())
+        conn.commit()
+
+
+class _Writer:
+    """Menampung baris per tabel lalu menulisnya dengan executemany per chunk."""
+
+    def __init__(self, conn, chunk_size, progress):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.buffers = {}
+        self.counts = {}
+
+    def add(self, model, row):
+        buffer = self.buffers.setdefault(model, [])
+        buffer.append(row)
+        return len(buffer) >= self.chunk_size
+
+    def flush(self, *models):
+        # Urutan models menentukan urutan insert (induk dulu, baru anak)
+        for model in models:
+            rows = self.buffers.get(model)
+            if not rows:
+                continue
+            self.conn.execute(model.__table__.insert(), rows)
+            self.counts[model.__tablename__] = self.counts.get(model.__tablename__, 0) + len(rows)
+            rows.clear()
+        self.conn.commit()
+        if self.progress:
+            self.progress(dict(self.counts))
+
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def generate(volume, seed=42, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Mengisi database (yang sudah kosong) dengan data sintetis sesuai `volume`.
+    Hasil selalu sama untuk seed yang sama. Semua user memakai password
+    DEFAULT_PASSWORD dengan satu hash bcrypt yang dihitung sekali.
+    Mengembalikan dict jumlah baris per tabel dan lama proses (detik).
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    password_hash = bcrypt.generate_password_hash(DEFAULT_PASSWORD).decode('utf-8')
+    now = datetime.utcnow()
+    today = date.today()
+    tables_per_event = min(volume.tables_per_event, volume.tables)
+
+    with db.engine.connect() as conn:
+        if conn.dialect.name == 'mysql':
+            # Semua id sudah konsisten; pengecekan FK per baris hanya memperlambat load
+            conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+        writer = _Writer(conn, chunk_size, progress)
+        try:
+            # --- Users (user pertama adalah admin) ---
+            user_ids = []
+            for i in range(volume.users):
+                user_id = _uuid(rng)
+                user_ids.append(user_id)
+                full = writer.add(User, {
+                    "id": user_id,
+                    "role_id": 1 if i == 0 else 2,
+                    "name": "Admin Utama" if i == 0 else f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    "email": "admin@example.com" if i == 0 else f"user{i}@example.com",
+                    "nomor_hp": f"08{i:010d}",
+                    "password_hash": password_hash,
+                    "reset_token": None,
+                    "reset_token_expiration": None,
+                })
+                if full:
+                    writer.flush(User)
+            writer.flush(User)
+
+            # --- Meja dan produk ---
+            table_prices = {}
+            for table_id in range(1, volume.tables + 1):
+                name, kind, capacity, price = TABLE_TYPES[(table_id - 1) % len(TABLE_TYPES)]
+                table_prices[table_id] = price
+                writer.add(Table, {"id": table_id, "name": f"{name} {(table_id - 1) // len(TABLE_TYPES) + 1}",
+                                   "type": kind, "capacity": capacity, "price": price})
+            product_prices = {}
+            for product_id in range(1, volume.products + 1):
+                name, description, price = PRODUCT_CATALOG[(product_id - 1) % len(PRODUCT_CATALOG)]
+                batch = (product_id - 1) // len(PRODUCT_CATALOG)
+                product_prices[product_id] = price
+                writer.add(Product, {"id": product_id, "name": name if not batch else f"{name} #{batch + 1}",
+                                     "description": description, "price": price,
+                                     "stock": rng.randint(50, 500), "image_url": None})
+            writer.flush(Table, Product)
+
+            # --- Event: tersebar dari setahun lalu sampai setahun ke depan ---
+            events = []
+            for event_id in range(1, volume.events + 1):
+                event_date = today + timedelta(days=rng.randint(-365, 365))
+                start_hour = rng.choice([19, 20, 21, 22])
+                events.append((event_id, event_date))
+                full = writer.add(Event, {
+                    "id": event_id,
+                    "name": f"{rng.choice(EVENT_THEMES)} Vol. {event_id}",
+                    "description": "Event sintetis untuk pengujian performa.",
+                    "event_date": event_date,
+                    "start_time": dtime(start_hour),
+                    "end_time": dtime((start_hour + rng.randint(3, 6)) % 24),
+                    "is_active": event_date >= today or rng.random() < 0.2,
+                    "created_at": now,
+                    "image_url": None,
+                })
+                if full:
+                    writer.flush(Event)
+            writer.flush(Event)
+
+            # --- Meja per event, reservasi, invoice, order item dan tiket ---
+            table_ids = list(range(1, volume.tables + 1))
+            statuses, weights = zip(*PAYMENT_WEIGHTS)
+            event_table_id = reservation_id = order_item_id = ticket_id = 0
+            children = (Invoice, Reservation, OrderItem, Ticket)
+            for event_id, event_date in events:
+                key = event_key(event_id)
+                expires_at = datetime.combine(event_date + timedelta(days=1), dtime(6))
+                for table_id in sorted(rng.sample(table_ids, tables_per_event)):
+                    event_table_id += 1
+                    booked = rng.random() < volume.booking_rate
+                    writer.add(EventTable, {
+                        "id": event_table_id, "event_id": event_id, "table_id": table_id,
+                        "status": EventTableStatus.BOOKED if booked else EventTableStatus.AVAILABLE,
+                        "created_at": now,
+                    })
+                    if not booked:
+                        continue
+
+                    reservation_id += 1
+                    user_id = user_ids[rng.randrange(1, len(user_ids))] if len(user_ids) > 1 else user_ids[0]
+                    status = rng.choices(statuses, weights)[0]
+                    items = []
+                    total = table_prices[table_id]
+                    for product_id in rng.sample(range(1, volume.products + 1), rng.randint(0, min(volume.max_items, volume.products))):
+                        quantity = rng.randint(1, 3)
+                        subtotal = product_prices[product_id] * quantity
+                        total += subtotal
+                        order_item_id += 1
+                        items.append({"id": order_item_id, "reservation_id": reservation_id,
+                                      "product_id": product_id, "quantity": quantity, "subtotal": subtotal})
+
+                    invoice_id = None
+                    if status == PaymentStatus.PAID:
+                        invoice_id = _uuid(rng)
+                        writer.add(Invoice, {"id": invoice_id, "external_id": f"MANUAL-{reservation_id}",
+                                             "user_id": user_id, "amount": total,
+                                             "status": InvoiceStatus.PAID, "invoice_url": None})
+                        ticket_id += 1
+                        used = event_date < today
+                        writer.add(Ticket, {
+                            "id": ticket_id,
+                            "ticket_code": sign_ticket(ticket_id, event_id, expires_at, key=key),
+                            "user_id": user_id, "invoice_id": invoice_id, "event_id": event_id,
+                            "expires_at": expires_at, "is_used": used,
+                            "used_at": datetime.combine(event_date, dtime(22)) if used else None,
+                            "created_at": now,
+                        })
+                    writer.add(Reservation, {
+                        "id": reservation_id, "user_id": user_id, "event_table_id": event_table_id,
+                        "invoice_id": invoice_id, "number_of_guests": rng.randint(1, 6),
+                        "total_amount": total, "payment_status": status, "created_at": now,
+                        "arrival_time": dtime(rng.choice([19, 20, 21, 22]), rng.choice([0, 15, 30, 45])),
+                    })
+                    for item in items:
+                        writer.add(OrderItem, item)
+
+                if max(len(writer.buffers.get(model, ())) for model in (EventTable,) + children) >= chunk_size:
+                    writer.flush(EventTable, *children)
+            writer.flush(EventTable, *children)
+        finally:
+            if conn.dialect.name == 'mysql':
+                conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+
+    counts = dict(writer.counts)
+    counts["seconds"] = round(time.perf_counter() - started, 2)
+    return counts
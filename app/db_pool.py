@@ -0,0 +1,92 @@
+# /app/db_pool.py
+
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+# Checkout yang menunggu lebih lama dari ini dihitung sebagai "lambat"
+SLOW_CHECKOUT_SECONDS = 0.1
+
+
+class PoolStats:
+    """Statistik waktu tunggu checkout koneksi, aman dipakai banyak thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.slow_checkouts = 0
+        self.timeouts = 0
+
+    def record(self, wait, timed_out=False):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if wait >= SLOW_CHECKOUT_SECONDS:
+                self.slow_checkouts += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+                "slow_checkouts": self.slow_checkouts,
+                "timeouts": self.timeouts,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool yang mencatat lama menunggu koneksi dan jumlah timeout."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        self._local = threading.local()
+
+    def _do_get(self):
+        # QueuePool._do_get bisa memanggil dirinya sendiri; hanya panggilan terluar yang diukur
+        if getattr(self._local, 'measuring', False):
+            return super()._do_get()
+
+        self._local.measuring = True
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self._local.measuring = False
+            self.stats.record(time.perf_counter() - start, timed_out)
+
+
+def pool_status(engine):
+    """Ringkasan kondisi pool koneksi sebuah engine untuk endpoint health."""
+    pool = engine.pool
+    status = {
+        "pool_class": type(pool).__name__,
+        "driver": engine.dialect.driver,
+    }
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "recycle": pool._recycle,
+            "pre_ping": pool._pre_ping,
+        })
+    else:
+        status["status"] = pool.status()
+    if isinstance(pool, InstrumentedQueuePool):
+        status["wait_stats"] = pool.stats.as_dict()
+    return status
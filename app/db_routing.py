@@ -0,0 +1,73 @@
+# /app/db_routing.py
+
+from contextlib import contextmanager
+from functools import wraps
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select
+
+REPLICA_BIND = 'replica'
+READ_ONLY_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class RoutingSession(Session):
+    """
+    Session yang mengirim SELECT ke read replica (bind 'replica') jika:
+    - request-nya GET/HEAD (atau sedang di dalam blok read_only()),
+    - belum ada penulisan di session ini, dan
+    - query-nya bukan SELECT ... FOR UPDATE.
+    Selain itu semua query tetap ke primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._use_replica(clause):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _use_replica(self, clause):
+        if self.info.get('wrote') or self._flushing:
+            return False
+        if not isinstance(clause, Select) or clause._for_update_arg is not None:
+            return False
+        if self.info.get('read_only'):
+            return True
+        return (
+            has_request_context()
+            and request.method in READ_ONLY_METHODS
+            and not g.get('_db_use_primary', False)
+        )
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_flush_as_write(session, flush_context):
+    # Setelah ada penulisan, sisa request membaca dari primary (read-your-writes)
+    session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _mark_bulk_write(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info['wrote'] = True
+
+
+def use_primary(f):
+    """Decorator untuk endpoint GET yang wajib membaca data terbaru dari primary."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g._db_use_primary = True
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+@contextmanager
+def read_only(session):
+    """Menandai blok kode (mis. job CLI) sebagai transaksi baca saja yang boleh ke replica."""
+    previous = session.info.get('read_only', False)
+    session.info['read_only'] = True
+    try:
+        yield session
+    finally:
+        session.info['read_only'] = previous
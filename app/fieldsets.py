@@ -0,0 +1,61 @@
+# /app/fieldsets.py
+
+from collections import namedtuple
+from flask import request
+from sqlalchemy.orm import load_only
+
+# columns: kolom model yang dibutuhkan field ini; get: fungsi objek -> nilai JSON
+Field = namedtuple('Field', 'columns get')
+
+
+class FieldError(ValueError):
+    """Parameter ?fields= atau ?include= berisi nama yang tidak dikenal."""
+
+
+def _parse_names(param):
+    raw = request.args.get(param)
+    if raw is None:
+        return None
+    return {name.strip() for name in raw.split(',') if name.strip()}
+
+
+def requested_fields(spec):
+    """
+    Membaca ?fields=id,name,price. Tanpa parameter, semua field di spec dipakai.
+    Urutan output mengikuti urutan spec, bukan urutan di query string.
+    """
+    names = _parse_names('fields')
+    if not names:
+        return list(spec)
+    unknown = names - spec.keys()
+    if unknown:
+        raise FieldError(f"Field tidak dikenal: {', '.join(sorted(unknown))}. Pilihan: {', '.join(spec)}")
+    return [name for name in spec if name in names]
+
+
+def requested_includes(allowed, default):
+    """
+    Membaca ?include=tables. Tanpa ?include dan tanpa ?fields, relasi di `default`
+    tetap disertakan agar respons lama tidak berubah.
+    """
+    names = _parse_names('include')
+    if names is None:
+        return set() if request.args.get('fields') else set(default)
+    unknown = names - set(allowed)
+    if unknown:
+        raise FieldError(f"Include tidak dikenal: {', '.join(sorted(unknown))}. Pilihan: {', '.join(allowed)}")
+    return names
+
+
+def load_only_option(spec, fields):
+    """Opsi query yang hanya men-SELECT kolom yang dibutuhkan field terpilih (primary key selalu ikut)."""
+    columns = []
+    for name in fields:
+        for column in spec[name].columns:
+            if column not in columns:
+                columns.append(column)
+    return load_only(*columns)
+
+
+def serialize(obj, spec, fields):
+    return {name: spec[name].get(obj) for name in fields}
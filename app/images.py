@@ -0,0 +1,135 @@
+# /app/images.py
+
+import json
+import os
+from flask import current_app
+from .workers import submit
+
+# Ukuran sisi terpanjang (px) untuk setiap varian gambar
+VARIANTS = {
+    "thumb": 320,
+    "medium": 800,
+    "full": 1600,
+}
+VARIANT_FOLDER = 'variants'
+
+# Manifest yang sudah selesai dibuat tidak akan berubah, jadi aman di-cache
+_manifest_cache = {}
+
+
+def _variant_location(src_path):
+    """Mengembalikan (folder varian, nama dasar file) untuk sebuah file asli."""
+    folder = os.path.join(os.path.dirname(src_path), VARIANT_FOLDER)
+    stem = os.path.splitext(os.path.basename(src_path))[0]
+    return folder, stem
+
+
+def render_variants(src_path):
+    """
+    Membuat varian thumb/medium/full dalam format WebP + fallback (JPEG, atau PNG
+    jika gambar transparan). Dijalankan di process pool, tanpa app context.
+    Manifest JSON ditulis paling akhir sebagai penanda bahwa varian sudah siap.
+    """
+    from PIL import Image, ImageOps
+
+    folder, stem = _variant_location(src_path)
+    os.makedirs(folder, exist_ok=True)
+
+    with Image.open(src_path) as original:
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        fallback_ext = 'png' if has_alpha else 'jpg'
+
+        manifest = {}
+        for name, max_side in VARIANTS.items():
+            variant = image.copy()
+            variant.thumbnail((max_side, max_side), Image.LANCZOS)
+
+            webp_name = f"{stem}_{name}.webp"
+            variant.save(os.path.join(folder, webp_name), 'WEBP', quality=80, method=4)
+
+            fallback_name = f"{stem}_{name}.{fallback_ext}"
+            if has_alpha:
+                variant.save(os.path.join(folder, fallback_name), 'PNG', optimize=True)
+            else:
+                variant.save(os.path.join(folder, fallback_name), 'JPEG', quality=82, optimize=True, progressive=True)
+
+            manifest[name] = {
+                "webp": webp_name,
+                fallback_ext: fallback_name,
+                "width": variant.width,
+                "height": variant.height,
+            }
+
+    manifest_path = os.path.join(folder, f"{stem}.json")
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+    return manifest_path
+
+
+def static_path(image_url):
+    """Mengubah URL '/static/...' menjadi path file di disk."""
+    static_root = current_app.config['BASE_STATIC']
+    relative = image_url.split('/static/', 1)[-1].lstrip('/')
+    return os.path.join(static_root, *relative.split('/'))
+
+
+def schedule_variants(image_path):
+    """Menyerahkan pembuatan varian ke process pool; request tidak perlu menunggu."""
+    logger = current_app.logger
+
+    def _on_done(future):
+        error = future.exception()
+        if error:
+            logger.error("Gagal membuat varian gambar %s: %s", image_path, error)
+
+    future = submit(render_variants, image_path)
+    future.add_done_callback(_on_done)
+    return future
+
+
+def variant_urls(image_url):
+    """
+    Mengembalikan URL varian gambar, atau None jika varian belum selesai dibuat.
+    Contoh: {"thumb": {"webp": "/static/.../variants/x_thumb.webp", "jpg": ...}, ...}
+    """
+    if not image_url:
+        return None
+
+    cached = _manifest_cache.get(image_url)
+    if cached is not None:
+        return cached
+
+    folder, stem = _variant_location(static_path(image_url))
+    try:
+        with open(os.path.join(folder, f"{stem}.json")) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    base_url = f"{image_url.rsplit('/', 1)[0]}/{VARIANT_FOLDER}"
+    urls = {}
+    for name, files in manifest.items():
+        urls[name] = {
+            key: (f"{base_url}/{value}" if isinstance(value, str) else value)
+            for key, value in files.items()
+        }
+    _manifest_cache[image_url] = urls
+    return urls
+
+
+def forget_variants(image_url):
+    """Menghapus file varian sebuah gambar (dipakai saat gambar aslinya dihapus)."""
+    _manifest_cache.pop(image_url, None)
+    folder, stem = _variant_location(static_path(image_url))
+    if not os.path.isdir(folder):
+        return
+    for name in os.listdir(folder):
+        if name == f"{stem}.json" or name.startswith(f"{stem}_"):
+            try:
+                os.remove(os.path.join(folder, name))
+            except OSError:
+                pass
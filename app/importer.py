@@ -0,0 +1,226 @@
+# /app/importer.py
+
+import csv
+import io
+import json
+from sqlalchemy import insert, update, select
+from . import db
+from .models import Table, Product
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 500
+
+
+def _parse_int(value, field, errors, minimum=0):
+    """Mengubah nilai CSV/JSON menjadi integer, mencatat error jika gagal."""
+    if isinstance(value, bool):
+        errors.append(f"{field} harus berupa integer")
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+    try:
+        number = int(value)
+    except (ValueError, TypeError):
+        errors.append(f"{field} harus berupa integer")
+        return None
+    if isinstance(value, float) and value != number:
+        errors.append(f"{field} harus berupa integer")
+        return None
+    if number < minimum:
+        errors.append(f"{field} minimal {minimum}")
+        return None
+    return number
+
+
+def _parse_text(value, field, errors, max_length, required=True):
+    """Membersihkan field teks dan memeriksa panjang maksimalnya."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            errors.append(f"{field} wajib diisi")
+        return None
+    value = str(value).strip()
+    if max_length and len(value) > max_length:
+        errors.append(f"{field} maksimal {max_length} karakter")
+        return None
+    return value
+
+
+def _parse_id(record, errors):
+    """Kolom id opsional: jika diisi, baris akan meng-update data yang sudah ada."""
+    raw_id = record.get('id')
+    if raw_id is None or raw_id == '':
+        return None
+    return _parse_int(raw_id, 'id', errors, minimum=1)
+
+
+def _build_row(record, fields, errors):
+    """
+    Baris tanpa id (insert) divalidasi lengkap, jadi kolom wajib yang tidak ada dilaporkan.
+    Baris dengan id hanya berisi kolom yang memang ada di record, agar UPDATE tidak
+    menimpa kolom lain (mis. image_url) dengan NULL.
+    """
+    row_id = _parse_id(record, errors)
+    row = {
+        field: parse(record.get(field), errors)
+        for field, parse in fields.items()
+        if row_id is None or field in record
+    }
+    if row_id:
+        row["id"] = row_id
+    return row
+
+
+# field -> parser(nilai, errors); aturannya sama dengan endpoint POST /admin/tables dan /admin/products
+TABLE_FIELDS = {
+    "name": lambda value, errors: _parse_text(value, 'name', errors, 100),
+    "type": lambda value, errors: _parse_text(value, 'type', errors, 50),
+    "capacity": lambda value, errors: _parse_int(value, 'capacity', errors, minimum=1),
+    "price": lambda value, errors: _parse_int(value, 'price', errors),
+}
+
+PRODUCT_FIELDS = {
+    "name": lambda value, errors: _parse_text(value, 'name', errors, 255),
+    "description": lambda value, errors: _parse_text(value, 'description', errors, None, required=False),
+    "price": lambda value, errors: _parse_int(value, 'price', errors),
+    "stock": lambda value, errors: _parse_int(value, 'stock', errors),
+    "image_url": lambda value, errors: _parse_text(value, 'image_url', errors, 255, required=False),
+}
+
+
+def validate_table_row(record):
+    """Validasi satu baris meja."""
+    errors = []
+    return _build_row(record, TABLE_FIELDS, errors), errors
+
+
+def validate_product_row(record):
+    """Validasi satu baris produk."""
+    errors = []
+    return _build_row(record, PRODUCT_FIELDS, errors), errors
+
+
+# kind -> (model, validator, kolom wajib saat insert)
+IMPORTERS = {
+    "tables": (Table, validate_table_row, ("name", "type", "capacity", "price")),
+    "products": (Product, validate_product_row, ("name", "price", "stock")),
+}
+
+
+def iter_records(stream, filename):
+    """
+    Membaca file baris demi baris tanpa memuat seluruh isi ke memori (kecuali .json biasa).
+    Menghasilkan tuple (nomor_baris, record, error).
+    """
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        if extension == 'csv':
+            reader = csv.DictReader(text)
+            # Baris 1 adalah header, jadi data dimulai dari baris 2
+            for line_no, record in enumerate(reader, start=2):
+                yield line_no, record, None
+        elif extension in ('jsonl', 'ndjson'):
+            for line_no, line in enumerate(text, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, None, f"JSON tidak valid: {e.msg}"
+                    continue
+                if not isinstance(record, dict):
+                    yield line_no, None, "Setiap baris harus berupa objek JSON"
+                    continue
+                yield line_no, record, None
+        elif extension == 'json':
+            data = json.load(text)
+            if not isinstance(data, list):
+                raise ValueError("File JSON harus berisi array objek.")
+            for index, record in enumerate(data, start=1):
+                if not isinstance(record, dict):
+                    yield index, None, "Setiap elemen harus berupa objek JSON"
+                    continue
+                yield index, record, None
+        else:
+            raise ValueError("Format file tidak didukung. Gunakan .csv, .json, atau .jsonl.")
+    finally:
+        # Jangan ikut menutup stream milik pemanggil
+        text.detach()
+
+
+def _write_chunk(model, required, batch, report, dry_run, record_error):
+    """
+    Memisahkan baris insert dan update lalu mengirimnya sebagai executemany.
+    batch: list of (nomor_baris, row).
+    """
+    ids = [row["id"] for _, row in batch if "id" in row]
+    existing_ids = set()
+    if ids:
+        existing_ids = set(db.session.scalars(select(model.id).where(model.id.in_(ids))))
+
+    updates = [row for _, row in batch if row.get("id") in existing_ids]
+    inserts = []
+    for line_no, row in batch:
+        if row.get("id") in existing_ids:
+            continue
+        # id yang belum ada menjadi insert, jadi kolom wajib harus lengkap
+        missing = [field for field in required if field not in row]
+        if missing:
+            record_error(line_no, [f"{field} wajib diisi (id {row['id']} belum ada)" for field in missing])
+            continue
+        inserts.append(row)
+
+    if not dry_run:
+        if inserts:
+            db.session.execute(insert(model), inserts)
+        if updates:
+            # Baris boleh berisi kolom yang berbeda-beda; hanya kolom yang ada yang di-update
+            db.session.execute(update(model), updates)
+
+    report["inserted"] += len(inserts)
+    report["updated"] += len(updates)
+
+
+def import_rows(kind, stream, filename, dry_run=False, chunk_size=CHUNK_SIZE):
+    """
+    Import meja/produk secara massal dari stream file.
+    Baris yang valid di-upsert per chunk, baris yang tidak valid dicatat di laporan.
+    Baris dengan id yang sudah ada hanya meng-update kolom yang ada di file.
+    Pemanggil bertanggung jawab atas commit/rollback.
+    """
+    model, validate, required = IMPORTERS[kind]
+    report = {"processed": 0, "inserted": 0, "updated": 0, "error_count": 0, "errors": []}
+    seen_ids = set()
+    batch = []
+
+    def record_error(line_no, errors):
+        report["error_count"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": line_no, "errors": errors})
+
+    for line_no, record, error in iter_records(stream, filename):
+        report["processed"] += 1
+        if error:
+            record_error(line_no, [error])
+            continue
+
+        row, errors = validate(record)
+        if not errors and "id" in row:
+            if row["id"] in seen_ids:
+                errors.append(f"id {row['id']} muncul lebih dari sekali di file")
+            seen_ids.add(row["id"])
+        if errors:
+            record_error(line_no, errors)
+            continue
+
+        batch.append((line_no, row))
+        if len(batch) >= chunk_size:
+            _write_chunk(model, required, batch, report, dry_run, record_error)
+            batch = []
+
+    if batch:
+        _write_chunk(model, required, batch, report, dry_run, record_error)
+
+    report["dry_run"] = dry_run
+    return report
@@ -0,0 +1,194 @@
+# /app/logs.py
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from flask import has_request_context, request
+
+# Atribut bawaan LogRecord; atribut lain (dari extra={...}) ikut ditulis ke JSON
+_STANDARD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def parse_sampling(value):
+    """Mengubah 'app=0.1,sqlalchemy.engine=0.01' menjadi {'app': 0.1, 'sqlalchemy.engine': 0.01}."""
+    rates = {}
+    for part in (value or '').split(','):
+        if '=' not in part:
+            continue
+        name, rate = part.split('=', 1)
+        rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class JsonFormatter(logging.Formatter):
+    """Satu baris JSON per record, dijalankan di thread listener (bukan di request)."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Meloloskan hanya sebagian record di bawah WARNING untuk logger yang terdaftar
+    di `rates` (termasuk child logger-nya). WARNING ke atas tidak pernah dibuang.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+        self._cache = {}
+
+    def _rate(self, name):
+        rate = self._cache.get(name)
+        if rate is None:
+            rate = 1.0
+            parts = name.split('.')
+            for i in range(len(parts), 0, -1):
+                prefix = '.'.join(parts[:i])
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+            self._cache[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class RequestContextFilter(logging.Filter):
+    """Menambahkan method/path/endpoint saat record dibuat, karena listener tidak punya request context."""
+
+    def filter(self, record):
+        if has_request_context():
+            # Satu kali lookup context-local, bukan tiga kali lewat proxy
+            req = request._get_current_object()
+            record.method = req.method
+            record.path = req.path
+            record.endpoint = req.endpoint
+        return True
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self):
+        # Antrean bisa saja penuh saat proses berhenti; tunggu sampai sentinel masuk
+        self.queue.put(self._sentinel)
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    QueueHandler dengan antrean terbatas. Jika antrean penuh, record di bawah ERROR
+    dibuang (dan dihitung), sedangkan ERROR ke atas menunggu sampai ada tempat.
+    Listener dijalankan ulang otomatis di proses hasil fork.
+    """
+
+    def __init__(self, log_queue, target):
+        super().__init__(log_queue)
+        self.target = target
+        self.dropped = 0
+        self._listener = None
+        self._listener_pid = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._listener is not None and self._listener_pid == os.getpid():
+                return
+            if self._listener_pid is not None:
+                # Proses hasil fork: thread listener induk tidak ikut ter-fork dan lock
+                # antrean lama bisa saja sedang dipegang saat fork, jadi pakai antrean baru
+                self.queue = queue.Queue(self.queue.maxsize)
+            self._listener = _Listener(self.queue, self.target, respect_handler_level=True)
+            self._listener.start()
+            self._listener_pid = os.getpid()
+
+    def stop(self):
+        with self._lock:
+            if self._listener is not None and self._listener_pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+            self._listener_pid = None
+
+    def prepare(self, record):
+        # Pesan digabung dengan argumennya di sini (argumen bisa berubah setelahnya),
+        # tapi traceback tetap dipisah agar bisa ditulis sebagai field "exc"
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self._listener_pid != os.getpid():
+            self.start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.ERROR:
+                self.queue.put(record)
+            else:
+                self.dropped += 1
+
+
+_handler = None
+
+
+def init_logging(app):
+    """
+    Memasang pipeline logging: logger aplikasi -> AsyncQueueHandler (sampling +
+    konteks request) -> thread listener -> JSON lines ke stderr atau LOG_FILE.
+    Handler dipasang sekali per proses di root logger, jadi create_app() berkali-kali aman.
+    """
+    global _handler
+    if not app.config.get('LOG_ASYNC', True):
+        return
+
+    from flask.logging import default_handler
+    app.logger.removeHandler(default_handler)
+    app.logger.setLevel(app.config.get('LOG_LEVEL', 'INFO'))
+
+    if _handler is None:
+        log_file = app.config.get('LOG_FILE')
+        target = logging.FileHandler(log_file) if log_file else logging.StreamHandler(sys.stderr)
+        target.setFormatter(JsonFormatter())
+
+        _handler = AsyncQueueHandler(queue.Queue(app.config.get('LOG_QUEUE_SIZE', 10000)), target)
+        _handler.addFilter(SamplingFilter(parse_sampling(app.config.get('LOG_SAMPLING'))))
+        _handler.addFilter(RequestContextFilter())
+        _handler.start()
+
+        root = logging.getLogger()
+        root.addHandler(_handler)
+        # Sisa record di antrean ditulis sebelum proses keluar
+        atexit.register(_handler.stop)
+    return _handler
@@ -0,0 +1,39 @@
+# /app/mailer.py
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from . import mail
+
+_executor = None
+_executor_pid = None
+_lock = threading.Lock()
+
+
+def _get_executor(max_workers):
+    """Thread pool pengirim email milik proses ini (dibuat ulang setelah fork)."""
+    global _executor, _executor_pid
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='mailer')
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def send_async(msg):
+    """
+    Mengirim email lewat SMTP di thread terpisah agar request tidak menunggu
+    koneksi SMTP. Kegagalan hanya dicatat di log karena respons sudah terkirim.
+    """
+    app = current_app._get_current_object()
+
+    def _send():
+        with app.app_context():
+            try:
+                mail.send(msg)
+                app.logger.info("Email '%s' dikirim ke %s", msg.subject, ", ".join(msg.recipients))
+            except Exception as e:
+                app.logger.error("GAGAL KIRIM EMAIL ke %s: %s", ", ".join(msg.recipients), e)
+
+    return _get_executor(app.config.get('MAIL_WORKER_THREADS', 4)).submit(_send)
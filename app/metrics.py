@@ -0,0 +1,197 @@
+# /app/metrics.py
+
+import bisect
+import threading
+import time
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Batas bucket histogram latensi (detik), mengikuti default client Prometheus
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+class MetricsRegistry:
+    """
+    Penampung metrik per proses: latensi, status code, jumlah query SQL dan waktu DB
+    per endpoint. Setiap worker gunicorn punya registry sendiri, jadi Prometheus
+    sebaiknya men-scrape tiap worker (atau cukup satu worker sebagai sampel).
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._latency = {}
+        self._statuses = {}
+        self._sql = {}
+
+    def record(self, blueprint, endpoint, method, status, duration, statements, db_seconds):
+        key = (blueprint, endpoint, method)
+        index = bisect.bisect_left(self.buckets, duration)
+        with self._lock:
+            latency = self._latency.get(key)
+            if latency is None:
+                latency = self._latency[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            latency[0][index] += 1
+            latency[1] += duration
+            latency[2] += 1
+
+            status_key = key + (status,)
+            self._statuses[status_key] = self._statuses.get(status_key, 0) + 1
+
+            sql = self._sql.get(key)
+            if sql is None:
+                sql = self._sql[key] = [0, 0.0]
+            sql[0] += statements
+            sql[1] += db_seconds
+
+    def reset(self):
+        with self._lock:
+            self._latency.clear()
+            self._statuses.clear()
+            self._sql.clear()
+
+    def render(self):
+        """Mengembalikan semua metrik dalam format teks Prometheus (exposition 0.0.4)."""
+        with self._lock:
+            latency = {key: (list(v[0]), v[1], v[2]) for key, v in self._latency.items()}
+            statuses = dict(self._statuses)
+            sql = {key: tuple(v) for key, v in self._sql.items()}
+
+        lines = [
+            "# HELP http_request_duration_seconds Lama request per endpoint.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (blueprint, endpoint, method), (counts, total, count) in sorted(latency.items()):
+            base = _labels(blueprint=blueprint, endpoint=endpoint, method=method)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'http_request_duration_seconds_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{base},le="+Inf"}} {count}')
+            lines.append(f'http_request_duration_seconds_sum{{{base}}} {total:.6f}')
+            lines.append(f'http_request_duration_seconds_count{{{base}}} {count}')
+
+        lines += [
+            "# HELP http_requests_total Jumlah request per endpoint dan status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (blueprint, endpoint, method, status), count in sorted(statuses.items()):
+            labels = _labels(blueprint=blueprint, endpoint=endpoint, method=method, status=status)
+            lines.append(f'http_requests_total{{{labels}}} {count}')
+
+        lines += [
+            "# HELP db_statements_total Jumlah statement SQL yang dijalankan per endpoint.",
+            "# TYPE db_statements_total counter",
+        ]
+        for (blueprint, endpoint, method), (statements, _) in sorted(sql.items()):
+            labels = _labels(blueprint=blueprint, endpoint=endpoint, method=method)
+            lines.append(f'db_statements_total{{{labels}}} {statements}')
+
+        lines += [
+            "# HELP db_time_seconds_total Total waktu eksekusi SQL per endpoint.",
+            "# TYPE db_time_seconds_total counter",
+        ]
+        for (blueprint, endpoint, method), (_, seconds) in sorted(sql.items()):
+            labels = _labels(blueprint=blueprint, endpoint=endpoint, method=method)
+            lines.append(f'db_time_seconds_total{{{labels}}} {seconds:.6f}')
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def render_pool_metrics(engines):
+    """Metrik pool koneksi (lihat app/db_pool.py) untuk setiap bind database."""
+    from .db_pool import InstrumentedQueuePool
+
+    lines = [
+        "# HELP db_pool_checked_out Koneksi yang sedang dipakai.",
+        "# TYPE db_pool_checked_out gauge",
+    ]
+    pools = [(bind or 'default', engine.pool) for bind, engine in sorted(engines.items(), key=lambda item: item[0] or '')]
+    for bind, pool in pools:
+        if hasattr(pool, 'checkedout'):
+            lines.append(f'db_pool_checked_out{{{_labels(bind=bind)}}} {pool.checkedout()}')
+
+    lines += [
+        "# HELP db_pool_checkout_wait_seconds_total Total waktu menunggu koneksi dari pool.",
+        "# TYPE db_pool_checkout_wait_seconds_total counter",
+        "# HELP db_pool_timeouts_total Checkout yang gagal karena pool penuh.",
+        "# TYPE db_pool_timeouts_total counter",
+    ]
+    for bind, pool in pools:
+        if isinstance(pool, InstrumentedQueuePool):
+            stats = pool.stats
+            lines.append(f'db_pool_checkout_wait_seconds_total{{{_labels(bind=bind)}}} {stats.total_wait:.6f}')
+            lines.append(f'db_pool_timeouts_total{{{_labels(bind=bind)}}} {stats.timeouts}')
+    return "\n".join(lines) + "\n"
+
+
+def _start_request():
+    g._metrics_start = time.perf_counter()
+    g._metrics_sql = [0, 0.0]
+
+
+def _finish_request(response):
+    start = g.pop('_metrics_start', None)
+    if start is None:
+        return response
+    statements, db_seconds = g.pop('_metrics_sql')
+    registry.record(
+        request.blueprint or '',
+        request.endpoint or 'unmatched',
+        request.method,
+        response.status_code,
+        time.perf_counter() - start,
+        statements,
+        db_seconds,
+    )
+    return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, '_metrics_start', None)
+    if start is None:
+        return
+    # Query di luar request (CLI, thread latar) tidak punya counter dan diabaikan
+    counters = g.get('_metrics_sql') if g else None
+    if counters is not None:
+        counters[0] += 1
+        counters[1] += time.perf_counter() - start
+
+
+_listeners_installed = False
+
+
+def init_metrics(app):
+    """Memasang hook request dan event engine SQLAlchemy jika METRICS_ENABLED aktif."""
+    global _listeners_installed
+    if not app.config.get('METRICS_ENABLED'):
+        return
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+    if not _listeners_installed:
+        # Dipasang di class Engine agar berlaku untuk primary dan replica sekaligus
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _listeners_installed = True
+
+    from .routes.metrics_routes import metrics_bp
+    app.register_blueprint(metrics_bp)
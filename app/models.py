@@ -2,7 +2,7 @@ from . import db
 import uuid
 from datetime import datetime
 import enum
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import UniqueConstraint, event
 
 class EventTableStatus(enum.Enum):
     AVAILABLE = "available"
@@ -37,6 +37,13 @@ class User(db.Model):
 
 class Event(db.Model):
     __tablename__ = 'events'
+    __table_args__ = (
+        # FULLTEXT hanya dibuat di MySQL; dialek lain memakai inverted index di app/search.py
+        db.Index('ft_events_name_description', 'name', 'description', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+        db.Index('ft_events_name', 'name', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+        # Daftar event user: WHERE is_active AND event_date >= hari ini ORDER BY event_date
+        db.Index('ix_events_is_active_event_date', 'is_active', 'event_date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=True)
@@ -45,6 +52,7 @@ class Event(db.Model):
     end_time = db.Column(db.Time, nullable=False)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
     image_url = db.Column(db.String(255), nullable=True)
 
     def __repr__(self):
@@ -57,6 +65,7 @@ class Table(db.Model):
     type = db.Column(db.String(50), nullable=False)
     capacity = db.Column(db.Integer, nullable=False)
     price = db.Column(db.Integer, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
     
     def __repr__(self):
         return f"<Table {self.name} ({self.type})>"
@@ -72,6 +81,7 @@ class EventTable(db.Model):
     table_id = db.Column(db.Integer, db.ForeignKey('tables.id'), nullable=False)
     status = db.Column(db.Enum(EventTableStatus), default=EventTableStatus.AVAILABLE, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
 
     # relasi
     event = db.relationship('Event', backref=db.backref('event_tables', lazy='dynamic'))
@@ -82,12 +92,17 @@ class EventTable(db.Model):
 
 class Product(db.Model):
     __tablename__ = 'products'
+    __table_args__ = (
+        db.Index('ft_products_name_description', 'name', 'description', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+        db.Index('ft_products_name', 'name', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=True)
     price = db.Column(db.Integer, nullable=False) # Harga produk (dalam integer)
     stock = db.Column(db.Integer, default=0, nullable=False)
     image_url = db.Column(db.String(255), nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
 
     def __repr__(self):
         return f"<Product {self.name} - {self.price}>"
@@ -144,7 +159,7 @@ class OrderItem(db.Model):
 class Ticket(db.Model):
     __tablename__ = 'tickets'
     id = db.Column(db.Integer, primary_key=True)
-    ticket_code = db.Column(db.String(32), unique=True, nullable=False)
+    ticket_code = db.Column(db.String(64), unique=True, nullable=False)
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
     invoice_id = db.Column(db.String(36), db.ForeignKey('invoices.id'), nullable=True)
     event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
@@ -158,4 +173,73 @@ class Ticket(db.Model):
     event = db.relationship('Event', backref=db.backref('tickets', lazy='dynamic'))
 
     def __repr__(self):
-        return f'<Ticket {self.ticket_code}>'
\ No newline at end of file
+        return f'<Ticket {self.ticket_code}>'
+
+# --- Arsip: salinan reservasi/order item/tiket milik event lama (lihat app/archive.py) ---
+# Kolom sama dengan tabel aslinya, tanpa foreign key, ditambah archived_at.
+
+class ReservationArchive(db.Model):
+    __tablename__ = 'reservations_archive'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.String(36), nullable=False, index=True)
+    event_table_id = db.Column(db.Integer, nullable=False)
+    invoice_id = db.Column(db.String(36), nullable=True)
+    number_of_guests = db.Column(db.Integer, nullable=False)
+    total_amount = db.Column(db.Integer, nullable=False)
+    payment_status = db.Column(db.Enum(PaymentStatus), nullable=False)
+    created_at = db.Column(db.DateTime)
+    arrival_time = db.Column(db.Time, nullable=True)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<ReservationArchive {self.id}>"
+
+class OrderItemArchive(db.Model):
+    __tablename__ = 'order_items_archive'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    reservation_id = db.Column(db.Integer, nullable=False, index=True)
+    product_id = db.Column(db.Integer, nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    subtotal = db.Column(db.Integer, nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<OrderItemArchive {self.id}>"
+
+class TicketArchive(db.Model):
+    __tablename__ = 'tickets_archive'
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    ticket_code = db.Column(db.String(64), unique=True, nullable=False)
+    user_id = db.Column(db.String(36), nullable=False, index=True)
+    invoice_id = db.Column(db.String(36), nullable=True)
+    event_id = db.Column(db.Integer, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    is_used = db.Column(db.Boolean, nullable=False)
+    used_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<TicketArchive {self.ticket_code}>"
+
+class Tombstone(db.Model):
+    """Catatan baris yang dihapus, agar GET /user/sync bisa memberi tahu klien apa yang harus dibuang."""
+    __tablename__ = 'tombstones'
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<Tombstone {self.table_name}:{self.row_id}>"
+
+# Model yang ikut delta sync: setiap DELETE lewat ORM meninggalkan tombstone
+SYNCED_MODELS = (Event, Table, EventTable, Product)
+
+def _write_tombstone(mapper, connection, target):
+    connection.execute(Tombstone.__table__.insert().values(
+        table_name=mapper.local_table.name, row_id=target.id, deleted_at=datetime.utcnow()
+    ))
+
+for _model in SYNCED_MODELS:
+    event.listen(_model, 'after_delete', _write_tombstone)
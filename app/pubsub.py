@@ -0,0 +1,261 @@
+# /app/pubsub.py
+
+import json
+import os
+import queue
+import threading
+import time
+import weakref
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect, select
+from app.db_routing import RoutingSession
+
+
+class Subscription:
+    """Antrean pesan untuk satu koneksi SSE. Jika antrean penuh, koneksi ditandai `overflowed`."""
+
+    def __init__(self, feed, event_id, maxsize):
+        self.feed = feed
+        self.event_id = event_id
+        self.queue = queue.Queue(maxsize)
+        self.overflowed = False
+
+    def push(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            # Klien terlalu lambat: lebih baik ia tersambung ulang dan menerima snapshot baru
+            self.overflowed = True
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.feed.unsubscribe(self)
+
+
+_feeds = weakref.WeakSet()
+
+
+def _reset_after_fork():
+    for feed in list(_feeds):
+        feed._reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class TableFeed:
+    """
+    Pub-sub lokal per proses untuk status meja (EventTable) per event.
+
+    - Perubahan yang di-commit di proses ini dikirim langsung setelah commit
+      (lihat hook session di bawah).
+    - Satu thread poller per proses membaca status meja untuk event yang sedang
+      ditonton setiap SSE_POLL_INTERVAL detik, sehingga perubahan dari worker lain
+      juga sampai. Berapa pun jumlah penontonnya, tetap satu query per interval.
+    Status terakhir disimpan per event, jadi hanya perubahan nyata yang dikirim.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.poll_interval = app.config.get('SSE_POLL_INTERVAL', 2.0)
+        self.queue_size = app.config.get('SSE_QUEUE_SIZE', 256)
+        self._reset()
+        _feeds.add(self)
+
+    def _reset(self):
+        # Dipanggil juga di proses hasil fork: thread poller induk tidak ikut ter-fork
+        self._lock = threading.Lock()
+        self._subscribers = {}  # event_id -> set(Subscription)
+        self._statuses = {}     # event_id -> {event_table_id: status}
+        self._last_seq = {}     # event_id -> nomor pesan terakhir untuk event itu
+        self._seq = 0
+        self._poller = None
+
+    def subscribe(self, event_id, load):
+        """
+        Mendaftarkan penonton event. `load(event_ids)` hanya dipanggil jika belum
+        ada penonton lain untuk event ini. Mengembalikan (subscription, snapshot).
+        """
+        self._ensure_poller()
+        with self._lock:
+            known = self._statuses.get(event_id)
+        if known is None:
+            known = load([event_id]).get(event_id, {})
+
+        with self._lock:
+            known = self._statuses.setdefault(event_id, known)
+            subscription = Subscription(self, event_id, self.queue_size)
+            self._subscribers.setdefault(event_id, set()).add(subscription)
+            return subscription, (self._seq, dict(known))
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.event_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.event_id]
+                self._statuses.pop(subscription.event_id, None)
+                self._last_seq.pop(subscription.event_id, None)
+
+    def publish(self, event_id, statuses, since=None):
+        """
+        `statuses`: {event_table_id: status, atau None jika meja dilepas dari event}.
+        Event tanpa penonton diabaikan. `since` dipakai poller: hasil query diabaikan
+        jika event ini sudah berubah lagi setelah query dimulai (hasilnya basi).
+        """
+        with self._lock:
+            known = self._statuses.get(event_id)
+            if known is None:
+                return
+            if since is not None and self._last_seq.get(event_id, 0) > since:
+                return
+            changed = {}
+            for event_table_id, status in statuses.items():
+                if known.get(event_table_id) == status:
+                    continue
+                changed[event_table_id] = status
+                if status is None:
+                    known.pop(event_table_id, None)
+                else:
+                    known[event_table_id] = status
+            if not changed:
+                return
+            self._seq += 1
+            self._last_seq[event_id] = self._seq
+            message = (self._seq, changed)
+            for subscription in self._subscribers.get(event_id, ()):
+                subscription.push(message)
+
+    def _ensure_poller(self):
+        with self._lock:
+            if self._poller is not None:
+                return
+            self._poller = threading.Thread(target=self._poll_forever, name='table-feed-poller', daemon=True)
+            self._poller.start()
+
+    def _poll_forever(self):
+        from app import db
+
+        while True:
+            time.sleep(self.poll_interval)
+            with self._lock:
+                event_ids = list(self._subscribers)
+                started = self._seq
+            if not event_ids:
+                continue
+            try:
+                with self.app.app_context():
+                    current = load_statuses(db.session, event_ids)
+            except Exception:
+                self.app.logger.exception("Gagal membaca status meja untuk SSE")
+                continue
+            for event_id in event_ids:
+                with self._lock:
+                    removed = {event_table_id: None for event_table_id in self._statuses.get(event_id, ())}
+                self.publish(event_id, {**removed, **current.get(event_id, {})}, since=started)
+
+
+def load_statuses(session, event_ids):
+    """Satu query untuk status semua meja dari beberapa event: {event_id: {event_table_id: status}}."""
+    from app.models import EventTable
+
+    statuses = {}
+    rows = session.execute(
+        select(EventTable.event_id, EventTable.id, EventTable.status)
+        .where(EventTable.event_id.in_(event_ids))
+    )
+    for event_id, event_table_id, status in rows:
+        statuses.setdefault(event_id, {})[event_table_id] = status.value
+    return statuses
+
+
+def _sse(event_name, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_name}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _tables(statuses):
+    return [{"event_table_id": event_table_id, "status": status}
+            for event_table_id, status in sorted(statuses.items())]
+
+
+def event_stream(subscription, snapshot, heartbeat, max_seconds):
+    """
+    Generator text/event-stream: snapshot awal, lalu event 'tables' per perubahan,
+    komentar heartbeat saat sepi. Setelah max_seconds (atau jika klien tertinggal)
+    stream ditutup dan klien tersambung ulang sendiri sesuai `retry`.
+    """
+    seq, statuses = snapshot
+    deadline = time.monotonic() + max_seconds
+    try:
+        yield "retry: 3000\n" + _sse("snapshot", {"event_id": subscription.event_id, "tables": _tables(statuses)}, seq)
+        while time.monotonic() < deadline:
+            message = subscription.get(timeout=heartbeat)
+            if subscription.overflowed:
+                yield _sse("resync", {"event_id": subscription.event_id})
+                return
+            if message is None:
+                yield ": heartbeat\n\n"
+                continue
+            seq, changed = message
+            yield _sse("tables", {"event_id": subscription.event_id, "tables": _tables(changed)}, seq)
+    finally:
+        subscription.close()
+
+
+# --- Hook session: kumpulkan perubahan EventTable saat flush, kirim setelah commit ---
+
+def _collect_table_changes(session, flush_context):
+    from app.models import EventTable
+
+    changes = session.info.setdefault('table_changes', {})
+    for obj in session.new:
+        if isinstance(obj, EventTable):
+            changes.setdefault(obj.event_id, {})[obj.id] = obj.status.value
+    for obj in session.dirty:
+        if isinstance(obj, EventTable) and inspect(obj).attrs.status.history.has_changes():
+            changes.setdefault(obj.event_id, {})[obj.id] = obj.status.value
+    for obj in session.deleted:
+        if isinstance(obj, EventTable):
+            changes.setdefault(obj.event_id, {})[obj.id] = None
+
+
+def _publish_table_changes(session):
+    changes = session.info.pop('table_changes', None)
+    if not changes or not has_app_context():
+        return
+    feed = current_app.extensions.get('table_feed')
+    if feed is None:
+        return
+    for event_id, statuses in changes.items():
+        feed.publish(event_id, statuses)
+
+
+def _discard_table_changes(session):
+    session.info.pop('table_changes', None)
+
+
+_hooks_installed = False
+
+
+def init_pubsub(app):
+    """Membuat TableFeed untuk app ini dan memasang hook session (sekali per proses)."""
+    global _hooks_installed
+    app.extensions['table_feed'] = TableFeed(app)
+    if not _hooks_installed:
+        event.listen(RoutingSession, 'after_flush', _collect_table_changes)
+        event.listen(RoutingSession, 'after_commit', _publish_table_changes)
+        event.listen(RoutingSession, 'after_rollback', _discard_table_changes)
+        _hooks_installed = True
@@ -0,0 +1,128 @@
+# /app/qr.py
+
+import os
+import threading
+import time
+from flask import current_app
+from .workers import submit
+
+# Jumlah kode per task yang dikirim ke process pool saat pre-generate
+BATCH_SIZE = 50
+# Pemeriksaan ukuran cache cukup dilakukan sesekali, bukan di setiap render
+EVICTION_INTERVAL = 60
+
+_last_eviction = 0.0
+_eviction_lock = threading.Lock()
+
+
+def render_qr(payload, path):
+    """Membuat PNG QR code untuk payload. Dijalankan di process pool atau langsung."""
+    import qrcode
+
+    image = qrcode.make(payload, box_size=8, border=2)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        image.save(f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def render_qr_batch(jobs):
+    """Render banyak QR sekaligus dalam satu task agar overhead antar proses kecil."""
+    rendered = 0
+    for payload, path in jobs:
+        if not os.path.exists(path):
+            render_qr(payload, path)
+            rendered += 1
+    return rendered
+
+
+def cache_folder():
+    folder = current_app.config.get('QR_CACHE_FOLDER') or os.path.join(current_app.instance_path, 'qrcodes')
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def qr_path(ticket_code):
+    return os.path.join(cache_folder(), f"{ticket_code}.png")
+
+
+def enforce_cache_limit(force=False):
+    """
+    Menjaga total ukuran cache QR di bawah QR_CACHE_MAX_BYTES.
+    mtime dipakai sebagai waktu akses terakhir (LRU), file terlama dihapus lebih dulu.
+    """
+    global _last_eviction
+    now = time.time()
+    with _eviction_lock:
+        if not force and now - _last_eviction < EVICTION_INTERVAL:
+            return 0
+        _last_eviction = now
+
+    limit = current_app.config.get('QR_CACHE_MAX_BYTES', 200 * 1024 * 1024)
+    entries = []
+    total = 0
+    with os.scandir(cache_folder()) as it:
+        for entry in it:
+            if not entry.name.endswith('.png'):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+    removed = 0
+    if total <= limit:
+        return removed
+
+    # Hapus sampai 90% dari batas agar tidak langsung penuh lagi
+    target = int(limit * 0.9)
+    for _, size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def get_qr(ticket_code):
+    """
+    Mengembalikan path PNG QR untuk tiket, dibuat saat pertama kali diminta.
+    Cache hit cukup memperbarui mtime sebagai penanda LRU.
+    """
+    path = qr_path(ticket_code)
+    if os.path.exists(path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    render_qr(ticket_code, path)
+    enforce_cache_limit()
+    return path
+
+
+def pregenerate(ticket_codes):
+    """
+    Menyerahkan render QR ke process pool (misalnya setelah pembayaran dikonfirmasi),
+    sehingga layar tiket tidak perlu menunggu render saat pintu dibuka.
+    """
+    logger = current_app.logger
+    jobs = [(code, qr_path(code)) for code in ticket_codes]
+    jobs = [job for job in jobs if not os.path.exists(job[1])]
+
+    def _on_done(future):
+        error = future.exception()
+        if error:
+            logger.error("Gagal pre-generate QR tiket: %s", error)
+
+    futures = []
+    for start in range(0, len(jobs), BATCH_SIZE):
+        future = submit(render_qr_batch, jobs[start:start + BATCH_SIZE])
+        future.add_done_callback(_on_done)
+        futures.append(future)
+    return futures
@@ -0,0 +1,240 @@
+# /app/query_budget.py
+
+import tempfile
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Satu pengecekan: endpoint, method, path (boleh berisi {event_id} dst.), batas query,
+# body JSON (untuk POST) dan apakah request memakai token admin.
+RouteCheck = namedtuple('RouteCheck', 'endpoint method path budget body admin', defaults=(None, False))
+
+# Batas jumlah statement SQL per request. Angka ini harus tetap sama berapa pun
+# jumlah baris yang dikembalikan; jika naik seiring data, ada N+1. Dicek oleh
+# tests/test_query_budget.py (pytest) dan `flask check-queries`.
+ROUTE_CHECKS = [
+    RouteCheck('admin.index', 'GET', '/admin/', 0),
+    RouteCheck('admin.get_all_events', 'GET', '/admin/events', 4, admin=True),
+    RouteCheck('admin.get_all_events', 'GET', '/admin/events?fields=id,name,event_date', 2, admin=True),
+    RouteCheck('admin.get_event', 'GET', '/admin/events/{event_id}', 3, admin=True),
+    RouteCheck('admin.get_tables', 'GET', '/admin/tables', 2, admin=True),
+    RouteCheck('admin.get_table', 'GET', '/admin/tables/{table_id}', 2, admin=True),
+    RouteCheck('admin.get_available_tables', 'GET', '/admin/tables/available', 3, admin=True),
+    RouteCheck('admin.get_all_products_admin', 'GET', '/admin/products', 2, admin=True),
+    RouteCheck('admin.get_product', 'GET', '/admin/products/{product_id}', 2, admin=True),
+    RouteCheck('admin.database_health', 'GET', '/admin/db/health', 2, admin=True),
+    RouteCheck('checkin.get_scanner_manifest', 'GET', '/checkin/events/{event_id}/manifest', 3, admin=True),
+    RouteCheck('product.get_all_products_user', 'GET', '/products/', 1),
+    RouteCheck('user.get_my_tickets', 'GET', '/user/my-tickets?user_id={user_id}', 2),
+    RouteCheck('user.get_ticket_qr', 'GET', '/user/tickets/{ticket_code}/qr', 1),
+    RouteCheck('user.user_get_tables', 'GET', '/user/tables', 1),
+    RouteCheck('user.user_get_events', 'GET', '/user/events', 2),
+    RouteCheck('user.user_get_event_detail', 'GET', '/user/events/{event_id}', 2),
+    RouteCheck('user.user_get_event_detail', 'GET', '/user/events/{event_id}?fields=id,name,event_date', 1),
+    RouteCheck('user.user_get_products', 'GET', '/user/products', 1),
+    RouteCheck('user.sync_catalog', 'GET', '/user/sync', 4),
+    RouteCheck('user.search_catalog', 'GET', '/user/search?q=sofa&type=products', 3),
+    RouteCheck('reservation.get_my_reservations', 'GET', '/reservations/my-reservations', 1),
+    RouteCheck('reservation.get_my_tickets', 'GET', '/reservations/my-tickets', 1),
+    RouteCheck('reservation.get_my_reservations', 'GET', '/reservations/my-reservations?history=1', 2),
+    RouteCheck('reservation.get_my_tickets', 'GET', '/reservations/my-tickets?history=1', 2),
+    RouteCheck('auth.halaman_reset_password', 'GET', '/halaman-reset-password/token-tidak-ada', 1),
+    RouteCheck('auth.handle_user_login', 'POST', '/login', 1,
+               body={"email": "user@example.com", "password": "password123"}),
+    RouteCheck('batch.batch', 'POST', '/batch', 5, body={"requests": [
+        {"path": "/user/events"}, {"path": "/products/"},
+        {"path": "/reservations/my-reservations"}, {"path": "/reservations/my-tickets"},
+    ]}),
+    RouteCheck('reservation.create_reservation', 'POST', '/reservations/', 10,
+               body={"event_table_id": "{free_event_table_id}", "number_of_guests": 2,
+                     "order_items": [{"product_id": "{product_id}", "quantity": 1}]}),
+]
+
+# Endpoint GET yang sengaja tanpa budget: file statis, metrik (tanpa query) dan stream SSE
+# (respons tidak pernah selesai). Endpoint GET lain wajib ada di ROUTE_CHECKS.
+UNBUDGETED_ENDPOINTS = {'static', 'metrics.prometheus_metrics', 'user.stream_event_tables'}
+
+DEFAULT_SCALES = (2, 8)
+
+
+class QueryCounter:
+    """Menghitung statement SQL yang dijalankan thread ini selama blok count_queries()."""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+_local = threading.local()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    for counter in getattr(_local, 'counters', ()):
+        counter.statements.append(statement)
+
+
+@contextmanager
+def count_queries():
+    """
+    Context manager untuk menghitung query, misalnya:
+        with count_queries() as counter:
+            client.get('/user/events')
+        assert counter.count <= 1
+    """
+    counter = QueryCounter()
+    counters = getattr(_local, 'counters', None)
+    if counters is None:
+        counters = _local.counters = []
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    counters.append(counter)
+    try:
+        yield counter
+    finally:
+        counters.remove(counter)
+
+
+def seed(scale, password_hash):
+    """
+    Mengisi database kosong: `scale` event x `scale` meja, `scale` produk, dan user
+    dengan `scale` reservasi dan tiket. Mengembalikan id yang dipakai di path ROUTE_CHECKS.
+    """
+    from . import db
+    from .models import (User, Event, Table, EventTable, EventTableStatus, Product, Invoice,
+                         InvoiceStatus, Reservation, OrderItem, PaymentStatus, Ticket)
+
+    admin = User(name="Admin", email="admin@example.com", password_hash=password_hash, role_id=1)
+    user = User(name="User", email="user@example.com", password_hash=password_hash, role_id=2)
+    db.session.add_all([admin, user])
+
+    tables = [Table(name=f"Meja {i}", type="Round", capacity=4, price=100000) for i in range(scale)]
+    products = [Product(name=f"Produk {i}", price=10000, stock=100) for i in range(scale)]
+    events = [
+        Event(name=f"Event {i}", description="-", event_date=date.today() + timedelta(days=i + 1),
+              start_time=time(20), end_time=time(23))
+        for i in range(scale)
+    ]
+    db.session.add_all(tables + products + events)
+    db.session.flush()
+
+    event_tables = [EventTable(event_id=e.id, table_id=t.id) for e in events for t in tables]
+    db.session.add_all(event_tables)
+    db.session.flush()
+
+    expires_at = datetime.combine(date.today() + timedelta(days=scale + 1), time(23))
+    for i in range(scale):
+        et = event_tables[i]
+        et.status = EventTableStatus.BOOKED
+        invoice = Invoice(external_id=f"INV-{scale}-{i}", user_id=user.id, amount=110000, status=InvoiceStatus.PAID)
+        db.session.add(invoice)
+        db.session.flush()
+        reservation = Reservation(user_id=user.id, event_table_id=et.id, invoice_id=invoice.id,
+                                  number_of_guests=2, total_amount=110000, payment_status=PaymentStatus.PAID)
+        db.session.add(reservation)
+        db.session.flush()
+        db.session.add(OrderItem(reservation_id=reservation.id, product_id=products[i].id, quantity=1, subtotal=10000))
+        db.session.add(Ticket(ticket_code=f"TIX-CHECK{scale:03d}{i:04d}", user_id=user.id, invoice_id=invoice.id,
+                              event_id=et.event_id, expires_at=expires_at))
+    db.session.commit()
+
+    return {
+        "admin_id": admin.id,
+        "user_id": user.id,
+        "event_id": events[0].id,
+        "table_id": tables[0].id,
+        "product_id": products[0].id,
+        "ticket_code": f"TIX-CHECK{scale:03d}0000",
+        "free_event_table_id": event_tables[-1].id,
+    }
+
+
+def _fill(value, ids):
+    if isinstance(value, str):
+        if value.startswith('{') and value.endswith('}') and value[1:-1] in ids:
+            return ids[value[1:-1]]
+        return value.format(**ids)
+    if isinstance(value, dict):
+        return {k: _fill(v, ids) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fill(v, ids) for v in value]
+    return value
+
+
+def measure_routes(scale, checks=ROUTE_CHECKS):
+    """
+    Membuat app baru dengan SQLite in-memory, mengisi data skala `scale`, lalu
+    mengembalikan {(endpoint, path): (status_code, jumlah query)} untuk setiap pengecekan.
+    Kuncinya ikut path karena satu endpoint bisa dicek dengan query string berbeda.
+    """
+    from flask_jwt_extended import create_access_token
+    from . import create_app, db, bcrypt
+    from .config import TestingConfig
+
+    class QueryCheckConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = 'sqlite://'
+        DB_REPLICA_URI = None
+        APP_API_KEY = 'query-check'
+        JWT_SECRET_KEY = 'query-check-secret-query-check-secret'
+        ADMIN_WHATSAPP_NUMBER = '620000000000'
+        QR_CACHE_FOLDER = tempfile.mkdtemp(prefix='query-check-qr-')
+        METRICS_ENABLED = False
+        BCRYPT_LOG_ROUNDS = 4
+
+    app = create_app(QueryCheckConfig, cli=False)
+    results = {}
+    with app.app_context():
+        db.create_all()
+        ids = seed(scale, bcrypt.generate_password_hash("password123").decode('utf-8'))
+        tokens = {
+            False: create_access_token(identity=ids["user_id"]),
+            True: create_access_token(identity=ids["admin_id"]),
+        }
+
+    client = app.test_client()
+    for check in checks:
+        headers = {'X-API-KEY': QueryCheckConfig.APP_API_KEY, 'Authorization': f'Bearer {tokens[check.admin]}'}
+        with count_queries() as counter:
+            response = client.open(_fill(check.path, ids), method=check.method,
+                                   json=_fill(check.body, ids), headers=headers)
+        response.close()
+        results[check.endpoint, check.path] = (response.status_code, counter.count)
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+    return results
+
+
+def check_query_budgets(scales=DEFAULT_SCALES, checks=ROUTE_CHECKS):
+    """
+    Menjalankan semua pengecekan di beberapa skala data.
+    Mengembalikan list dict per endpoint: counts per skala, budget, dan daftar masalah.
+    """
+    measurements = {scale: measure_routes(scale, checks) for scale in scales}
+    report = []
+    for check in checks:
+        counts = {scale: measurements[scale][check.endpoint, check.path][1] for scale in scales}
+        statuses = {scale: measurements[scale][check.endpoint, check.path][0] for scale in scales}
+        problems = []
+        if any(status >= 500 for status in statuses.values()):
+            problems.append(f"status {sorted(set(statuses.values()))}")
+        if len(set(counts.values())) > 1:
+            problems.append("jumlah query bertambah seiring jumlah data (N+1)")
+        if max(counts.values()) > check.budget:
+            problems.append(f"melebihi budget {check.budget}")
+        report.append({
+            "endpoint": check.endpoint,
+            "method": check.method,
+            "query": check.path.partition('?')[2],
+            "budget": check.budget,
+            "counts": counts,
+            "statuses": statuses,
+            "problems": problems,
+        })
+    return report
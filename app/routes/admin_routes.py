@@ -7,13 +7,33 @@ import uuid
 from app import db
 from app import db
 from app.utils import require_api_key, require_admin_role
+from app.importer import import_rows
+from app.images import schedule_variants, variant_urls
+from app.storage import save_upload
+from app.qr import pregenerate
+from app.ticket_codes import sign_ticket
+from app.db_pool import pool_status
+from app.availability import summarize_tables, EMPTY_SUMMARY
+from app.fieldsets import Field, FieldError, requested_fields, requested_includes, load_only_option, serialize
+from sqlalchemy import text
+from sqlalchemy.orm import joinedload
+import time
 from datetime import datetime
-import os
 import json
-from werkzeug.utils import secure_filename
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+# Field yang bisa dipilih lewat ?fields= di GET /admin/events
+EVENT_LIST_FIELDS = {
+    "id": Field((Event.id,), lambda e: e.id),
+    "name": Field((Event.name,), lambda e: e.name),
+    "description": Field((Event.description,), lambda e: e.description),
+    "event_date": Field((Event.event_date,), lambda e: e.event_date.isoformat()),
+    "start_time": Field((Event.start_time,), lambda e: e.start_time.strftime('%H:%M:%S')),
+    "end_time": Field((Event.end_time,), lambda e: e.end_time.strftime('%H:%M:%S')),
+    "is_active": Field((Event.is_active,), lambda e: e.is_active),
+}
+
 @admin_bp.route("/")
 def index():
     """Endpoint dasar untuk mengecek apakah API berjalan."""
@@ -67,18 +87,14 @@ def create_event():
     if 'image' in request.files and request.files['image'].filename != '':
         image_file = request.files['image']
         if allowed_file(image_file.filename):
-            filename = secure_filename(image_file.filename)
-            unique_filename = f"{uuid.uuid4().hex}_{filename}"
-            upload_folder = current_app.config['UPLOAD_FOLDERS'].get('events')
-            
-            if not upload_folder:
+            if not current_app.config['UPLOAD_FOLDERS'].get('events'):
                 return jsonify({"error": "Konfigurasi folder upload untuk event tidak diatur."}), 500
-            
-            save_path = os.path.join(upload_folder, unique_filename)
+
             try:
-                os.makedirs(upload_folder, exist_ok=True)
-                image_file.save(save_path)
-                image_url = f"/static/event_images/{unique_filename}"
+                # Nama file = hash isi, jadi gambar yang sama hanya disimpan sekali
+                image_url, save_path, created = save_upload(image_file, 'events')
+                if created:
+                    schedule_variants(save_path)
             except Exception as e:
                 current_app.logger.error(f"Gagal menyimpan file gambar event: {e}")
                 return jsonify({"error": f"Tidak dapat menyimpan file di server: {e}"}), 500
@@ -132,6 +148,7 @@ def create_event():
             "name": new_event.name,
             "description": new_event.description,
             "image_url": new_event.image_url,
+            "image_variants": variant_urls(new_event.image_url),
             "event_date": new_event.event_date.strftime('%Y-%m-%d'),
             "start_time": new_event.start_time.strftime('%H:%M:%S'),
             "end_time": new_event.end_time.strftime('%H:%M:%S'),
@@ -143,7 +160,7 @@ def create_event():
                     "table_name": et.table.name,
                     "status": et.status.value,
                     "price": et.table.price
-                } for et in new_event.event_tables
+                } for et in new_event.event_tables.options(joinedload(EventTable.table))
             ]
         }
         return jsonify({
@@ -183,7 +200,7 @@ def get_event(id):
                 "table_id": et.table_id,
                 "status": et.status.value,
                 "price": et.table.price   # ambil harga dari tabel
-            } for et in event.event_tables
+            } for et in event.event_tables.options(joinedload(EventTable.table))
         ]
     })
 
@@ -289,38 +306,91 @@ def delete_table(id):
     db.session.commit()
     return jsonify({"message": "Table deleted"})
 
+def _handle_bulk_import(kind):
+    """Helper bersama untuk endpoint import massal meja dan produk."""
+    if 'file' not in request.files or request.files['file'].filename == '':
+        return jsonify({"error": "File import wajib diunggah pada field 'file'."}), 400
+
+    upload = request.files['file']
+    dry_run = request.args.get('dry_run', 'false').lower() in ['true', '1', 't']
+
+    try:
+        report = import_rows(kind, upload.stream, upload.filename, dry_run=dry_run)
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+    except (ValueError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        db.session.rollback()
+        return jsonify({"error": f"File tidak dapat dibaca: {e}"}), 400
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Gagal import {kind}: {e}")
+        return jsonify({"error": "Terjadi kesalahan pada server saat import data."}), 500
+
+    return jsonify({"message": f"Import {kind} selesai.", "report": report})
+
+@admin_bp.route("/tables/import", methods=["POST"])
+@require_api_key
+@jwt_required()
+@require_admin_role
+def import_tables():
+    """
+    Endpoint untuk admin meng-import banyak meja sekaligus dari file CSV/JSON/JSONL.
+    Baris dengan kolom 'id' yang sudah ada di-update (hanya kolom yang ada di file), sisanya di-insert.
+    """
+    return _handle_bulk_import("tables")
+
 @admin_bp.route("/events", methods=["GET"])
 @require_api_key
 @jwt_required()
 @require_admin_role
 def get_all_events():
-    """Endpoint untuk admin melihat semua event yang pernah dibuat."""
+    """
+    Endpoint untuk admin melihat semua event yang pernah dibuat.
+    ?fields=id,name,event_date membatasi kolom; meja (?include=tables) dan ringkasan
+    ketersediaan (?include=availability) hanya ikut jika diminta atau jika kedua
+    parameter tidak diberikan, jadi daftar ringan cukup satu query.
+    """
+    try:
+        fields = requested_fields(EVENT_LIST_FIELDS)
+        includes = requested_includes(("tables", "availability"), default=("tables", "availability"))
+    except FieldError as e:
+        return jsonify({"error": str(e)}), 400
+
     # Ambil semua event, urutkan berdasarkan tanggal event terbaru
-    events = Event.query.order_by(Event.event_date.desc()).all()
+    events = Event.query.options(load_only_option(EVENT_LIST_FIELDS, fields)).order_by(Event.event_date.desc()).all()
+
+    # Semua meja semua event diambil sekali jalan (bukan satu query per event)
+    tables_by_event = {}
+    if "tables" in includes and events:
+        event_tables = EventTable.query.options(joinedload(EventTable.table)).filter(
+            EventTable.event_id.in_([event.id for event in events])
+        ).order_by(EventTable.id).all()
+        for et in event_tables:
+            tables_by_event.setdefault(et.event_id, []).append(et)
+
+    # Jumlah meja tersedia/terpesan dan harga termurah: satu query GROUP BY untuk semua event
+    summaries = summarize_tables([event.id for event in events]) if "availability" in includes else {}
     
     # Siapkan list untuk menampung hasil
     events_list = []
     
     # Loop setiap event untuk memformat output JSON
     for event in events:
-        event_data = {
-            "id": event.id,
-            "name": event.name,
-            "description": event.description,
-            "event_date": event.event_date.isoformat(),
-            "start_time": event.start_time.strftime('%H:%M:%S'),
-            "end_time": event.end_time.strftime('%H:%M:%S'),
-            "is_active": event.is_active,
-            "tables": [
+        event_data = serialize(event, EVENT_LIST_FIELDS, fields)
+        if "availability" in includes:
+            event_data.update(summaries.get(event.id, EMPTY_SUMMARY))
+        if "tables" in includes:
+            event_data["tables"] = [
                 {
                     "event_table_id": et.id,
                     "table_id": et.table_id,
                     "table_name": et.table.name, # Tambahkan nama meja agar lebih jelas
                     "status": et.status.value,
                     "price": et.table.price
-                } for et in event.event_tables
+                } for et in tables_by_event.get(event.id, [])
             ]
-        }
         events_list.append(event_data)
         
     return jsonify(events_list)
@@ -343,7 +413,7 @@ def create_product():
     description = request.form.get('description')
     price_str = request.form.get('price')
     stock_str = request.form.get('stock')
-    current_app.logger.info(f"Data Form Diterima: name='{name}', price='{price_str}', stock='{stock_str}'")
+    current_app.logger.info("Data Form Diterima: name='%s', price='%s', stock='%s'", name, price_str, stock_str)
 
     # Validasi tipe data untuk price dan stock
     try:
@@ -357,27 +427,21 @@ def create_product():
     image_url = None
     if 'image' in request.files and request.files['image'].filename != '':
         image_file = request.files['image']
-        current_app.logger.info(f"File diterima: {image_file.filename}")
+        current_app.logger.info("File diterima: %s", image_file.filename)
         
         if allowed_file(image_file.filename):
-            filename = secure_filename(image_file.filename)
-            unique_filename = f"{uuid.uuid4().hex}_{filename}"
-            upload_folder = current_app.config['UPLOAD_FOLDERS'].get('products')
-
-            if not upload_folder:
+            if not current_app.config['UPLOAD_FOLDERS'].get('products'):
                 current_app.logger.error("FATAL: Konfigurasi 'products' di UPLOAD_FOLDERS tidak ditemukan!")
                 return jsonify({"error": "Konfigurasi upload folder server bermasalah."}), 500
 
-            save_path = os.path.join(upload_folder, unique_filename)
-            current_app.logger.info(f"Mencoba menyimpan file ke: {save_path}")
-
             try:
-                os.makedirs(upload_folder, exist_ok=True)
-                image_file.save(save_path) # Poin kritis
-                image_url = f"/static/product_images/{unique_filename}"
-                current_app.logger.info("File berhasil disimpan.")
+                # Nama file = hash isi, jadi gambar yang sama hanya disimpan sekali
+                image_url, save_path, created = save_upload(image_file, 'products') # Poin kritis
+                current_app.logger.info("File berhasil disimpan ke: %s", save_path)
+                if created:
+                    schedule_variants(save_path)
             except Exception as e:
-                current_app.logger.error(f"GAGAL MENYIMPAN FILE! Error: {e}")
+                current_app.logger.error("GAGAL MENYIMPAN FILE! Error: %s", e)
                 return jsonify({"error": f"Tidak dapat menyimpan file di server. Detail: {e}"}), 500
         else:
             current_app.logger.warning("Upload GAGAL: Tipe file tidak diizinkan.")
@@ -397,7 +461,7 @@ def create_product():
         )
         db.session.add(new_product)
         db.session.commit()
-        current_app.logger.info(f"Produk '{name}' berhasil disimpan dengan ID: {new_product.id}")
+        current_app.logger.info("Produk '%s' berhasil disimpan dengan ID: %s", name, new_product.id)
 
         return jsonify({
             "message": "Produk berhasil ditambahkan",
@@ -406,14 +470,26 @@ def create_product():
                 "name": new_product.name,
                 "price": new_product.price,
                 "stock": new_product.stock,
-                "image_url": new_product.image_url
+                "image_url": new_product.image_url,
+                "image_variants": variant_urls(new_product.image_url)
             }
         }), 201
     except Exception as e:
         db.session.rollback()
-        current_app.logger.error(f"GAGAL COMMIT KE DATABASE! Error: {e}")
+        current_app.logger.error("GAGAL COMMIT KE DATABASE! Error: %s", e)
         return jsonify({"error": "Terjadi kesalahan pada database server."}), 500
 
+@admin_bp.route("/products/import", methods=["POST"])
+@require_api_key
+@jwt_required()
+@require_admin_role
+def import_products():
+    """
+    Endpoint untuk admin meng-import banyak produk sekaligus dari file CSV/JSON/JSONL.
+    Baris dengan kolom 'id' yang sudah ada di-update (hanya kolom yang ada di file), sisanya di-insert.
+    """
+    return _handle_bulk_import("products")
+
 @admin_bp.route("/products", methods=["GET"])
 @require_api_key
 @jwt_required()
@@ -428,7 +504,8 @@ def get_all_products_admin():
             "description": p.description, 
             "price": p.price, 
             "stock": p.stock,
-            "image_url": p.image_url # Menambahkan image_url di sini
+            "image_url": p.image_url, # Menambahkan image_url di sini
+            "image_variants": variant_urls(p.image_url)
         }
         for p in products
     ])
@@ -469,6 +546,7 @@ def confirm_manual_payment(reservation_id):
         # 2. Buat tiket untuk user
         event = reservation.event_table.event
         new_ticket = Ticket(
+            # Kode sementara, diganti kode bertanda tangan setelah ID tiket tersedia
             ticket_code=f"TIX-{uuid.uuid4().hex[:10].upper()}",
             user_id=reservation.user_id,
             # Menggunakan getattr untuk keamanan jika invoice_id tidak ada
@@ -478,10 +556,21 @@ def confirm_manual_payment(reservation_id):
             expires_at=datetime.combine(event.event_date, event.end_time)
         )
         db.session.add(new_ticket)
+        db.session.flush()
+
+        # Kode tiket membawa HMAC atas ID tiket, ID event dan waktu kedaluwarsa,
+        # sehingga scanner bisa memverifikasinya tanpa koneksi ke database
+        new_ticket.ticket_code = sign_ticket(new_ticket.id, event.id, new_ticket.expires_at)
         
         # Opsi untuk mengirim email notifikasi tiket bisa ditambahkan di sini
         
         db.session.commit()
+
+        # QR tiket dibuat di background agar siap sebelum hari H
+        try:
+            pregenerate([new_ticket.ticket_code])
+        except Exception as e:
+            current_app.logger.error(f"Gagal menjadwalkan pembuatan QR tiket: {e}")
         
         return jsonify({
             "message": "Pembayaran berhasil dikonfirmasi!",
@@ -509,7 +598,8 @@ def get_product(id):
         "description": product.description, 
         "price": product.price, 
         "stock": product.stock,
-        "image_url": product.image_url
+        "image_url": product.image_url,
+        "image_variants": variant_urls(product.image_url)
     })
 
 # DELETE untuk Product
@@ -520,15 +610,9 @@ def get_product(id):
 def delete_product(id):
     """Endpoint untuk admin menghapus produk."""
     product = Product.query.get_or_404(id)
-    
-    if product.image_url:
-        try:
-            image_path = os.path.join(current_app.config['UPLOAD_FOLDERS']['products'], os.path.basename(product.image_url))
-            if os.path.exists(image_path):
-                os.remove(image_path)
-        except Exception as e:
-            current_app.logger.error(f"Gagal menghapus file gambar: {e}")
 
+    # File gambar yang tidak lagi dipakai produk/event lain dihapus oleh
+    # `flask images prune-orphans`, bukan di sini (upload lain mungkin sedang memakainya ulang)
     db.session.delete(product)
     db.session.commit()
     return jsonify({"message": f"Produk '{product.name}' berhasil dihapus"})
@@ -589,7 +673,8 @@ def update_event(id):
 def delete_event(id):
     """Endpoint untuk admin menghapus event."""
     event = Event.query.get_or_404(id)
-    
+
+    # File gambar dihapus oleh `flask images prune-orphans` (lihat delete_product)
     db.session.delete(event)
     db.session.commit()
     return jsonify({"message": f"Event '{event.name}' berhasil dihapus"})
@@ -674,4 +759,33 @@ def delete_all_user_reservations(user_id):
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Gagal menghapus semua reservasi untuk user {user_id}: {e}")
-        return jsonify({"error": "Terjadi kesalahan pada server saat proses penghapusan."}), 500
\ No newline at end of file
+        return jsonify({"error": "Terjadi kesalahan pada server saat proses penghapusan."}), 500
+
+@admin_bp.route("/db/health", methods=["GET"])
+@require_api_key
+@jwt_required()
+@require_admin_role
+def database_health():
+    """
+    Endpoint untuk admin memantau koneksi database: latensi query sederhana,
+    isi pool (checked out, overflow) dan statistik waktu tunggu checkout.
+    """
+    start = time.perf_counter()
+    try:
+        db.session.execute(text("SELECT 1"))
+        healthy = True
+        error = None
+    except Exception as e:
+        db.session.rollback()
+        healthy = False
+        error = str(e)
+    latency_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    return jsonify({
+        "status": "ok" if healthy else "error",
+        "error": error,
+        "profile": current_app.config.get('PROFILE_NAME'),
+        "latency_ms": latency_ms,
+        "pool": pool_status(db.engine),
+        "replica_pool": pool_status(db.engines['replica']) if 'replica' in db.engines else None,
+    }), 200 if healthy else 503
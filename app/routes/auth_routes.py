@@ -5,7 +5,8 @@ from flask_jwt_extended import create_access_token
 from ..models import User
 import secrets
 import uuid
-from .. import db, bcrypt, mail
+from .. import db, bcrypt
+from ..mailer import send_async
 from ..utils import require_api_key
 
 
@@ -169,8 +170,8 @@ def request_password_reset():
                 recipients=[user.email]
             )
             msg.body = f"Halo {user.name},\n\nKlik link ini untuk reset password:\n{reset_link}\n\nLink berlaku 1 jam."
-            mail.send(msg)
-            current_app.logger.info(f"Email reset password dikirim ke {user.email}")
+            # Koneksi SMTP bisa memakan waktu detik; kirim di background agar worker tidak tertahan
+            send_async(msg)
         except Exception as e:
             current_app.logger.error(f"GAGAL KIRIM EMAIL: {str(e)}")
             return jsonify({"error": f"Error mengirim email: {str(e)}"}), 500
@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, request, jsonify, current_app, g
+from flask_jwt_extended import jwt_required
+from werkzeug.http import HTTP_STATUS_CODES
+from werkzeug.test import EnvironBuilder
+from app import db
+from app.db_pool import pool_status
+from app.utils import require_api_key
+
+batch_bp = Blueprint('batch', __name__)
+
+# Header yang tidak diteruskan ke sub-request (body-nya lain, dan respons sub-request
+# harus berupa JSON polos agar bisa digabung, bukan hasil kompresi)
+SKIPPED_HEADERS = {'content-type', 'content-length', 'accept-encoding', 'host'}
+
+
+def _sub_environ(path):
+    headers = [(key, value) for key, value in request.headers if key.lower() not in SKIPPED_HEADERS]
+    builder = EnvironBuilder(
+        path=path, method='GET', base_url=request.url_root, headers=headers,
+        # Alamat klien asli, agar pengecekan berbasis IP (mis. /metrics) tetap berlaku
+        environ_base={'REMOTE_ADDR': request.remote_addr},
+    )
+    try:
+        return builder.get_environ()
+    finally:
+        builder.close()
+
+
+def _dispatch(app, environ):
+    """Menjalankan satu sub-request lengkap dengan before/after_request dan decorator auth-nya."""
+    with app.request_context(environ):
+        try:
+            response = app.full_dispatch_request()
+        except Exception:
+            db.session.rollback()
+            app.logger.exception("Sub-request batch gagal: %s", environ.get('PATH_INFO'))
+            return 500, {"error": "Terjadi kesalahan internal server."}
+        try:
+            if response.is_json and not response.is_streamed:
+                return response.status_code, response.get_json()
+            if response.status_code >= 400:
+                # Halaman error bawaan (mis. 404 dari get_or_404) berupa HTML
+                return response.status_code, {"error": HTTP_STATUS_CODES.get(response.status_code, "Error")}
+            return 400, {"error": "Hanya endpoint dengan respons JSON yang bisa dipakai di batch."}
+        finally:
+            response.close()
+
+
+def _concurrent_workers(count):
+    """
+    Jumlah thread untuk mode concurrent. Setiap thread memakai koneksinya sendiri,
+    jadi dibatasi sisa kapasitas pool (size + max_overflow - checked_out) agar batch
+    tidak membuat request lain di worker ini menunggu koneksi sampai timeout.
+    """
+    workers = min(count, current_app.config.get('BATCH_MAX_WORKERS', 4))
+    for engine in db.engines.values():
+        status = pool_status(engine)
+        # Selain QueuePool (mis. StaticPool SQLite in-memory) dan overflow tak terbatas tidak dibatasi
+        if 'size' in status and status['max_overflow'] >= 0:
+            workers = min(workers, status['size'] + status['max_overflow'] - status['checked_out'])
+    return workers
+
+
+def _dispatch_sequential(app, environ):
+    # Sub-request berbagi app context (dan session database) dengan request batch,
+    # jadi isi `g` dikembalikan agar tidak bocor antar sub-request
+    saved = dict(vars(g))
+    try:
+        return _dispatch(app, environ)
+    finally:
+        vars(g).clear()
+        vars(g).update(saved)
+
+
+@batch_bp.route("/batch", methods=["POST"])
+@require_api_key
+@jwt_required()
+def batch():
+    """
+    Menjalankan beberapa GET internal dalam satu request, mis. untuk layar utama aplikasi:
+    {"requests": [{"id": "events", "path": "/user/events"}, {"id": "tickets", "path": "/reservations/my-tickets"}],
+     "concurrent": false}
+    API key dan token diperiksa untuk batch ini, lalu diperiksa ulang di setiap sub-request
+    karena header yang sama diteruskan ke sana; pemeriksaan itu hanya membandingkan header
+    dan memverifikasi tanda tangan JWT, tanpa query database tambahan. Secara default sub-request dijalankan berurutan
+    di app context (dan session database) yang sama; dengan "concurrent": true masing-masing
+    berjalan di thread sendiri dengan app context dan koneksi sendiri, selama pool
+    koneksi masih punya ruang (jika tidak, tetap berurutan; lihat "concurrent" di respons).
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('requests')
+    max_requests = current_app.config.get('BATCH_MAX_REQUESTS', 10)
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "requests wajib berupa list yang tidak kosong."}), 400
+    if len(items) > max_requests:
+        return jsonify({"error": f"Maksimal {max_requests} sub-request per batch."}), 400
+
+    jobs = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str) or not item['path'].startswith('/'):
+            return jsonify({"error": f"requests[{index}].path wajib diisi dan diawali '/'."}), 400
+        if str(item.get('method', 'GET')).upper() != 'GET':
+            return jsonify({"error": f"requests[{index}]: hanya GET yang didukung."}), 400
+        if item['path'].split('?', 1)[0].rstrip('/') == '/batch':
+            return jsonify({"error": f"requests[{index}]: batch tidak boleh bersarang."}), 400
+        jobs.append((item.get('id', index), item['path'], _sub_environ(item['path'])))
+
+    app = current_app._get_current_object()
+    workers = _concurrent_workers(len(jobs)) if data.get('concurrent') else 1
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch') as executor:
+            results = list(executor.map(lambda job: _dispatch(app, job[2]), jobs))
+    else:
+        results = [_dispatch_sequential(app, environ) for _, _, environ in jobs]
+
+    return jsonify({"concurrent": workers > 1, "responses": [
+        {"id": job_id, "path": path, "status": status, "body": body}
+        for (job_id, path, _), (status, body) in zip(jobs, results)
+    ]})
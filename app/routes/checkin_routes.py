@@ -0,0 +1,91 @@
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from datetime import datetime, timezone
+from app import db
+from app.models import Event
+from app.utils import require_api_key, require_admin_role
+from app.checkin import (check_in, build_manifest, sync_scans,
+                         CHECKED_IN, ALREADY_USED, NOT_FOUND, WRONG_EVENT, EXPIRED, INVALID)
+
+checkin_bp = Blueprint('checkin', __name__, url_prefix='/checkin')
+
+# Status HTTP dan pesan untuk setiap hasil scan
+SCAN_RESPONSES = {
+    CHECKED_IN: (200, "Tiket valid. Silakan masuk."),
+    ALREADY_USED: (409, "Tiket sudah digunakan."),
+    NOT_FOUND: (404, "Tiket tidak ditemukan."),
+    WRONG_EVENT: (409, "Tiket ini bukan untuk event ini."),
+    EXPIRED: (410, "Tiket sudah kedaluwarsa."),
+    INVALID: (400, "Kode tiket tidak valid."),
+}
+
+
+@checkin_bp.route("/events/<int:event_id>/scan", methods=["POST"])
+@require_api_key
+@jwt_required()
+@require_admin_role
+def scan_ticket(event_id):
+    """
+    Endpoint untuk scanner di pintu masuk: memvalidasi dan menandai tiket terpakai.
+    Body: {"ticket_code": "TIX-..."}
+    """
+    data = request.get_json(silent=True) or {}
+    ticket_code = data.get('ticket_code')
+    if not isinstance(ticket_code, str) or not ticket_code.strip():
+        return jsonify({"error": "ticket_code wajib diisi."}), 400
+
+    try:
+        result, detail = check_in(event_id, ticket_code.strip())
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Gagal memproses scan tiket {ticket_code}: {e}")
+        return jsonify({"error": "Terjadi kesalahan pada server."}), 500
+
+    status_code, message = SCAN_RESPONSES[result]
+    return jsonify({"result": result, "message": message, **detail}), status_code
+
+
+@checkin_bp.route("/events/<int:event_id>/manifest", methods=["GET"])
+@require_api_key
+@jwt_required()
+@require_admin_role
+def get_scanner_manifest(event_id):
+    """Endpoint untuk mengunduh manifest verifikasi offline bagi perangkat scanner."""
+    event = Event.query.get_or_404(event_id)
+    return jsonify(build_manifest(event))
+
+
+@checkin_bp.route("/events/<int:event_id>/sync", methods=["POST"])
+@require_api_key
+@jwt_required()
+@require_admin_role
+def sync_offline_scans(event_id):
+    """
+    Endpoint untuk scanner mengirim hasil scan offline secara batch.
+    Body: {"scans": [{"ticket_code": "TIX-...", "used_at": "YYYY-MM-DDTHH:MM:SS"}]}
+    used_at tanpa offset dianggap UTC; yang memakai offset dikonversi ke UTC.
+    """
+    data = request.get_json(silent=True) or {}
+    raw_scans = data.get('scans')
+    if not isinstance(raw_scans, list):
+        return jsonify({"error": "scans wajib berupa list."}), 400
+
+    scans = []
+    for scan in raw_scans:
+        try:
+            used_at = datetime.fromisoformat(scan['used_at'])
+            if used_at.tzinfo is not None:
+                # Kolom used_at naive UTC; campuran naive/aware juga tidak bisa dibandingkan
+                used_at = used_at.astimezone(timezone.utc).replace(tzinfo=None)
+            scans.append({"ticket_code": str(scan['ticket_code']).strip(), "used_at": used_at})
+        except (KeyError, TypeError, ValueError):
+            return jsonify({"error": "Setiap scan wajib memiliki ticket_code dan used_at (ISO 8601)."}), 400
+
+    try:
+        report = sync_scans(event_id, scans)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Gagal sinkronisasi scan offline event {event_id}: {e}")
+        return jsonify({"error": "Terjadi kesalahan pada server."}), 500
+
+    return jsonify(report)
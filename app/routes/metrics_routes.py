@@ -0,0 +1,31 @@
+import hmac
+from flask import Blueprint, Response, request, jsonify, current_app
+from app import db
+from app.metrics import registry, render_pool_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+LOOPBACK_ADDRESSES = {'127.0.0.1', '::1'}
+
+
+def _metrics_access_allowed():
+    """
+    Jika METRICS_TOKEN diisi, wajib header 'Authorization: Bearer <token>'.
+    Tanpa token, hanya request langsung dari localhost yang diizinkan; request yang
+    lewat reverse proxy (ada X-Forwarded-For) ditolak karena alamatnya juga localhost.
+    """
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        auth = request.headers.get('Authorization', '')
+        return auth.startswith('Bearer ') and hmac.compare_digest(auth[7:], token)
+    return request.remote_addr in LOOPBACK_ADDRESSES and 'X-Forwarded-For' not in request.headers
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    """Endpoint internal untuk Prometheus: latensi, status code dan query SQL per endpoint."""
+    if not _metrics_access_allowed():
+        return jsonify({"error": "Akses tidak diizinkan"}), 403
+
+    body = registry.render() + render_pool_metrics(db.engines)
+    return Response(body, mimetype='text/plain; version=0.0.4')
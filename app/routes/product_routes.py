@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required
 from app.models import Product
+from app.images import variant_urls
 
 product_bp = Blueprint('product', __name__, url_prefix='/products')
 
@@ -18,7 +19,8 @@ def get_all_products_user():
             "name": p.name,
             "description": p.description,
             "price": p.price,
-            "image_url": p.image_url  # <-- GAMBAR DITAMBAHKAN DI SINI
+            "image_url": p.image_url,  # <-- GAMBAR DITAMBAHKAN DI SINI
+            "image_variants": variant_urls(p.image_url)
         }
         for p in products
     ]
@@ -1,10 +1,12 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import (
     Reservation, EventTable, EventTableStatus, PaymentStatus, 
-    Ticket, Event, User, Product, OrderItem
+    Ticket, Event, User, Product, OrderItem, Table,
+    ReservationArchive, TicketArchive
 )
 from app import db
+from sqlalchemy.orm import joinedload, contains_eager
 import urllib.parse
 import uuid
 from datetime import datetime
@@ -130,14 +132,19 @@ def create_reservation():
 @reservation_bp.route("/my-reservations", methods=["GET"])
 @jwt_required()
 def get_my_reservations():
-    """Endpoint untuk user melihat riwayat reservasi miliknya."""
+    """
+    Endpoint untuk user melihat riwayat reservasi miliknya.
+    Reservasi event lama yang sudah diarsipkan hanya ikut jika ?history=1.
+    """
     current_user_id = get_jwt_identity()
+    history = request.args.get('history', 'false').lower() in ['true', '1', 't']
     
-    reservations = Reservation.query.filter_by(user_id=current_user_id).order_by(Reservation.created_at.desc()).all()
+    # Event dan meja ikut di-load dalam query yang sama agar tidak ada query per reservasi
+    reservations = Reservation.query.options(
+        joinedload(Reservation.event_table).joinedload(EventTable.event),
+        joinedload(Reservation.event_table).joinedload(EventTable.table),
+    ).filter_by(user_id=current_user_id).order_by(Reservation.created_at.desc()).all()
     
-    if not reservations:
-        return jsonify([]), 200 # Kembalikan list kosong jika tidak ada
-
     results = []
     for res in reservations:
         results.append({
@@ -150,17 +157,53 @@ def get_my_reservations():
             "payment_status": res.payment_status.value,
             "reservation_date": res.created_at.isoformat()
         })
-        
+
+    if history:
+        for item in results:
+            item["archived"] = False
+        # Tabel arsip hanya dibaca saat riwayat lama memang diminta
+        archived = db.session.execute(
+            db.select(
+                ReservationArchive.id, Event.name, Event.event_date, Table.name,
+                ReservationArchive.number_of_guests, ReservationArchive.total_amount,
+                ReservationArchive.payment_status, ReservationArchive.created_at,
+            )
+            .outerjoin(EventTable, EventTable.id == ReservationArchive.event_table_id)
+            .outerjoin(Event, Event.id == EventTable.event_id)
+            .outerjoin(Table, Table.id == EventTable.table_id)
+            .where(ReservationArchive.user_id == current_user_id)
+        )
+        for res_id, event_name, event_date, table_name, guests, total, status, created_at in archived:
+            results.append({
+                "reservation_id": res_id,
+                "event_name": event_name,
+                "event_date": event_date.isoformat() if event_date else None,
+                "table_name": table_name,
+                "number_of_guests": guests,
+                "total_amount": total,
+                "payment_status": status.value,
+                "reservation_date": created_at.isoformat() if created_at else None,
+                "archived": True
+            })
+        # Reservasi aktif dan arsip digabung, yang terbaru lebih dulu
+        results.sort(key=lambda r: r["reservation_date"] or "", reverse=True)
+
     return jsonify(results)
 
 @reservation_bp.route("/my-tickets", methods=["GET"])
 @jwt_required()
 def get_my_tickets():
-    """Endpoint untuk user melihat daftar tiket aktif miliknya."""
+    """
+    Endpoint untuk user melihat daftar tiket aktif miliknya.
+    Dengan ?history=1 semua tiket ikut, termasuk yang sudah dipakai/lewat dan yang diarsipkan.
+    """
     current_user_id = get_jwt_identity()
     
+    if request.args.get('history', 'false').lower() in ['true', '1', 't']:
+        return jsonify(_ticket_history(current_user_id))
+
     # Ambil tiket yang belum dipakai dan event-nya belum/sedang berlangsung
-    active_tickets = Ticket.query.join(Ticket.event).filter(
+    active_tickets = Ticket.query.join(Ticket.event).options(contains_eager(Ticket.event)).filter(
         Ticket.user_id == current_user_id,
         Ticket.is_used == False,
         Event.event_date >= datetime.utcnow().date()
@@ -171,6 +214,43 @@ def get_my_tickets():
             "ticket_code": t.ticket_code,
             "event_name": t.event.name,
             "event_date": t.event.event_date.isoformat(),
-            "is_used": t.is_used
+            "is_used": t.is_used,
+            "qr_code_url": url_for('user.get_ticket_qr', ticket_code=t.ticket_code, _external=True)
         } for t in active_tickets
-    ])
\ No newline at end of file
+    ])
+
+
+def _ticket_history(user_id):
+    """Semua tiket user dari tabel aktif dan arsip, event terbaru lebih dulu."""
+    tickets = Ticket.query.join(Ticket.event).options(contains_eager(Ticket.event)).filter(
+        Ticket.user_id == user_id
+    ).all()
+    history = [
+        {
+            "ticket_code": t.ticket_code,
+            "event_name": t.event.name,
+            "event_date": t.event.event_date.isoformat(),
+            "is_used": t.is_used,
+            "qr_code_url": url_for('user.get_ticket_qr', ticket_code=t.ticket_code, _external=True),
+            "archived": False
+        } for t in tickets
+    ]
+
+    archived = db.session.execute(
+        db.select(TicketArchive.ticket_code, Event.name, Event.event_date, TicketArchive.is_used)
+        .outerjoin(Event, Event.id == TicketArchive.event_id)
+        .where(TicketArchive.user_id == user_id)
+    )
+    for ticket_code, event_name, event_date, is_used in archived:
+        history.append({
+            "ticket_code": ticket_code,
+            "event_name": event_name,
+            "event_date": event_date.isoformat() if event_date else None,
+            "is_used": is_used,
+            # QR hanya untuk tiket aktif
+            "qr_code_url": None,
+            "archived": True
+        })
+
+    history.sort(key=lambda t: t["event_date"] or "", reverse=True)
+    return history
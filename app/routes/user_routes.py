@@ -1,16 +1,47 @@
-from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required
+from flask import Blueprint, request, jsonify, current_app, send_file, url_for, Response
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 # import uuid
-from ..models import User, Invoice, Event, Ticket, Table, Product
+from sqlalchemy.orm import joinedload
+from ..models import User, Invoice, Event, EventTable, Ticket, Table, Product
 from .. import db
 from ..utils import require_api_key
+from ..images import variant_urls
+from ..qr import get_qr
+from ..db_routing import use_primary
+from ..pubsub import event_stream, load_statuses
+from ..sync import parse_since, changes_since
+from ..search import search
+from ..availability import summarize_tables, EMPTY_SUMMARY
+from ..fieldsets import Field, FieldError, requested_fields, requested_includes, load_only_option, serialize
 
 # Membuat Blueprint baru untuk user
 user_bp = Blueprint('user', __name__)
 
 # FUNGSI DAN ROUTE XENDIT DIHAPUS DARI SINI
 
+# Field yang bisa dipilih lewat ?fields= (urutan = urutan di respons)
+PRODUCT_FIELDS = {
+    "id": Field((Product.id,), lambda p: p.id),
+    "name": Field((Product.name,), lambda p: p.name),
+    "description": Field((Product.description,), lambda p: p.description),
+    "price": Field((Product.price,), lambda p: p.price),
+    "stock": Field((Product.stock,), lambda p: p.stock),
+    "image_url": Field((Product.image_url,), lambda p: p.image_url),
+    "image_variants": Field((Product.image_url,), lambda p: variant_urls(p.image_url)),
+}
+
+EVENT_DETAIL_FIELDS = {
+    "id": Field((Event.id,), lambda e: e.id),
+    "name": Field((Event.name,), lambda e: e.name),
+    "description": Field((Event.description,), lambda e: e.description),
+    "image_url": Field((Event.image_url,), lambda e: e.image_url if e.image_url else None),
+    "image_variants": Field((Event.image_url,), lambda e: variant_urls(e.image_url if e.image_url else None)),
+    "event_date": Field((Event.event_date,), lambda e: e.event_date.isoformat()),
+    "start_time": Field((Event.start_time,), lambda e: str(e.start_time)),
+    "end_time": Field((Event.end_time,), lambda e: str(e.end_time)),
+}
+
 @user_bp.route("/my-tickets", methods=["GET"])
 @require_api_key
 @jwt_required()
@@ -25,7 +56,7 @@ def get_my_tickets():
     if not user:
         return jsonify({"error": "User tidak ditemukan"}), 404
 
-    active_tickets = db.session.query(Ticket).join(Invoice).filter(
+    active_tickets = db.session.query(Ticket).options(joinedload(Ticket.event)).join(Invoice).filter(
         Ticket.user_id == user.id,
         Invoice.status == 'PAID',
         Ticket.expires_at > datetime.utcnow()
@@ -36,8 +67,8 @@ def get_my_tickets():
 
     tickets_data = []
     for ticket in active_tickets:
-        # Asumsi qrcode sudah digenerate sebelumnya dan disimpan dengan nama ticket_code.png
-        qr_code_url = f"{request.host_url}static/qrcodes/{ticket.ticket_code}.png"
+        # QR dibuat saat pertama kali diminta lalu disimpan di cache disk
+        qr_code_url = url_for('user.get_ticket_qr', ticket_code=ticket.ticket_code, _external=True)
         
         tickets_data.append({
             "ticket_code": ticket.ticket_code,
@@ -49,6 +80,28 @@ def get_my_tickets():
     return jsonify({"tickets": tickets_data})
 
 
+@user_bp.route("/tickets/<string:ticket_code>/qr", methods=["GET"])
+@require_api_key
+@jwt_required()
+def get_ticket_qr(ticket_code):
+    """Endpoint untuk mengambil gambar QR tiket milik user yang sedang login."""
+    ticket = Ticket.query.filter_by(ticket_code=ticket_code).first()
+    if not ticket or ticket.user_id != get_jwt_identity():
+        return jsonify({"error": "Tiket tidak ditemukan"}), 404
+
+    try:
+        path = get_qr(ticket.ticket_code)
+    except Exception as e:
+        current_app.logger.error(f"Gagal membuat QR tiket {ticket_code}: {e}")
+        return jsonify({"error": "Gagal membuat QR code."}), 500
+
+    # QR untuk satu kode tiket tidak pernah berubah, aman di-cache oleh aplikasi
+    response = send_file(path, mimetype='image/png', max_age=86400, conditional=True)
+    response.cache_control.private = True
+    response.cache_control.public = None
+    return response
+
+
 @user_bp.route("/tables", methods=["GET"])
 @require_api_key
 @jwt_required()
@@ -65,8 +118,34 @@ def user_get_tables():
 @require_api_key
 @jwt_required()
 def user_get_events():
-    """Endpoint untuk user melihat daftar event yang aktif."""
-    events = Event.query.filter_by(is_active=True).all()
+    """
+    Endpoint untuk user melihat daftar event yang aktif, urut tanggal dan jam mulai,
+    beserta jumlah meja tersedia/terpesan dan harga meja termurah yang masih tersedia.
+    Event yang sudah lewat tidak ikut kecuali ?upcoming=false. Rentang tanggal
+    bisa dibatasi dengan ?from=YYYY-MM-DD dan/atau ?to=YYYY-MM-DD (inklusif).
+    """
+    try:
+        date_from = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if request.args.get('from') else None
+        date_to = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if request.args.get('to') else None
+    except ValueError:
+        return jsonify({"error": "Format tanggal from/to tidak valid. Gunakan YYYY-MM-DD."}), 400
+    if date_from and date_to and date_from > date_to:
+        return jsonify({"error": "from tidak boleh lebih besar dari to."}), 400
+
+    if request.args.get('upcoming', 'true').lower() in ['true', '1', 't']:
+        today = datetime.utcnow().date()
+        date_from = max(date_from, today) if date_from else today
+
+    # Filter dan urutan memakai index (is_active, event_date)
+    query = Event.query.filter(Event.is_active.is_(True))
+    if date_from:
+        query = query.filter(Event.event_date >= date_from)
+    if date_to:
+        query = query.filter(Event.event_date <= date_to)
+    events = query.order_by(Event.event_date, Event.start_time, Event.id).all()
+    # Jumlah meja tersedia/terpesan dan harga termurah semua event: satu query GROUP BY
+    summaries = summarize_tables([e.id for e in events])
+
     return jsonify([
         {
             "id": e.id,
@@ -76,6 +155,7 @@ def user_get_events():
             "start_time": str(e.start_time),
             "end_time": str(e.end_time),
             # "price": e.price # Anda mungkin ingin menyesuaikan cara harga ditampilkan
+            **summaries.get(e.id, EMPTY_SUMMARY),
         }
         for e in events
     ])
@@ -85,21 +165,22 @@ def user_get_events():
 @require_api_key
 @jwt_required()
 def user_get_event_detail(event_id):
-    """Endpoint untuk user melihat detail satu event beserta meja yang tersedia."""
-    event = Event.query.get_or_404(event_id)
-    
-    # Menambahkan detail gambar dari event itu sendiri
-    event_image_url = event.image_url if event.image_url else None
-
-    return jsonify({
-        "id": event.id,
-        "name": event.name,
-        "description": event.description,
-        "image_url": event_image_url, # <-- Menampilkan gambar event
-        "event_date": event.event_date.isoformat(),
-        "start_time": str(event.start_time),
-        "end_time": str(event.end_time),
-        "tables": [
+    """
+    Endpoint untuk user melihat detail satu event beserta meja yang tersedia.
+    ?fields=id,name,event_date membatasi kolom yang di-SELECT; meja hanya ikut
+    jika ?include=tables (atau jika kedua parameter tidak diberikan).
+    """
+    try:
+        fields = requested_fields(EVENT_DETAIL_FIELDS)
+        includes = requested_includes(("tables",), default=("tables",))
+    except FieldError as e:
+        return jsonify({"error": str(e)}), 400
+
+    event = Event.query.options(load_only_option(EVENT_DETAIL_FIELDS, fields)).get_or_404(event_id)
+
+    event_data = serialize(event, EVENT_DETAIL_FIELDS, fields)
+    if "tables" in includes:
+        event_data["tables"] = [
             {
                 # ID unik untuk hubungan event-meja, ini yang dikirim saat reservasi
                 "event_table_id": et.id, 
@@ -109,29 +190,122 @@ def user_get_event_detail(event_id):
                 "table_price": et.table.price,       # <-- Detail tambahan
                 "status": et.status.value
             }
-            for et in event.event_tables
+            for et in event.event_tables.options(joinedload(EventTable.table))
         ]
+    return jsonify(event_data)
+
+@user_bp.route("/events/<int:event_id>/stream", methods=["GET"])
+@require_api_key
+@jwt_required()
+@use_primary
+def stream_event_tables(event_id):
+    """
+    Server-Sent Events: snapshot status semua meja event, lalu hanya perubahan
+    statusnya (reservasi, pembatalan, meja ditambah/dilepas) begitu terjadi.
+    Semua penonton event yang sama di satu proses berbagi satu feed.
+    """
+    if db.session.query(Event.id).filter_by(id=event_id).first() is None:
+        return jsonify({"error": "Event tidak ditemukan."}), 404
+
+    feed = current_app.extensions['table_feed']
+    subscription, snapshot = feed.subscribe(event_id, lambda event_ids: load_statuses(db.session, event_ids))
+    stream = event_stream(subscription, snapshot,
+                          heartbeat=current_app.config.get('SSE_HEARTBEAT_SECONDS', 15),
+                          max_seconds=current_app.config.get('SSE_MAX_SECONDS', 600))
+    response = Response(stream, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        # Nginx tidak boleh menahan (buffer) event
+        'X-Accel-Buffering': 'no',
     })
+    # Jika respons ditutup sebelum generator sempat berjalan, blok finally-nya tidak
+    # pernah dieksekusi; lepaskan langganan di sini juga (unsubscribe aman dipanggil dua kali)
+    response.call_on_close(subscription.close)
+    return response
+
+@user_bp.route("/sync", methods=["GET"])
+@require_api_key
+@jwt_required()
+def sync_catalog():
+    """
+    Delta sync untuk aplikasi mobile: ?since=<next_since dari sync sebelumnya>.
+    Mengembalikan events, tables, event_tables dan products yang berubah sejak itu,
+    serta id yang dihapus. Tanpa ?since, semua data dikirim (full: true).
+    """
+    try:
+        since = parse_since(request.args.get('since'))
+    except ValueError:
+        return jsonify({"error": "Format since tidak valid. Gunakan ISO 8601, mis. 2026-10-19T08:00:00Z."}), 400
+
+    return jsonify(changes_since(since))
+
+@user_bp.route("/search", methods=["GET"])
+@require_api_key
+@jwt_required()
+def search_catalog():
+    """
+    Pencarian event aktif dan produk yang masih ada stoknya berdasarkan nama/deskripsi.
+    ?q=kata kunci (setiap kata cocok sebagai prefiks), ?type=events|products|all,
+    ?page= dan ?per_page= (maks. SEARCH_MAX_PER_PAGE). Hasil diurutkan berdasarkan skor.
+    """
+    q = request.args.get('q', '').strip()
+    kind = request.args.get('type', 'all')
+    if not q:
+        return jsonify({"error": "Parameter q wajib diisi."}), 400
+    if kind not in ('all', 'events', 'products'):
+        return jsonify({"error": "type harus events, products atau all."}), 400
+    try:
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', 20))
+    except ValueError:
+        return jsonify({"error": "page dan per_page harus berupa angka."}), 400
+    if page < 1 or per_page < 1:
+        return jsonify({"error": "page dan per_page minimal 1."}), 400
+    per_page = min(per_page, current_app.config.get('SEARCH_MAX_PER_PAGE', 100))
+
+    serializers = {
+        "events": lambda e: {
+            "id": e.id,
+            "name": e.name,
+            "event_date": e.event_date.isoformat(),
+            "image_url": e.image_url,
+        },
+        "products": lambda p: {
+            "id": p.id,
+            "name": p.name,
+            "price": p.price,
+            "stock": p.stock,
+            "image_url": p.image_url,
+        },
+    }
+
+    result = {"q": q, "page": page, "per_page": per_page}
+    for name, serialize_row in serializers.items():
+        if kind not in ('all', name):
+            continue
+        total, hits = search(name, q, page=page, per_page=per_page)
+        result[name] = {
+            "total": total,
+            "items": [{**serialize_row(row), "score": round(score, 3)} for row, score in hits],
+        }
+    return jsonify(result)
 
 @user_bp.route("/products", methods=["GET"])
 @require_api_key
 @jwt_required()
 def user_get_products():
-    """Endpoint untuk user melihat semua produk yang tersedia."""
+    """
+    Endpoint untuk user melihat semua produk yang tersedia.
+    ?fields=id,name,price,image_url untuk tampilan daftar tanpa kolom description.
+    """
     try:
-        products = Product.query.filter(Product.stock > 0).all()
+        fields = requested_fields(PRODUCT_FIELDS)
+    except FieldError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        products = Product.query.options(load_only_option(PRODUCT_FIELDS, fields)).filter(Product.stock > 0).all()
         
-        products_list = [
-            {
-                "id": p.id,
-                "name": p.name,
-                "description": p.description,
-                "price": p.price,
-                "stock": p.stock,
-                "image_url": p.image_url
-            }
-            for p in products
-        ]
+        products_list = [serialize(p, PRODUCT_FIELDS, fields) for p in products]
         
         return jsonify(products_list)
         
@@ -0,0 +1,177 @@
+# /app/search.py
+
+import re
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, select
+from sqlalchemy.dialects.mysql import match
+from app import db
+from app.models import Event, Product, Tombstone
+
+# Bobot kemunculan kata di nama dibanding di deskripsi
+NAME_WEIGHT = 3
+MIN_TERM_LENGTH = 2
+MAX_TERMS = 8
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    return [token for token in _TOKEN_RE.findall((text or '').lower()) if len(token) >= MIN_TERM_LENGTH]
+
+
+def parse_query(q):
+    """Kata-kata pencarian (unik, urutan dipertahankan); operator boolean MySQL ikut terbuang."""
+    terms = []
+    for term in tokenize(q):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+# Jenis yang bisa dicari: model, kondisi baris yang tampil ke user
+SEARCHABLE = {
+    "events": (Event, lambda: Event.is_active.is_(True)),
+    "products": (Product, lambda: Product.stock > 0),
+}
+
+
+class InvertedIndex:
+    """
+    Inverted index di memori untuk database tanpa FULLTEXT (SQLite saat testing).
+    Kosakata disimpan terurut sehingga pencarian prefiks cukup bisect + scan.
+    Index diperbarui bertahap: hanya baris dengan updated_at baru dan tombstone baru
+    yang diproses ulang, bukan seluruh tabel.
+    """
+
+    def __init__(self, model, visible, overlap_seconds=60):
+        self.model = model
+        self.visible = visible
+        self.postings = {}      # token -> {row_id: skor}
+        self.documents = {}     # row_id -> {token: skor}
+        self.vocabulary = []    # token terurut
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self.synced_at = None
+        self._lock = threading.Lock()
+
+    def _remove(self, row_id):
+        for token in self.documents.pop(row_id, {}):
+            posting = self.postings.get(token)
+            if posting is not None:
+                posting.pop(row_id, None)
+
+    def _add(self, row_id, name, description):
+        weights = {}
+        for token in tokenize(name):
+            weights[token] = weights.get(token, 0) + NAME_WEIGHT
+        for token in tokenize(description):
+            weights[token] = weights.get(token, 0) + 1
+        self.documents[row_id] = weights
+        for token, weight in weights.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                insort(self.vocabulary, token)
+            posting[row_id] = weight
+
+    def refresh(self, session):
+        """
+        Memproses tombstone dan baris yang berubah sejak refresh sebelumnya, dimundurkan
+        `overlap`: transaksi yang mengisi updated_at (atau menulis tombstone) lebih dulu
+        tetapi commit belakangan tetap terbaca di refresh berikutnya, seperti next_since
+        di delta sync. Baris yang terproses dua kali aman (dihapus lalu ditambah ulang).
+        """
+        model = self.model
+        with self._lock:
+            now = datetime.utcnow()
+            query = select(model.id, model.name, model.description, self.visible().label('visible'))
+            if self.synced_at is not None:
+                since = self.synced_at - self.overlap
+                # Tombstone lebih dulu: id yang dihapus lalu dipakai ulang ditambahkan lagi di bawah
+                deleted = session.execute(
+                    select(Tombstone.row_id).where(
+                        Tombstone.table_name == model.__tablename__,
+                        Tombstone.deleted_at >= since,
+                    )
+                ).scalars()
+                for row_id in deleted:
+                    self._remove(row_id)
+                query = query.where(model.updated_at >= since)
+            for row_id, name, description, visible in session.execute(query):
+                self._remove(row_id)
+                if visible:
+                    self._add(row_id, name, description)
+            self.synced_at = now
+
+    def search(self, terms):
+        """Mengembalikan [(row_id, skor)] urut skor; semua kata harus cocok (sebagai prefiks)."""
+        scores = None
+        with self._lock:
+            for term in terms:
+                matched = {}
+                i = bisect_left(self.vocabulary, term)
+                while i < len(self.vocabulary) and self.vocabulary[i].startswith(term):
+                    token = self.vocabulary[i]
+                    # Kata yang sama persis lebih relevan daripada yang hanya berawalan sama
+                    bonus = 2 if token == term else 1
+                    for row_id, weight in self.postings[token].items():
+                        matched[row_id] = matched.get(row_id, 0) + weight * bonus
+                    i += 1
+                if scores is None:
+                    scores = matched
+                else:
+                    scores = {row_id: score + matched[row_id] for row_id, score in scores.items() if row_id in matched}
+                if not scores:
+                    return []
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+def _memory_search(kind, terms, page, per_page):
+    indexes = current_app.extensions.setdefault('search_indexes', {})
+    index = indexes.get(kind)
+    if index is None:
+        overlap = current_app.config.get('SYNC_OVERLAP_SECONDS', 60)
+        index = indexes.setdefault(kind, InvertedIndex(*SEARCHABLE[kind], overlap_seconds=overlap))
+    index.refresh(db.session)
+    ranked = index.search(terms)
+    start = (page - 1) * per_page
+    return len(ranked), ranked[start:start + per_page]
+
+
+def _mysql_search(kind, terms, page, per_page):
+    model, visible = SEARCHABLE[kind]
+    # '+kata*' = wajib ada, cocok sebagai prefiks
+    against = " ".join(f"+{term}*" for term in terms)
+    in_text = match(model.name, model.description, against=against).in_boolean_mode()
+    in_name = match(model.name, against=against).in_boolean_mode()
+    score = (in_name * NAME_WEIGHT + in_text).label('score')
+
+    condition = (in_text, visible())
+    total = db.session.execute(select(func.count()).select_from(model).where(*condition)).scalar()
+    rows = db.session.execute(
+        select(model.id, score).where(*condition)
+        .order_by(score.desc(), model.id)
+        .limit(per_page).offset((page - 1) * per_page)
+    ).all()
+    return total, [(row_id, float(row_score)) for row_id, row_score in rows]
+
+
+def search(kind, q, page=1, per_page=20):
+    """
+    Mencari `kind` ('events' atau 'products') berdasarkan nama dan deskripsi.
+    MySQL memakai index FULLTEXT (boolean mode); dialek lain memakai InvertedIndex.
+    Mengembalikan (total, [(objek, skor)]) untuk halaman yang diminta.
+    """
+    terms = parse_query(q)
+    if not terms:
+        return 0, []
+    if db.engine.dialect.name == 'mysql':
+        total, ranked = _mysql_search(kind, terms, page, per_page)
+    else:
+        total, ranked = _memory_search(kind, terms, page, per_page)
+
+    model = SEARCHABLE[kind][0]
+    rows = {row.id: row for row in model.query.filter(model.id.in_([row_id for row_id, _ in ranked]))} if ranked else {}
+    return total, [(rows[row_id], score) for row_id, score in ranked if row_id in rows]
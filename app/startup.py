@@ -0,0 +1,63 @@
+# /app/startup.py
+
+import os
+import subprocess
+import sys
+
+# Dijalankan di proses baru agar modul yang sudah termuat tidak mengacaukan hasil.
+# Baris terakhir stdout adalah lama create_app() (termasuk import) dalam milidetik.
+PROBE = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "from app import create_app\n"
+    "create_app(cli={cli})\n"
+    "print((time.perf_counter() - start) * 1000)\n"
+)
+
+
+def _run_probe(cli, importtime, profile=None):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, APP_PROFILE=profile) if profile else None
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', PROBE.format(cli=bool(cli))]
+    result = subprocess.run(command, cwd=root, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "create_app() gagal")
+    return float(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def parse_importtime(output):
+    """
+    Mengubah output `-X importtime` menjadi list dict
+    {module, self_ms, cumulative_ms}, urut sesuai urutan import.
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+def profile_startup(cli=False, repeat=3, profile=None):
+    """
+    Mengukur cold start create_app() di proses baru.
+    Waktu yang dilaporkan adalah yang tercepat dari `repeat` kali percobaan,
+    sedangkan rincian import diambil dari satu percobaan dengan -X importtime.
+    profile mengisi APP_PROFILE proses tersebut (default: environment saat ini).
+    """
+    timings = [_run_probe(cli, importtime=False, profile=profile)[0] for _ in range(max(repeat, 1))]
+    _, importtime_output = _run_probe(cli, importtime=True, profile=profile)
+    modules = parse_importtime(importtime_output)
+    return {
+        "create_app_ms": min(timings),
+        "timings_ms": timings,
+        "modules": modules,
+    }
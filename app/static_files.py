@@ -0,0 +1,67 @@
+# /app/static_files.py
+
+import mimetypes
+import os
+import re
+from flask import current_app, request, abort
+from werkzeug.security import safe_join
+from werkzeug.utils import send_from_directory
+
+# File yang namanya hash isi (upload, varian, manifest) tidak akan pernah berubah isinya
+IMMUTABLE_NAME = re.compile(r'^[0-9a-f]{64}(_[a-z]+)?\.[a-z0-9]+$')
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def is_immutable(filename):
+    """True jika file diberi nama berdasarkan hash isinya."""
+    return bool(IMMUTABLE_NAME.match(os.path.basename(filename)))
+
+
+def _max_age(filename):
+    if is_immutable(filename):
+        return IMMUTABLE_MAX_AGE
+    return current_app.config.get('STATIC_MAX_AGE', 3600)
+
+
+def _cache_control(response, filename):
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = _max_age(filename)
+    if is_immutable(filename):
+        response.cache_control.immutable = True
+    return response
+
+
+def serve_static(filename):
+    """
+    Pengganti handler /static bawaan Flask.
+    - File berbasis hash dikirim dengan 'Cache-Control: immutable' selama 1 tahun.
+    - STATIC_OFFLOAD = 'sendfile' -> header X-Sendfile (Apache/lighttpd).
+    - STATIC_OFFLOAD = 'accel'    -> header X-Accel-Redirect (nginx).
+    - Tanpa offload, file dikirim oleh Werkzeug yang sudah menangani
+      Range, If-None-Match dan If-Modified-Since.
+    """
+    static_folder = current_app.static_folder
+    offload = current_app.config.get('STATIC_OFFLOAD')
+
+    if offload == 'accel':
+        path = safe_join(static_folder, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        # nginx yang akan menangani Range/conditional request dan mengirim isinya
+        response = current_app.response_class()
+        response.headers['X-Accel-Redirect'] = f"{current_app.config['STATIC_ACCEL_PREFIX'].rstrip('/')}/{filename}"
+        response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        return _cache_control(response, filename)
+
+    response = send_from_directory(
+        static_folder,
+        filename,
+        request.environ,
+        use_x_sendfile=(offload == 'sendfile'),
+        response_class=current_app.response_class,
+        conditional=True,
+        etag=True,
+        max_age=_max_age(filename),
+    )
+    return _cache_control(response, filename)
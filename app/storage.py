@@ -0,0 +1,168 @@
+# /app/storage.py
+
+import hashlib
+import os
+import tempfile
+import time
+from flask import current_app
+from sqlalchemy import select
+from werkzeug.utils import secure_filename
+from . import db
+from .models import Product, Event
+from .images import forget_variants
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+# File yang baru dibuat/dipakai ulang dalam rentang ini tidak disentuh prune_orphans,
+# karena baris yang mereferensikannya mungkin belum di-commit
+ORPHAN_GRACE_SECONDS = 3600
+TEMP_PREFIX = '.upload-'
+
+# URL publik untuk setiap folder upload, sesuai struktur di /static
+URL_PREFIXES = {
+    "products": "/static/product_images",
+    "events": "/static/event_images",
+}
+
+
+def _hash_file(path):
+    """Menghitung SHA-256 sebuah file di disk secara bertahap."""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def content_filename(digest, filename):
+    """Nama file berbasis hash isi, ekstensi diambil dari nama file asli."""
+    extension = secure_filename(filename).rsplit('.', 1)[-1].lower()
+    return f"{digest}.{extension}"
+
+
+def save_upload(file_storage, kind):
+    """
+    Menyimpan file upload dengan nama sesuai hash isinya.
+    File di-stream ke file sementara sambil di-hash; jika file dengan isi yang sama
+    sudah ada, file sementara dibuang dan file lama dipakai ulang (mtime-nya diperbarui
+    agar tidak dihapus prune_orphans sebelum baris baru di-commit).
+    Mengembalikan (image_url, path, created).
+    """
+    folder = current_app.config['UPLOAD_FOLDERS'][kind]
+    os.makedirs(folder, exist_ok=True)
+
+    hasher = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=TEMP_PREFIX)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for chunk in iter(lambda: file_storage.stream.read(HASH_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+                out.write(chunk)
+
+        filename = content_filename(hasher.hexdigest(), file_storage.filename)
+        path = os.path.join(folder, filename)
+        try:
+            os.utime(path)
+            os.remove(tmp_path)
+            created = False
+        except FileNotFoundError:
+            os.replace(tmp_path, path)
+            created = True
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return f"{URL_PREFIXES[kind]}/{filename}", path, created
+
+
+def reference_count(image_url):
+    """Jumlah baris produk dan event yang masih memakai sebuah file gambar."""
+    products = db.session.query(Product.id).filter(Product.image_url == image_url).count()
+    events = db.session.query(Event.id).filter(Event.image_url == image_url).count()
+    return products + events
+
+
+def _referenced_urls():
+    urls = set(db.session.scalars(select(Product.image_url).where(Product.image_url.isnot(None))))
+    urls.update(db.session.scalars(select(Event.image_url).where(Event.image_url.isnot(None))))
+    return urls
+
+
+def prune_orphans(kind, grace_seconds=ORPHAN_GRACE_SECONDS, dry_run=False):
+    """
+    Menghapus file upload (beserta variannya) yang tidak lagi dipakai produk/event,
+    serta file sementara dari upload yang gagal. Menghapus produk/event tidak langsung
+    menghapus filenya: upload lain dengan isi yang sama bisa saja sedang memakai ulang
+    file itu tetapi belum commit. File yang diubah dalam grace_seconds terakhir dilewati.
+    Mengembalikan daftar URL yang dihapus (atau yang akan dihapus jika dry_run).
+    """
+    folder = current_app.config['UPLOAD_FOLDERS'][kind]
+    if not os.path.isdir(folder):
+        return []
+
+    cutoff = time.time() - grace_seconds
+    referenced = _referenced_urls()
+    removed = []
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if not os.path.isfile(path) or os.path.getmtime(path) > cutoff:
+            continue
+        if name.startswith(TEMP_PREFIX):
+            if not dry_run:
+                os.remove(path)
+            continue
+        url = f"{URL_PREFIXES[kind]}/{name}"
+        if name.startswith('.') or url in referenced:
+            continue
+        if dry_run:
+            removed.append(url)
+            continue
+
+        # Dipindahkan dulu (atomik) lalu dicek ulang: save_upload setelah titik ini tidak
+        # menemukan file lama dan menulis file baru; yang sempat memakainya ulang
+        # memperbarui mtime atau sudah commit, sehingga file dikembalikan
+        trash = os.path.join(folder, f".orphan-{name}")
+        try:
+            os.replace(path, trash)
+        except FileNotFoundError:
+            continue
+        db.session.rollback()  # transaksi baru agar commit terbaru ikut terbaca
+        if os.path.getmtime(trash) > cutoff or reference_count(url) > 0:
+            os.replace(trash, path)
+            continue
+        os.remove(trash)
+        if not os.path.exists(path):
+            forget_variants(url)
+        removed.append(url)
+    return removed
+
+
+def dedupe_folder(kind, dry_run=False):
+    """
+    Migrasi satu kali: mengganti nama semua file di folder upload menjadi nama
+    berbasis hash isi. Mengembalikan (mapping url_lama -> url_baru, file_lama).
+    File lama belum dihapus agar bisa dihapus setelah database di-commit.
+    """
+    folder = current_app.config['UPLOAD_FOLDERS'][kind]
+    mapping = {}
+    stale_files = []
+    if not os.path.isdir(folder):
+        return mapping, stale_files
+
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if name.startswith('.') or not os.path.isfile(path):
+            continue
+
+        new_name = content_filename(_hash_file(path), name)
+        if new_name == name:
+            continue
+
+        new_path = os.path.join(folder, new_name)
+        if not dry_run and not os.path.exists(new_path):
+            os.link(path, new_path)
+        mapping[f"{URL_PREFIXES[kind]}/{name}"] = f"{URL_PREFIXES[kind]}/{new_name}"
+        stale_files.append(path)
+
+    return mapping, stale_files
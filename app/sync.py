@@ -0,0 +1,111 @@
+# /app/sync.py
+
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from app import db
+from app.images import variant_urls
+from app.models import Event, Table, EventTable, Product, Tombstone
+
+
+def parse_since(value):
+    """
+    Mengubah ?since= (ISO 8601, mis. '2026-10-19T08:00:00Z') menjadi datetime UTC naif
+    seperti kolom updated_at. None jika kosong; ValueError jika formatnya salah.
+    """
+    if not value:
+        return None
+    since = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since
+
+
+def _event(e):
+    return {
+        "id": e.id,
+        "name": e.name,
+        "description": e.description,
+        "image_url": e.image_url,
+        "image_variants": variant_urls(e.image_url),
+        "event_date": e.event_date.isoformat(),
+        "start_time": str(e.start_time),
+        "end_time": str(e.end_time),
+        "is_active": e.is_active,
+    }
+
+
+def _table(t):
+    return {"id": t.id, "name": t.name, "type": t.type, "capacity": t.capacity, "price": t.price}
+
+
+def _event_table(et):
+    return {"id": et.id, "event_id": et.event_id, "table_id": et.table_id, "status": et.status.value}
+
+
+def _product(p):
+    return {
+        "id": p.id,
+        "name": p.name,
+        "description": p.description,
+        "price": p.price,
+        "stock": p.stock,
+        "image_url": p.image_url,
+        "image_variants": variant_urls(p.image_url),
+    }
+
+
+# kunci respons -> (model, serializer)
+RESOURCES = {
+    "events": (Event, _event),
+    "tables": (Table, _table),
+    "event_tables": (EventTable, _event_table),
+    "products": (Product, _product),
+}
+
+
+def changes_since(since):
+    """
+    Baris events/tables/event_tables/products yang dibuat atau berubah sejak `since`,
+    plus id yang dihapus (dari tombstone). Tanpa `since`, atau jika `since` lebih tua
+    dari masa simpan tombstone, semua baris dikirim dengan full=True dan klien harus
+    mengganti seluruh datanya.
+
+    `next_since` sengaja mundur SYNC_OVERLAP_SECONDS dari waktu server: transaksi yang
+    baru commit setelah query ini (dan lag replica) tetap terbawa di sync berikutnya.
+    Klien cukup upsert berdasarkan id, jadi baris yang terkirim dua kali tidak masalah.
+    """
+    config = current_app.config
+    now = datetime.utcnow()
+    retention = timedelta(days=config.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+    full = since is None or since < now - retention
+
+    result = {"full": full}
+    for key, (model, serialize) in RESOURCES.items():
+        query = model.query
+        if not full:
+            query = query.filter(model.updated_at >= since)
+        result[key] = [serialize(row) for row in query.order_by(model.id)]
+
+    deleted = {key: [] for key in RESOURCES}
+    if not full:
+        keys_by_table = {model.__tablename__: key for key, (model, _) in RESOURCES.items()}
+        tombstones = db.session.query(Tombstone.table_name, Tombstone.row_id).filter(
+            Tombstone.deleted_at >= since
+        ).order_by(Tombstone.id)
+        for table_name, row_id in tombstones:
+            key = keys_by_table.get(table_name)
+            if key is not None:
+                deleted[key].append(row_id)
+    result["deleted"] = deleted
+
+    next_since = now - timedelta(seconds=config.get('SYNC_OVERLAP_SECONDS', 60))
+    result["next_since"] = next_since.isoformat() + 'Z'
+    return result
+
+
+def prune_tombstones(days):
+    """Menghapus tombstone yang lebih tua dari `days` hari. Mengembalikan jumlah baris."""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    count = Tombstone.query.filter(Tombstone.deleted_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+    return count
@@ -0,0 +1,77 @@
+# /app/ticket_codes.py
+
+import base64
+import binascii
+import calendar
+import hashlib
+import hmac
+import struct
+import time
+from flask import current_app
+
+CODE_PREFIX = "TIX-"
+# ticket_id, event_id, expires_at (detik epoch UTC, unsigned 32-bit)
+PAYLOAD = struct.Struct('>III')
+MAC_SIZE = 12
+SIGNED_CODE_LENGTH = len(CODE_PREFIX) + len(base64.b32encode(b'\0' * (PAYLOAD.size + MAC_SIZE)).rstrip(b'='))
+
+
+def _master_key():
+    return current_app.config['TICKET_SIGNING_KEY'].encode('utf-8')
+
+
+def event_key(event_id, master_key=None):
+    """
+    Kunci HMAC khusus satu event, diturunkan dari kunci utama.
+    Kunci inilah yang dibagikan ke scanner, sehingga scanner satu event
+    tidak bisa membuat tiket untuk event lain.
+    """
+    master_key = master_key or _master_key()
+    return hmac.new(master_key, f"event:{event_id}".encode(), hashlib.sha256).digest()
+
+
+def _to_epoch(expires_at):
+    return calendar.timegm(expires_at.utctimetuple())
+
+
+def sign_ticket(ticket_id, event_id, expires_at, key=None):
+    """Membuat kode tiket bertanda tangan: TIX-<base32(payload + hmac)>."""
+    payload = PAYLOAD.pack(ticket_id, event_id, _to_epoch(expires_at))
+    mac = hmac.new(key or event_key(event_id), payload, hashlib.sha256).digest()[:MAC_SIZE]
+    return CODE_PREFIX + base64.b32encode(payload + mac).decode('ascii').rstrip('=')
+
+
+def is_signed_code(code):
+    """Kode lama (TIX-XXXXXXXXXX acak) tidak punya tanda tangan dan harus dicek ke database."""
+    return code.startswith(CODE_PREFIX) and len(code) == SIGNED_CODE_LENGTH
+
+
+def verify_ticket(code, key=None, now=None):
+    """
+    Memverifikasi kode tiket tanpa database.
+    Mengembalikan dict {ticket_id, event_id, expires_at, expired} jika tanda tangan
+    valid, atau None jika kode tidak valid / dipalsukan.
+    """
+    if not is_signed_code(code):
+        return None
+
+    encoded = code[len(CODE_PREFIX):]
+    encoded += '=' * (-len(encoded) % 8)
+    try:
+        raw = base64.b32decode(encoded)
+    except (binascii.Error, ValueError):
+        return None
+
+    payload, mac = raw[:PAYLOAD.size], raw[PAYLOAD.size:]
+    ticket_id, event_id, expires_at = PAYLOAD.unpack(payload)
+    expected = hmac.new(key or event_key(event_id), payload, hashlib.sha256).digest()[:MAC_SIZE]
+    if not hmac.compare_digest(mac, expected):
+        return None
+
+    now = now if now is not None else time.time()
+    return {
+        "ticket_id": ticket_id,
+        "event_id": event_id,
+        "expires_at": expires_at,
+        "expired": expires_at <= now,
+    }
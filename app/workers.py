@@ -0,0 +1,63 @@
+# /app/workers.py
+
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from flask import current_app
+
+_pool = None
+_pool_pid = None
+_lock = threading.Lock()
+
+
+def get_process_pool(max_workers=None):
+    """
+    Mengembalikan process pool milik proses ini, dibuat saat pertama kali dipakai.
+    Pool dibuat ulang jika proses sudah di-fork (misalnya worker gunicorn),
+    karena pool milik proses induk tidak bisa dipakai dari proses anak.
+    """
+    global _pool, _pool_pid
+    with _lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=max_workers)
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def submit(fn, *args):
+    """
+    Menjalankan fungsi CPU-bound di luar request thread.
+    Jika WORKER_PROCESSES = 0 (mis. saat testing), fungsi dijalankan langsung.
+    """
+    workers = current_app.config.get('WORKER_PROCESSES', 2)
+    if not workers:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    return get_process_pool(workers).submit(fn, *args)
+
+
+def shutdown(wait=True):
+    """Mematikan process pool (dipanggil saat proses berhenti)."""
+    global _pool, _pool_pid
+    with _lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=wait)
+        _pool = None
+        _pool_pid = None
+
+
+def after_fork(app):
+    """
+    Dipanggil di setiap worker gunicorn setelah fork (lihat gunicorn.conf.py).
+    Koneksi pool milik proses master dibuang tanpa ditutup, supaya worker membuka
+    koneksinya sendiri dan tidak berbagi socket MySQL dengan proses lain.
+    """
+    from . import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -0,0 +1,10 @@
+# /my-api-project/asgi.py
+# Entry point untuk server ASGI (uvicorn/hypercorn), contoh:
+#   uvicorn asgi:app --workers 4
+# Aplikasi tetap WSGI; asgiref menjalankannya di thread pool.
+# Profil default 'production', sama seperti wsgi.py (lihat APP_PROFILE).
+
+from asgiref.wsgi import WsgiToAsgi
+from wsgi import app as wsgi_app
+
+app = WsgiToAsgi(wsgi_app)
@@ -0,0 +1,92 @@
+# /benchmarks/compression_bench.py
+"""
+Biaya CPU vs byte yang dihemat untuk kompresi respons JSON pada payload umum
+(daftar event admin, detail event, katalog produk, daftar event user).
+
+Penggunaan:
+    python benchmarks/compression_bench.py --preset small --repeat 20
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app import compression
+from app.config import TestingConfig
+from app.datagen import PRESETS, generate
+from app.models import User
+
+API_KEY = 'bench-api-key'
+PAYLOADS = [
+    ('admin events', '/admin/events'),
+    ('event detail', '/user/events/1'),
+    ('user products', '/user/products'),
+    ('user events', '/user/events'),
+]
+
+
+class BenchConfig(TestingConfig):
+    APP_API_KEY = API_KEY
+    JWT_SECRET_KEY = 'bench-jwt-secret-bench-jwt-secret-0000'
+    METRICS_ENABLED = False
+    BCRYPT_LOG_ROUNDS = 4
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--preset', choices=list(PRESETS), default='small')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        generate(PRESETS[args.preset])
+        admin = User.query.filter_by(role_id=1).first()
+        headers = {'X-API-KEY': API_KEY, 'Authorization': f'Bearer {create_access_token(identity=admin.id)}'}
+    client = app.test_client()
+
+    codecs = [('gzip-1', 'gzip', 1), ('gzip-6', 'gzip', 6), ('gzip-9', 'gzip', 9)]
+    if compression.brotli is not None:
+        codecs += [('br-4', 'br', 4), ('br-5', 'br', 5), ('br-11', 'br', 11)]
+    else:
+        print("brotli tidak terpasang, hanya gzip yang diukur.")
+
+    print(f"{'payload':14} {'codec':8} {'raw KB':>9} {'hasil KB':>9} {'rasio':>7} {'kompres ms':>11}")
+    for label, url in PAYLOADS:
+        data = client.get(url, headers=headers).get_data()
+        for name, encoding, level in codecs:
+            compressed, ms = timed(
+                lambda: compression.compress(data, encoding, gzip_level=level, brotli_quality=level), args.repeat)
+            print(f"{label:14} {name:8} {len(data) / 1024:9.1f} {len(compressed) / 1024:9.1f} "
+                  f"{len(compressed) / len(data):7.2f} {ms:11.3f}")
+        _, hash_ms = timed(lambda: hashlib.blake2b(data, digest_size=16).digest(), args.repeat)
+        print(f"{label:14} {'hash LRU':8} {'':9} {'':9} {'':7} {hash_ms:11.3f}")
+
+    # End-to-end: tanpa kompresi, gzip pertama kali (miss) dan gzip dari cache (hit)
+    print(f"\n{'payload':14} {'identity ms':>12} {'gzip miss ms':>13} {'gzip hit ms':>12}")
+    for label, url in PAYLOADS:
+        _, identity_ms = timed(lambda: client.get(url, headers=headers).get_data(), args.repeat)
+        misses = []
+        for _ in range(args.repeat):
+            compression._cache = None
+            _, ms = timed(lambda: client.get(url, headers={**headers, 'Accept-Encoding': 'gzip'}).get_data(), 1)
+            misses.append(ms)
+        _, hit_ms = timed(lambda: client.get(url, headers={**headers, 'Accept-Encoding': 'gzip'}).get_data(), args.repeat)
+        print(f"{label:14} {identity_ms:12.2f} {sum(misses) / len(misses):13.2f} {hit_ms:12.2f}")
+
+
+if __name__ == '__main__':
+    main()
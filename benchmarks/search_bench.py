@@ -0,0 +1,103 @@
+# /benchmarks/search_bench.py
+"""
+Latensi GET /user/search pada katalog besar (default 100.000 produk).
+
+Dengan SQLite (default) yang diukur adalah inverted index di memori: waktu build
+pertama, refresh tanpa perubahan, refresh setelah satu produk berubah, dan latensi
+query. Dengan --database-url mysql+pymysql://... yang diukur index FULLTEXT
+(tabel dibuat ulang, jadi JANGAN arahkan ke database production).
+
+Penggunaan:
+    python benchmarks/search_bench.py --products 100000 --repeat 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app import search as search_module
+from app.config import TestingConfig
+from app.datagen import PRESETS, generate
+from sqlalchemy import update
+from app.models import Product, User
+
+API_KEY = 'bench-api-key'
+QUERIES = ['bin', 'walker black', 'chivas', 'heineken tower', 'zzz', 'la']
+
+
+class BenchConfig(TestingConfig):
+    APP_API_KEY = API_KEY
+    JWT_SECRET_KEY = 'bench-jwt-secret-bench-jwt-secret-0000'
+    METRICS_ENABLED = False
+    COMPRESS_ENABLED = False
+    BCRYPT_LOG_ROUNDS = 4
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def timed_ms(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--database-url', help="Default SQLite in-memory.")
+    args = parser.parse_args()
+
+    if args.database_url:
+        BenchConfig.SQLALCHEMY_DATABASE_URI = args.database_url
+    app = create_app(BenchConfig, cli=False)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        start = time.perf_counter()
+        generate(PRESETS['tiny']._replace(products=args.products))
+        print(f"{args.products} produk dibuat dalam {time.perf_counter() - start:.1f} s ({db.engine.dialect.name})")
+        # Katalog production jarang berubah semuanya dalam satu menit terakhir; tanpa ini seluruh
+        # data bench masih di dalam jendela overlap refresh dan setiap refresh memproses ulang semuanya
+        db.session.execute(update(Product).values(updated_at=datetime.utcnow() - timedelta(days=1)))
+        db.session.commit()
+        admin = User.query.filter_by(role_id=1).first()
+        headers = {'X-API-KEY': API_KEY, 'Authorization': f'Bearer {create_access_token(identity=admin.id)}'}
+
+        if db.engine.dialect.name != 'mysql':
+            index = search_module.InvertedIndex(*search_module.SEARCHABLE['products'])
+            print(f"build index      : {timed_ms(lambda: index.refresh(db.session)):9.1f} ms "
+                  f"({len(index.vocabulary)} kata, {len(index.documents)} dokumen)")
+            print(f"refresh (no-op)  : {timed_ms(lambda: index.refresh(db.session)):9.2f} ms")
+            product = db.session.get(Product, 1)
+            product.name = "Produk Baru Sekali"
+            db.session.commit()
+            print(f"refresh (1 baris): {timed_ms(lambda: index.refresh(db.session)):9.2f} ms")
+            db.session.remove()
+
+    client = app.test_client()
+    # Permintaan pertama juga membangun index untuk app (fallback); tidak ikut diukur
+    client.get('/user/search', query_string={'q': 'warmup'}, headers=headers)
+
+    print(f"\n{'query':16} {'hasil':>7} {'median ms':>10} {'p95 ms':>8}")
+    for q in QUERIES:
+        samples = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            response = client.get('/user/search', query_string={'q': q, 'type': 'products'}, headers=headers)
+            samples.append((time.perf_counter() - start) * 1000)
+        total = response.get_json()['products']['total']
+        print(f"{q:16} {total:7d} {statistics.median(samples):10.2f} {percentile(samples, 95):8.2f}")
+
+
+if __name__ == '__main__':
+    main()
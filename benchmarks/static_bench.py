@@ -0,0 +1,97 @@
+# /benchmarks/static_bench.py
+"""
+Benchmark waktu worker per request gambar di /static, sebelum dan sesudah
+handler static kustom (cache header immutable + offload X-Sendfile/X-Accel-Redirect).
+
+Penggunaan:
+    python benchmarks/static_bench.py --requests 1000
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.config import Config
+
+SAMPLE_IMAGE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'app', 'static', 'product_images',
+    '3b4844d5344141549aaf38aff2b7da28_Screenshot_2025-08-27_150754.png',
+)
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+
+def measure(client, url, n, headers=None):
+    """Mengembalikan (wall µs/request, CPU µs/request, byte body/request)."""
+    total_bytes = 0
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(n):
+        response = client.get(url, headers=headers or {})
+        total_bytes += len(response.get_data())
+        response.close()
+    wall = (time.perf_counter() - wall_start) / n * 1e6
+    cpu = (time.process_time() - cpu_start) / n * 1e6
+    return wall, cpu, total_bytes / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    static_dir = tempfile.mkdtemp()
+    with open(SAMPLE_IMAGE, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    os.makedirs(os.path.join(static_dir, 'product_images'))
+    shutil.copy(SAMPLE_IMAGE, os.path.join(static_dir, 'product_images', f'{digest}.png'))
+    url = f'/static/product_images/{digest}.png'
+
+    app = create_app(BenchConfig)
+    app.static_folder = static_dir
+    client = app.test_client()
+    custom_view = app.view_functions['static']
+
+    first = client.get(url)
+    etag = first.headers.get('ETag')
+    first.close()
+
+    scenarios = []
+
+    # Sebelum: handler bawaan Flask, tanpa cache header sehingga klien selalu revalidasi
+    app.view_functions['static'] = app.send_static_file
+    scenarios.append(("flask default, full GET", measure(client, url, args.requests)))
+    scenarios.append(("flask default, revalidate (304)", measure(client, url, args.requests, {'If-None-Match': etag})))
+
+    # Sesudah: handler kustom
+    app.view_functions['static'] = custom_view
+    for offload in ('', 'sendfile', 'accel'):
+        app.config['STATIC_OFFLOAD'] = offload
+        label = offload or 'stream'
+        scenarios.append((f"custom {label}, full GET", measure(client, url, args.requests)))
+    app.config['STATIC_OFFLOAD'] = ''
+    scenarios.append(("custom stream, range 0-1023", measure(client, url, args.requests, {'Range': 'bytes=0-1023'})))
+    scenarios.append(("custom stream, revalidate (304)", measure(client, url, args.requests, {'If-None-Match': etag})))
+
+    response = client.get(url)
+    print(f"Cache-Control baru: {response.headers.get('Cache-Control')}")
+    response.close()
+    print(f"{'skenario':40} {'wall µs':>10} {'cpu µs':>10} {'byte body':>12}")
+    for label, (wall, cpu, size) in scenarios:
+        print(f"{label:40} {wall:10.1f} {cpu:10.1f} {size:12.0f}")
+    print("Catatan: dengan 'immutable', klien tidak mengirim request revalidasi sama sekali selama max-age.")
+
+    shutil.rmtree(static_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+# /benchmarks/worker_bench.py
+"""
+Perbandingan throughput worker gunicorn sync vs gthread (dan gevent jika terpasang)
+untuk beban campuran: login (bcrypt), katalog produk, daftar event dan
+request reset password (SMTP ke server palsu yang sengaja lambat).
+
+Penggunaan:
+    python benchmarks/worker_bench.py --duration 15 --clients 32 --workers 2
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+API_KEY = 'bench-api-key'
+JWT_SECRET = 'bench-jwt-secret-bench-jwt-secret-0000'
+PASSWORD = 'password123'
+
+# (bobot, method, path, butuh_token, body)
+WORKLOAD = [
+    (50, 'GET', '/products/', True, None),
+    (30, 'GET', '/user/events', True, None),
+    (15, 'POST', '/login', False, {"email": "bench0@example.com", "password": PASSWORD}),
+    (5, 'POST', '/request-password-reset', False, {"email": "bench0@example.com"}),
+]
+
+
+class SlowSMTPHandler(socketserver.StreamRequestHandler):
+    """Server SMTP palsu: menerima semua email dengan jeda agar terasa seperti SMTP sungguhan."""
+    delay = 0.3
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self.reply("220 bench ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='ignore').strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply("250 bench")
+            elif command.startswith('DATA'):
+                self.reply("354 end with .")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                time.sleep(self.delay)
+                self.reply("250 queued")
+            elif command.startswith('QUIT'):
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+
+def bench_app():
+    """Factory yang dipanggil gunicorn: profil testing + SQLite file + SMTP palsu."""
+    from app import create_app
+    from app.config import TestingConfig
+
+    class BenchConfig(TestingConfig):
+        TESTING = False
+        APP_API_KEY = API_KEY
+        JWT_SECRET_KEY = JWT_SECRET
+        SQLALCHEMY_DATABASE_URI = os.environ['BENCH_DATABASE_URL']
+        MAIL_SERVER = '127.0.0.1'
+        MAIL_PORT = int(os.environ['BENCH_SMTP_PORT'])
+        MAIL_USE_TLS = False
+        MAIL_USE_SSL = False
+        MAIL_USERNAME = None
+        MAIL_PASSWORD = None
+        MAIL_DEFAULT_SENDER = 'bench@example.com'
+
+    return create_app(BenchConfig, cli=False)
+
+
+def seed(database_url):
+    """Mengisi database benchmark lalu mengembalikan JWT user biasa."""
+    from datetime import date, time as dtime, timedelta
+    from flask_jwt_extended import create_access_token
+    from app import db, bcrypt
+    from app.models import User, Product, Event
+
+    os.environ['BENCH_DATABASE_URL'] = database_url
+    os.environ.setdefault('BENCH_SMTP_PORT', '0')
+    app = bench_app()
+    with app.app_context():
+        db.create_all()
+        password_hash = bcrypt.generate_password_hash(PASSWORD).decode('utf-8')
+        users = [User(name=f"Bench {i}", email=f"bench{i}@example.com", password_hash=password_hash, role_id=2) for i in range(10)]
+        db.session.add_all(users)
+        db.session.add_all([Product(name=f"Produk {i}", description="x" * 200, price=1000 * i, stock=10) for i in range(200)])
+        db.session.add_all([
+            Event(name=f"Event {i}", description="y" * 300, event_date=date.today() + timedelta(days=i),
+                  start_time=dtime(20), end_time=dtime(23))
+            for i in range(50)
+        ])
+        db.session.commit()
+        return create_access_token(identity=users[0].id)
+
+
+def run_load(port, token, duration, clients):
+    """Menjalankan beban campuran dan mengembalikan statistik latensi."""
+    weights = [w for w, *_ in WORKLOAD]
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        rng = random.Random()
+        local = []
+        while time.perf_counter() < deadline:
+            _, method, path, needs_token, body = rng.choices(WORKLOAD, weights)[0]
+            headers = {'X-API-KEY': API_KEY, 'Content-Type': 'application/json'}
+            if needs_token:
+                headers['Authorization'] = f'Bearer {token}'
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=json.dumps(body) if body else None, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 500:
+                    with lock:
+                        errors[0] += 1
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "requests": count,
+        "rps": count / duration,
+        "p50_ms": latencies[count // 2] * 1000 if count else 0,
+        "p95_ms": latencies[int(count * 0.95)] * 1000 if count else 0,
+        "errors": errors[0],
+    }
+
+
+def wait_for_port(port, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/admin/')
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn tidak merespons")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--duration', type=int, default=10)
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    smtp = socketserver.ThreadingTCPServer(('127.0.0.1', 0), SlowSMTPHandler)
+    smtp.daemon_threads = True
+    threading.Thread(target=smtp.serve_forever, daemon=True).start()
+
+    workdir = tempfile.mkdtemp()
+    database_url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['BENCH_SMTP_PORT'] = str(smtp.server_address[1])
+    token = seed(database_url)
+
+    worker_classes = ['sync', 'gthread']
+    try:
+        import gevent  # noqa: F401
+        worker_classes.append('gevent')
+    except ImportError:
+        print("gevent tidak terpasang, worker gevent dilewati.")
+
+    env = dict(os.environ, BENCH_DATABASE_URL=database_url, WORKER_PROCESSES='0')
+    results = {}
+    for worker_class in worker_classes:
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', os.path.join(ROOT, 'gunicorn.conf.py'),
+             '--bind', f'127.0.0.1:{args.port}', '--workers', str(args.workers),
+             '--worker-class', worker_class, '--threads', str(args.threads),
+             '--access-logfile', '/dev/null', '--log-level', 'warning',
+             'benchmarks.worker_bench:bench_app()'],
+            cwd=ROOT, env=env,
+        )
+        try:
+            wait_for_port(args.port)
+            results[worker_class] = run_load(args.port, token, args.duration, args.clients)
+        finally:
+            process.terminate()
+            process.wait()
+
+    print(f"{'worker':10} {'req':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'error':>6}")
+    for worker_class, r in results.items():
+        print(f"{worker_class:10} {r['requests']:8d} {r['rps']:8.1f} {r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['errors']:6d}")
+    smtp.shutdown()
+
+
+if __name__ == '__main__':
+    main()
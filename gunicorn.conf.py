@@ -0,0 +1,54 @@
+# /my-api-project/gunicorn.conf.py
+# Konfigurasi gunicorn untuk production:
+#   gunicorn -c gunicorn.conf.py wsgi:app
+#
+# APP_PROFILE:
+#   production (default di wsgi.py/asgi.py) - pool DB 10 + overflow 20 per worker,
+#                       cukup untuk GUNICORN_THREADS thread plus POST /batch
+#                       concurrent. Profil development (pool 2 + 3) akan
+#                       kehabisan koneksi di bawah beban. Ukuran pool bisa
+#                       ditimpa dengan DB_POOL_SIZE / DB_MAX_OVERFLOW.
+#
+# GUNICORN_WORKER_CLASS:
+#   gthread (default) - beberapa thread per worker; bcrypt, SMTP dan upload
+#                       yang memblokir tidak lagi menahan seluruh worker.
+#   gevent            - cooperative worker (perlu `pip install gevent`), pakai
+#                       driver murni Python: DB_DRIVER=pymysql atau mysqlconnector.
+#   sync              - satu request per worker (perilaku lama).
+
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 500))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Restart worker secara berkala untuk membatasi kebocoran memori
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = 200
+
+# Dengan preload, app dibuat sekali di master lalu di-fork (startup lebih cepat,
+# memori dibagi); post_fork memastikan koneksi DB tidak ikut terbagi.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false').lower() in ['true', '1', 't']
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    # Tanpa preload, app baru dibuat di dalam worker sehingga tidak ada yang perlu direset.
+    # (Jangan memuat app di sini: gevent baru melakukan monkey patch setelah hook ini.)
+    if not server.cfg.preload_app:
+        return
+
+    from app.workers import after_fork
+
+    app = worker.app.wsgi()
+    if hasattr(app, 'app_context'):
+        after_fork(app)
@@ -0,0 +1,56 @@
+"""Add updated_at columns and tombstones table for delta sync
+
+Revision ID: 5d2e8a1c4f90
+Revises: 7b1f3c9a2d4e
+Create Date: 2026-10-19 14:03:27.118406
+
+"""
+from datetime import datetime, timezone
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e8a1c4f90'
+down_revision = '7b1f3c9a2d4e'
+branch_labels = None
+depends_on = None
+
+SYNCED_TABLES = ('events', 'tables', 'event_tables', 'products')
+
+
+def upgrade():
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tombstones', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tombstones_deleted_at'), ['deleted_at'], unique=False)
+
+    # Baris lama diisi waktu migrasi dalam UTC (aplikasi menyimpan datetime naive UTC, sedangkan
+    # CURRENT_TIMESTAMP mengikuti zona waktu server). Default hanya untuk backfill, lalu dihapus
+    # karena setelah itu nilainya diatur oleh aplikasi.
+    migrated_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    for table_name in SYNCED_TABLES:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=False,
+                                          server_default=migrated_at))
+            batch_op.create_index(batch_op.f(f'ix_{table_name}_updated_at'), ['updated_at'], unique=False)
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), existing_nullable=False,
+                                  server_default=None)
+
+
+def downgrade():
+    for table_name in reversed(SYNCED_TABLES):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_index(batch_op.f(f'ix_{table_name}_updated_at'))
+            batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('tombstones', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tombstones_deleted_at'))
+
+    op.drop_table('tombstones')
@@ -0,0 +1,38 @@
+"""Add FULLTEXT indexes on events and products for search
+
+Revision ID: 9a4c7e2b1d63
+Revises: 5d2e8a1c4f90
+Create Date: 2026-10-19 15:41:08.604217
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4c7e2b1d63'
+down_revision = '5d2e8a1c4f90'
+branch_labels = None
+depends_on = None
+
+FULLTEXT_INDEXES = (
+    ('ft_events_name_description', 'events', ['name', 'description']),
+    ('ft_events_name', 'events', ['name']),
+    ('ft_products_name_description', 'products', ['name', 'description']),
+    ('ft_products_name', 'products', ['name']),
+)
+
+
+def upgrade():
+    # FULLTEXT hanya ada di MySQL; dialek lain memakai inverted index di memori
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for name, table_name, columns in FULLTEXT_INDEXES:
+        op.create_index(name, table_name, columns, unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+    for name, table_name, _ in reversed(FULLTEXT_INDEXES):
+        op.drop_index(name, table_name=table_name)
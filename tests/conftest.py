@@ -0,0 +1,90 @@
+# /tests/conftest.py
+
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app, db, bcrypt
+from app.config import TestingConfig
+from app.query_budget import count_queries as _count_queries, seed
+
+API_KEY = 'test-api-key'
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """
+    Factory app untuk test: SQLite (default in-memory), folder upload/QR di tmp_path,
+    tabel sudah dibuat. Atribut konfigurasi bisa ditimpa lewat keyword, misalnya
+    make_app(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'test.db'}").
+    """
+    apps = []
+
+    def factory(**overrides):
+        settings = {
+            "SQLALCHEMY_DATABASE_URI": 'sqlite://',
+            "DB_REPLICA_URI": None,
+            "APP_API_KEY": API_KEY,
+            "JWT_SECRET_KEY": 'test-secret-test-secret-test-secret',
+            "TICKET_SIGNING_KEY": 'test-ticket-signing-key',
+            "ADMIN_WHATSAPP_NUMBER": '620000000000',
+            "UPLOAD_FOLDERS": {kind: str(tmp_path / kind) for kind in ("products", "events", "banners")},
+            "QR_CACHE_FOLDER": str(tmp_path / 'qrcodes'),
+            "METRICS_ENABLED": False,
+            "LOG_ASYNC": False,
+            "BCRYPT_LOG_ROUNDS": 4,
+            **overrides,
+        }
+        app = create_app(type('PytestConfig', (TestingConfig,), settings), cli=False)
+        with app.app_context():
+            db.create_all()
+        apps.append(app)
+        return app
+
+    yield factory
+
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def seeded(app):
+    """Data dari app.query_budget.seed skala 3; mengembalikan id yang dipakai test."""
+    with app.app_context():
+        return seed(3, bcrypt.generate_password_hash("password123").decode('utf-8'))
+
+
+@pytest.fixture
+def user_headers(app, seeded):
+    with app.app_context():
+        token = create_access_token(identity=seeded["user_id"])
+    return {'X-API-KEY': API_KEY, 'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def admin_headers(app, seeded):
+    with app.app_context():
+        token = create_access_token(identity=seeded["admin_id"])
+    return {'X-API-KEY': API_KEY, 'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Context manager penghitung query SQL (app.query_budget.count_queries):
+        with count_queries() as counter:
+            client.get('/user/events', headers=user_headers)
+        assert counter.count <= 2
+    """
+    return _count_queries
@@ -0,0 +1,64 @@
+# /tests/test_archive.py
+
+from datetime import date, datetime, timedelta
+from app import db
+from app.archive import archive_past_events
+from app.models import (Event, Reservation, OrderItem, Ticket, PaymentStatus,
+                        ReservationArchive, OrderItemArchive, TicketArchive)
+
+
+def _age_first_event(seeded, days=400):
+    """Event pertama di data seed memegang semua reservasi dan tiket; dipindah ke masa lalu."""
+    event = db.session.get(Event, seeded["event_id"])
+    event.event_date = date.today() - timedelta(days=days)
+    db.session.commit()
+
+
+def test_dry_run_matches_real_run(app, seeded):
+    with app.app_context():
+        _age_first_event(seeded)
+        preview = archive_past_events(180, dry_run=True)
+        assert db.session.query(Reservation).count() == 3
+
+        counts = archive_past_events(180, batch_size=2)
+        again = archive_past_events(180)
+
+        assert preview == {"reservations": 3, "order_items": 3, "tickets": 3}
+        assert {key: counts[key] for key in preview} == preview
+        assert (db.session.query(Reservation).count(), db.session.query(OrderItem).count(),
+                db.session.query(Ticket).count()) == (0, 0, 0)
+        assert (db.session.query(ReservationArchive).count(), db.session.query(OrderItemArchive).count(),
+                db.session.query(TicketArchive).count()) == (3, 3, 3)
+        assert {key: again[key] for key in preview} == {"reservations": 0, "order_items": 0, "tickets": 0}
+
+
+def test_recent_events_are_not_archived(app, seeded):
+    with app.app_context():
+        _age_first_event(seeded, days=30)
+        assert archive_past_events(180, dry_run=True) == {"reservations": 0, "order_items": 0, "tickets": 0}
+
+
+def test_reservation_history_merges_archive_by_date(app, seeded, client, user_headers):
+    now = datetime.utcnow().replace(microsecond=0)
+    with app.app_context():
+        old = db.session.query(Reservation).order_by(Reservation.id).all()
+        for reservation, days in zip(old, (10, 30, 50)):
+            reservation.created_at = now - timedelta(days=days)
+        live = Reservation(user_id=seeded["user_id"], event_table_id=seeded["free_event_table_id"],
+                           number_of_guests=2, total_amount=100000, payment_status=PaymentStatus.PAID,
+                           created_at=now - timedelta(days=20))
+        db.session.add(live)
+        db.session.commit()
+        _age_first_event(seeded)
+        archive_past_events(180)
+
+    current = client.get('/reservations/my-reservations', headers=user_headers).get_json()
+    history = client.get('/reservations/my-reservations?history=1', headers=user_headers).get_json()
+
+    assert len(current) == 1
+    assert [(r["reservation_date"], r["archived"]) for r in history] == [
+        ((now - timedelta(days=10)).isoformat(), True),
+        ((now - timedelta(days=20)).isoformat(), False),
+        ((now - timedelta(days=30)).isoformat(), True),
+        ((now - timedelta(days=50)).isoformat(), True),
+    ]
@@ -0,0 +1,84 @@
+# /tests/test_batch.py
+
+import pytest
+from flask_jwt_extended import create_access_token
+from app import db, bcrypt
+from app.query_budget import seed
+
+HOME_SCREEN = [
+    {"id": "events", "path": "/user/events"},
+    {"id": "products", "path": "/products/"},
+    {"id": "reservations", "path": "/reservations/my-reservations"},
+    {"id": "tickets", "path": "/reservations/my-tickets"},
+]
+
+
+@pytest.fixture
+def file_app(make_app, tmp_path):
+    """Batch concurrent butuh koneksi per thread, jadi dipakai SQLite berbasis file (QueuePool)."""
+    def factory(**overrides):
+        app = make_app(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'batch.db'}", **overrides)
+        with app.app_context():
+            ids = seed(3, bcrypt.generate_password_hash("password123").decode('utf-8'))
+            token = create_access_token(identity=ids["user_id"])
+        return app, {'X-API-KEY': app.config['APP_API_KEY'], 'Authorization': f'Bearer {token}'}
+    return factory
+
+
+def test_sub_responses_match_direct_calls(client, user_headers):
+    response = client.post('/batch', headers=user_headers, json={"requests": HOME_SCREEN})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["concurrent"] is False
+    assert [r["id"] for r in data["responses"]] == [item["id"] for item in HOME_SCREEN]
+    for item, result in zip(HOME_SCREEN, data["responses"]):
+        direct = client.get(item["path"], headers=user_headers)
+        assert (result["status"], result["body"]) == (direct.status_code, direct.get_json())
+
+
+def test_concurrent_batch_on_file_database(file_app):
+    app, headers = file_app()
+    client = app.test_client()
+
+    sequential = client.post('/batch', headers=headers, json={"requests": HOME_SCREEN}).get_json()
+    concurrent = client.post('/batch', headers=headers, json={"requests": HOME_SCREEN, "concurrent": True}).get_json()
+
+    assert concurrent["concurrent"] is True
+    assert all(r["status"] == 200 for r in concurrent["responses"])
+    assert concurrent["responses"] == sequential["responses"]
+    with app.app_context():
+        assert db.engine.pool.checkedout() == 0
+
+
+def test_concurrent_batch_falls_back_without_pool_headroom(file_app):
+    app, headers = file_app(SQLALCHEMY_ENGINE_OPTIONS={"pool_size": 2, "max_overflow": 0, "pool_timeout": 1})
+    client = app.test_client()
+
+    with app.app_context():
+        # Satu koneksi dipegang request lain; sisa satu koneksi tidak cukup untuk beberapa thread
+        with db.engine.connect():
+            response = client.post('/batch', headers=headers, json={"requests": HOME_SCREEN, "concurrent": True})
+        assert db.engine.pool.stats.timeouts == 0
+
+    assert response.status_code == 200
+    assert response.get_json()["concurrent"] is False
+    assert all(r["status"] == 200 for r in response.get_json()["responses"])
+
+
+@pytest.mark.parametrize('body, message', [
+    ({"requests": []}, "tidak kosong"),
+    ({"requests": [{"path": "/user/events", "method": "POST"}]}, "hanya GET"),
+    ({"requests": [{"path": "/batch"}]}, "bersarang"),
+    ({"requests": [{"path": "user/events"}]}, "diawali"),
+    ({"requests": [{"path": "/user/events"}] * 11}, "Maksimal"),
+])
+def test_batch_rejects_invalid_requests(client, user_headers, body, message):
+    response = client.post('/batch', headers=user_headers, json=body)
+    assert response.status_code == 400
+    assert message in response.get_json()["error"]
+
+
+def test_batch_requires_token(client, user_headers):
+    response = client.post('/batch', headers={'X-API-KEY': user_headers['X-API-KEY']}, json={"requests": HOME_SCREEN})
+    assert response.status_code == 401
@@ -0,0 +1,166 @@
+# /tests/test_checkin.py
+
+import threading
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event as sa_event
+from app import db
+from app.checkin import (check_in, sync_scans, scanned_codes,
+                         CHECKED_IN, ALREADY_USED, INVALID, NOT_FOUND, WRONG_EVENT)
+from app.models import Ticket
+from app.ticket_codes import sign_ticket, verify_ticket, event_key
+
+
+@pytest.fixture(autouse=True)
+def forget_scanned_codes():
+    # Cache kode terpakai bersifat global per proses, sedangkan id event berulang antar test
+    scanned_codes.forget()
+    yield
+    scanned_codes.forget()
+
+
+def _signed_tickets(seeded, count):
+    """Membuat `count` tiket baru untuk event seeded dengan kode bertanda tangan."""
+    expires_at = datetime.utcnow().replace(microsecond=0) + timedelta(days=7)
+    tickets = []
+    for i in range(count):
+        ticket = Ticket(ticket_code=f"TMP-{i}", user_id=seeded["user_id"],
+                        event_id=seeded["event_id"], expires_at=expires_at)
+        db.session.add(ticket)
+        db.session.flush()
+        ticket.ticket_code = sign_ticket(ticket.id, seeded["event_id"], expires_at)
+        tickets.append(ticket)
+    db.session.commit()
+    return [ticket.ticket_code for ticket in tickets]
+
+
+def test_signed_code_verifies_and_rejects_tampering(app):
+    expires_at = datetime.utcnow() + timedelta(days=1)
+    with app.app_context():
+        code = sign_ticket(41, 7, expires_at)
+        claims = verify_ticket(code)
+        assert claims["ticket_id"] == 41 and claims["event_id"] == 7 and not claims["expired"]
+
+        # Karakter terakhir base32 punya bit sisa yang tidak ikut di-decode, jadi ubah bagian tengah
+        for i in (10, len(code) - 5):
+            tampered = code[:i] + ('A' if code[i] != 'A' else 'B') + code[i + 1:]
+            assert verify_ticket(tampered) is None
+        # Kunci event lain tidak bisa dipakai untuk memverifikasi (atau memalsukan) tiket event ini
+        assert verify_ticket(code, key=event_key(8)) is None
+        assert verify_ticket(sign_ticket(41, 7, expires_at, key=event_key(8))) is None
+        assert verify_ticket(code, now=expires_at.timestamp() + 1)["expired"]
+
+
+def test_check_in_rejects_other_event_without_database(app, seeded, count_queries):
+    with app.app_context():
+        code = _signed_tickets(seeded, 1)[0]
+        with count_queries() as counter:
+            result, _ = check_in(seeded["event_id"] + 1, code)
+    assert result == WRONG_EVENT
+    assert counter.count == 0
+
+
+def test_concurrent_scans_check_in_once(make_app, tmp_path):
+    from app.query_budget import seed
+    app = make_app(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'checkin.db'}")
+    with app.app_context():
+        seeded = seed(2, 'x')
+        code = _signed_tickets(seeded, 1)[0]
+
+    results = []
+    barrier = threading.Barrier(4)
+
+    def scan():
+        with app.app_context():
+            barrier.wait()
+            results.append(check_in(seeded["event_id"], code)[0])
+            db.session.remove()
+
+    threads = [threading.Thread(target=scan) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == sorted([CHECKED_IN] + [ALREADY_USED] * 3)
+
+
+def test_sync_scans_classifies_each_code(app, seeded):
+    scanned_at = datetime(2026, 1, 1, 20, 0, 0)
+    with app.app_context():
+        fresh, used, archived = _signed_tickets(seeded, 3)
+        db.session.query(Ticket).filter_by(ticket_code=used).update(
+            {"is_used": True, "used_at": scanned_at - timedelta(minutes=5)})
+        # Kode valid yang barisnya sudah tidak ada (dihapus / dipindah ke tickets_archive)
+        db.session.query(Ticket).filter_by(ticket_code=archived).delete()
+        db.session.commit()
+
+        report = sync_scans(seeded["event_id"], [
+            {"ticket_code": fresh, "used_at": scanned_at + timedelta(microseconds=500)},
+            {"ticket_code": fresh, "used_at": scanned_at + timedelta(minutes=1)},
+            {"ticket_code": used, "used_at": scanned_at},
+            {"ticket_code": archived, "used_at": scanned_at},
+            {"ticket_code": "TIX-BUKAN-KODE-VALID", "used_at": scanned_at},
+        ])
+        stored = db.session.query(Ticket.used_at).filter_by(ticket_code=fresh).scalar()
+
+    assert report["accepted"] == 1
+    assert stored == scanned_at
+    assert [c["ticket_code"] for c in report["conflicts"]] == [used]
+    assert {(r["ticket_code"], r["reason"]) for r in report["rejected"]} == {
+        (archived, NOT_FOUND), ("TIX-BUKAN-KODE-VALID", INVALID),
+    }
+
+
+def test_sync_scans_reports_gate_that_won_between_select_and_update(app, seeded):
+    scanned_at = datetime(2026, 1, 1, 20, 0, 0)
+    other_gate_at = scanned_at + timedelta(seconds=3)
+    with app.app_context():
+        code = _signed_tickets(seeded, 1)[0]
+
+        # Gerbang lain menandai tiket tepat sebelum UPDATE batch dijalankan
+        def other_gate(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('UPDATE tickets'):
+                cursor.execute("UPDATE tickets SET is_used = 1, used_at = ? WHERE ticket_code = ?",
+                               (other_gate_at.isoformat(sep=' '), code))
+
+        sa_event.listen(db.engine, 'before_cursor_execute', other_gate)
+        try:
+            report = sync_scans(seeded["event_id"], [{"ticket_code": code, "used_at": scanned_at}])
+        finally:
+            sa_event.remove(db.engine, 'before_cursor_execute', other_gate)
+
+    assert report["accepted"] == 0
+    assert report["conflicts"] == [{"ticket_code": code, "used_at": other_gate_at.isoformat()}]
+
+
+def test_sync_route_resent_batch_is_idempotent(app, seeded, client, admin_headers):
+    with app.app_context():
+        first, second = _signed_tickets(seeded, 2)
+    payload = {"scans": [
+        {"ticket_code": first, "used_at": "2026-01-01T20:00:00.250000"},
+        {"ticket_code": second, "used_at": "2026-01-01T20:01:00"},
+    ]}
+
+    responses = [client.post(f"/checkin/events/{seeded['event_id']}/sync", headers=admin_headers, json=payload)
+                 for _ in range(2)]
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert [response.get_json() for response in responses] == [{"accepted": 2, "conflicts": [], "rejected": []}] * 2
+
+
+def test_sync_route_accepts_mixed_offsets(app, seeded, client, admin_headers):
+    with app.app_context():
+        naive, aware = _signed_tickets(seeded, 2)
+
+    response = client.post(f"/checkin/events/{seeded['event_id']}/sync", headers=admin_headers, json={"scans": [
+        {"ticket_code": naive, "used_at": "2026-01-01T20:00:00"},
+        {"ticket_code": aware, "used_at": "2026-01-02T03:00:00+07:00"},
+        {"ticket_code": aware, "used_at": "2026-01-01T21:00:00"},
+    ]})
+
+    assert response.status_code == 200
+    assert response.get_json()["accepted"] == 2
+    with app.app_context():
+        stored = db.session.query(Ticket.used_at).filter_by(ticket_code=aware).scalar()
+    assert stored == datetime(2026, 1, 1, 20, 0, 0)
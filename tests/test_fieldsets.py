@@ -0,0 +1,31 @@
+# /tests/test_fieldsets.py
+
+
+def test_products_return_only_requested_fields(seeded, client, user_headers, count_queries):
+    with count_queries() as counter:
+        response = client.get('/user/products', query_string={'fields': 'price,name'}, headers=user_headers)
+
+    assert response.status_code == 200
+    # Urutan mengikuti spec, bukan query string
+    assert [list(p) for p in response.get_json()] == [["name", "price"]] * 3
+    select = counter.statements[-1]
+    assert "products.price" in select and "products.description" not in select
+
+
+def test_unknown_field_is_rejected(seeded, client, user_headers):
+    response = client.get('/user/products', query_string={'fields': 'name,harga'}, headers=user_headers)
+    assert response.status_code == 400
+    assert "harga" in response.get_json()["error"]
+
+
+def test_event_detail_includes(seeded, client, user_headers):
+    path = f"/user/events/{seeded['event_id']}"
+
+    full = client.get(path, headers=user_headers).get_json()
+    slim = client.get(path, query_string={'fields': 'id,name'}, headers=user_headers).get_json()
+    with_tables = client.get(path, query_string={'fields': 'id', 'include': 'tables'}, headers=user_headers).get_json()
+
+    assert len(full["tables"]) == 3 and "description" in full
+    assert slim == {"id": seeded["event_id"], "name": full["name"]}
+    assert set(with_tables) == {"id", "tables"} and with_tables["tables"] == full["tables"]
+    assert client.get(path, query_string={'include': 'meja'}, headers=user_headers).status_code == 400
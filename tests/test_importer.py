@@ -0,0 +1,111 @@
+# /tests/test_importer.py
+
+import io
+from app import db
+from app.importer import import_rows
+from app.models import Product, Table
+
+
+def _import(kind, content, filename, **kwargs):
+    report = import_rows(kind, io.BytesIO(content.encode('utf-8')), filename, **kwargs)
+    db.session.commit()
+    return report
+
+
+def test_csv_upsert(app):
+    with app.app_context():
+        table = Table(name="Meja 1", type="Round", capacity=4, price=100)
+        db.session.add(table)
+        db.session.commit()
+
+        report = _import('tables', (
+            "id,name,type,capacity,price\n"
+            f"{table.id},Meja VIP,Square,6,250\n"
+            ",Meja 2,Round,4,100\n"
+        ), 'meja.csv')
+
+        assert (report["inserted"], report["updated"], report["error_count"]) == (1, 1, 0)
+        assert (table.name, table.capacity, table.price) == ("Meja VIP", 6, 250)
+        assert db.session.query(Table).count() == 2
+
+
+def test_jsonl_upsert(app):
+    with app.app_context():
+        product = Product(name="Bir", price=30000, stock=10)
+        db.session.add(product)
+        db.session.commit()
+
+        report = _import('products', (
+            f'{{"id": {product.id}, "name": "Bir Dingin", "price": 35000, "stock": 8}}\n'
+            '\n'
+            '{"name": "Es Teh", "price": 10000, "stock": 50}\n'
+        ), 'produk.jsonl')
+
+        assert (report["processed"], report["inserted"], report["updated"]) == (2, 1, 1)
+        assert (product.name, product.price, product.stock) == ("Bir Dingin", 35000, 8)
+
+
+def test_invalid_rows_are_reported_per_line(app):
+    with app.app_context():
+        report = _import('products', (
+            "name,price,stock\n"
+            "Kacang,5000,20\n"
+            ",abc,-1\n"
+            "Keripik,7000,\n"
+        ), 'produk.csv')
+
+        assert (report["inserted"], report["error_count"]) == (1, 2)
+        assert report["errors"] == [
+            {"row": 3, "errors": ["name wajib diisi", "price harus berupa integer", "stock minimal 0"]},
+            {"row": 4, "errors": ["stock harus berupa integer"]},
+        ]
+
+        jsonl = _import('products', 'bukan json\n[1, 2]\n', 'produk.jsonl')
+        assert [error["row"] for error in jsonl["errors"]] == [1, 2]
+
+
+def test_duplicate_id_in_file_is_rejected(app):
+    with app.app_context():
+        product = Product(name="Bir", price=30000, stock=10)
+        db.session.add(product)
+        db.session.commit()
+
+        report = _import('products', (
+            "id,name,price,stock\n"
+            f"{product.id},Bir A,1,1\n"
+            f"{product.id},Bir B,2,2\n"
+        ), 'produk.csv')
+
+        assert report["updated"] == 1
+        assert report["errors"] == [{"row": 3, "errors": [f"id {product.id} muncul lebih dari sekali di file"]}]
+        assert product.name == "Bir A"
+
+
+def test_update_only_touches_columns_in_file(app):
+    with app.app_context():
+        product = Product(name="A", description="Deskripsi lama", price=10, stock=5,
+                          image_url="/static/product_images/a.png")
+        other = Product(name="B", price=10, stock=5, image_url="/static/product_images/b.png")
+        db.session.add_all([product, other])
+        db.session.commit()
+
+        report = _import('products', (
+            f'{{"id": {product.id}, "name": "A2", "price": 20, "stock": 6}}\n'
+            f'{{"id": {other.id}, "stock": 0}}\n'
+        ), 'produk.jsonl')
+
+        assert (report["updated"], report["error_count"]) == (2, 0)
+        assert (product.name, product.price, product.stock) == ("A2", 20, 6)
+        assert (product.description, product.image_url) == ("Deskripsi lama", "/static/product_images/a.png")
+        assert (other.name, other.stock, other.image_url) == ("B", 0, "/static/product_images/b.png")
+
+
+def test_unknown_id_needs_all_required_columns(app):
+    with app.app_context():
+        report = _import('products', "id,stock\n999,3\n", 'produk.csv')
+
+        assert (report["inserted"], report["updated"]) == (0, 0)
+        assert report["errors"] == [{"row": 2, "errors": [
+            "name wajib diisi (id 999 belum ada)", "price wajib diisi (id 999 belum ada)",
+        ]}]
+        assert db.session.get(Product, 999) is None
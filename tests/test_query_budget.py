@@ -0,0 +1,45 @@
+# /tests/test_query_budget.py
+
+import pytest
+from app.query_budget import DEFAULT_SCALES, ROUTE_CHECKS, UNBUDGETED_ENDPOINTS, measure_routes
+
+
+@pytest.fixture(scope='module')
+def measurements():
+    """Jumlah query per route di setiap skala data, diukur sekali untuk seluruh modul."""
+    return {scale: measure_routes(scale) for scale in DEFAULT_SCALES}
+
+
+@pytest.mark.parametrize('check', ROUTE_CHECKS, ids=lambda check: f"{check.method} {check.path}")
+def test_query_count_constant_and_within_budget(measurements, check):
+    statuses = {scale: measurements[scale][check.endpoint, check.path][0] for scale in DEFAULT_SCALES}
+    counts = {scale: measurements[scale][check.endpoint, check.path][1] for scale in DEFAULT_SCALES}
+
+    assert all(status < 500 for status in statuses.values()), statuses
+    assert len(set(counts.values())) == 1, f"jumlah query bertambah seiring jumlah data (N+1): {counts}"
+    assert max(counts.values()) <= check.budget, f"melebihi budget {check.budget}: {counts}"
+
+
+def test_count_queries_only_counts_inside_block(app, seeded, client, user_headers, count_queries):
+    with count_queries() as counter:
+        response = client.get('/user/events', headers=user_headers)
+    assert response.status_code == 200
+    counted = counter.count
+    assert counted >= 1
+
+    client.get('/user/events', headers=user_headers)
+    assert counter.count == counted
+    with count_queries() as nested:
+        client.get('/user/tables', headers=user_headers)
+    assert nested.count == 1
+
+
+def test_budgets_match_registered_endpoints(app):
+    methods = {}
+    for rule in app.url_map.iter_rules():
+        methods.setdefault(rule.endpoint, set()).update(rule.methods)
+    budgeted = {check.endpoint for check in ROUTE_CHECKS}
+
+    assert sorted(budgeted - methods.keys()) == [], "label RouteCheck tidak cocok dengan endpoint mana pun"
+    unbudgeted = {endpoint for endpoint, allowed in methods.items() if 'GET' in allowed}
+    assert sorted(unbudgeted - budgeted - UNBUDGETED_ENDPOINTS) == [], "endpoint GET tanpa budget query"
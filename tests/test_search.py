@@ -0,0 +1,65 @@
+# /tests/test_search.py
+
+from datetime import timedelta
+from app import db
+from app.models import Product
+from app.search import InvertedIndex, SEARCHABLE, parse_query
+
+
+def _names(index, q):
+    ids = [row_id for row_id, _ in index.search(parse_query(q))]
+    return [db.session.get(Product, row_id).name for row_id in ids]
+
+
+def test_index_follows_updates_and_deletes(app):
+    with app.app_context():
+        sofa = Product(name="Sofa Merah", description="sofa kulit", price=1, stock=5)
+        chair = Product(name="Kursi Lipat", price=1, stock=5)
+        db.session.add_all([sofa, chair])
+        db.session.commit()
+
+        index = InvertedIndex(*SEARCHABLE['products'])
+        index.refresh(db.session)
+        assert _names(index, "sofa") == ["Sofa Merah"]
+        assert _names(index, "kur lip") == ["Kursi Lipat"]
+
+        sofa.name = "Sofa Biru"
+        chair.stock = 0  # stok habis -> tidak tampil
+        db.session.commit()
+        index.refresh(db.session)
+        assert _names(index, "biru") == ["Sofa Biru"]
+        assert _names(index, "merah") == []
+        assert _names(index, "kursi") == []
+
+        db.session.delete(sofa)
+        db.session.commit()
+        index.refresh(db.session)
+        assert index.search(parse_query("sofa")) == []
+
+
+def test_refresh_picks_up_rows_that_commit_late(app):
+    with app.app_context():
+        db.session.add(Product(name="Kursi Tinggi", price=1, stock=5))
+        db.session.commit()
+        index = InvertedIndex(*SEARCHABLE['products'], overlap_seconds=60)
+        index.refresh(db.session)
+
+        # updated_at diisi sebelum refresh terakhir, tetapi transaksinya baru commit sekarang
+        late = Product(name="Meja Bar", price=1, stock=5, updated_at=index.synced_at - timedelta(seconds=5))
+        db.session.add(late)
+        db.session.commit()
+
+        index.refresh(db.session)
+        assert _names(index, "meja") == ["Meja Bar"]
+
+        # Baris yang sama terproses ulang di dalam jendela overlap tanpa menggandakan skor
+        score = index.search(parse_query("meja"))[0][1]
+        index.refresh(db.session)
+        assert index.search(parse_query("meja"))[0][1] == score
+
+
+def test_search_route(seeded, client, user_headers):
+    response = client.get('/user/search', query_string={'q': 'produk', 'type': 'products'}, headers=user_headers)
+
+    assert response.status_code == 200
+    assert response.get_json()['products']['total'] == 3
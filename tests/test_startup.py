@@ -0,0 +1,15 @@
+# /tests/test_startup.py
+
+from app.config import TestingConfig
+from app.startup import profile_startup
+
+
+def test_create_app_within_startup_budget():
+    # Cold start di proses baru (APP_PROFILE=testing -> create_app(TestingConfig, cli=False)),
+    # karena di proses pytest semua modul sudah terlanjur di-import
+    report = profile_startup(cli=False, repeat=3, profile=TestingConfig.PROFILE_NAME)
+    assert report["create_app_ms"] <= TestingConfig.STARTUP_BUDGET_MS, (
+        f"create_app() {report['create_app_ms']:.0f} ms, batas {TestingConfig.STARTUP_BUDGET_MS:.0f} ms"
+    )
+    # Server tidak boleh memuat Alembic (lihat parameter cli di create_app)
+    assert not any(m["module"].split('.')[0] == 'alembic' for m in report["modules"])
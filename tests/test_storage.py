@@ -0,0 +1,85 @@
+# /tests/test_storage.py
+
+import io
+import os
+import time
+from werkzeug.datastructures import FileStorage
+from app import db
+from app.models import Product
+from app.storage import save_upload, prune_orphans, TEMP_PREFIX
+
+
+def _upload(content, filename='foto.png'):
+    return FileStorage(stream=io.BytesIO(content), filename=filename)
+
+
+def _age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_same_content_is_stored_once(app):
+    with app.app_context():
+        url, path, created = save_upload(_upload(b'gambar-a'), 'products')
+        again_url, again_path, again_created = save_upload(_upload(b'gambar-a', 'lain.png'), 'products')
+        other_url, _, _ = save_upload(_upload(b'gambar-b'), 'products')
+
+    assert created and not again_created
+    assert (again_url, again_path) == (url, path)
+    assert other_url != url
+    assert not [name for name in os.listdir(os.path.dirname(path)) if name.startswith(TEMP_PREFIX)]
+
+
+def test_deleting_a_product_leaves_the_file_for_the_sweep(app, client, admin_headers):
+    with app.app_context():
+        url, path, _ = save_upload(_upload(b'gambar-a'), 'products')
+        product = Product(name="Sofa", price=1, stock=1, image_url=url)
+        db.session.add(product)
+        db.session.commit()
+        product_id = product.id
+
+    assert client.delete(f"/admin/products/{product_id}", headers=admin_headers).status_code == 200
+    assert os.path.exists(path)
+
+    _age(path, 7200)
+    with app.app_context():
+        assert prune_orphans('products', dry_run=True) == [url]
+        assert os.path.exists(path)
+        assert prune_orphans('products') == [url]
+    assert not os.path.exists(path)
+
+
+def test_sweep_keeps_referenced_and_recently_reused_files(app):
+    with app.app_context():
+        kept_url, kept_path, _ = save_upload(_upload(b'dipakai'), 'products')
+        db.session.add(Product(name="Meja", price=1, stock=1, image_url=kept_url))
+        db.session.commit()
+        _age(kept_path, 7200)
+
+        # File lama tanpa referensi, lalu dipakai ulang oleh upload yang belum commit
+        reused_url, reused_path, _ = save_upload(_upload(b'dipakai-ulang'), 'products')
+        _age(reused_path, 7200)
+        assert save_upload(_upload(b'dipakai-ulang'), 'products')[2] is False
+
+        assert prune_orphans('products') == []
+        db.session.add(Product(name="Kursi", price=1, stock=1, image_url=reused_url))
+        db.session.commit()
+
+    assert os.path.exists(kept_path) and os.path.exists(reused_path)
+
+
+def test_sweep_removes_abandoned_temp_files(app):
+    folder = app.config['UPLOAD_FOLDERS']['products']
+    os.makedirs(folder, exist_ok=True)
+    stale = os.path.join(folder, f"{TEMP_PREFIX}gagal")
+    fresh = os.path.join(folder, f"{TEMP_PREFIX}berjalan")
+    for path in (stale, fresh):
+        with open(path, 'wb') as f:
+            f.write(b'x')
+    _age(stale, 7200)
+
+    with app.app_context():
+        assert prune_orphans('products') == []
+
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
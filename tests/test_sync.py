@@ -0,0 +1,65 @@
+# /tests/test_sync.py
+
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import update
+from app import db
+from app.models import Event, Table, EventTable, Product
+from app.sync import parse_since
+
+
+def _backdate_all(days=2):
+    """Semua baris seed dianggap sudah lama tidak berubah."""
+    past = datetime.utcnow() - timedelta(days=days)
+    for model in (Event, Table, EventTable, Product):
+        db.session.execute(update(model).values(updated_at=past))
+    db.session.commit()
+
+
+def test_parse_since_normalizes_to_naive_utc():
+    assert parse_since(None) is None
+    assert parse_since('2026-10-19T08:00:00Z') == datetime(2026, 10, 19, 8, 0, 0)
+    assert parse_since('2026-10-19T15:00:00+07:00') == datetime(2026, 10, 19, 8, 0, 0)
+    with pytest.raises(ValueError):
+        parse_since('kemarin')
+
+
+def test_full_sync_without_since(seeded, client, user_headers):
+    data = client.get('/user/sync', headers=user_headers).get_json()
+
+    assert data["full"] is True
+    assert (len(data["events"]), len(data["tables"]), len(data["event_tables"]), len(data["products"])) == (3, 3, 9, 3)
+    assert data["next_since"].endswith('Z')
+
+
+def test_delta_contains_only_changes_and_deletions(app, seeded, client, user_headers):
+    with app.app_context():
+        _backdate_all()
+        temporary = Product(name="Promo", price=1, stock=1)
+        db.session.add(temporary)
+        db.session.commit()
+        temporary_id = temporary.id
+        since = (datetime.utcnow() - timedelta(hours=1)).isoformat() + 'Z'
+
+        db.session.get(Product, seeded["product_id"]).price = 12345
+        db.session.delete(temporary)
+        db.session.commit()
+
+    data = client.get('/user/sync', query_string={'since': since}, headers=user_headers).get_json()
+
+    assert data["full"] is False
+    assert [(p["id"], p["price"]) for p in data["products"]] == [(seeded["product_id"], 12345)]
+    assert data["events"] == data["tables"] == data["event_tables"] == []
+    assert data["deleted"]["products"] == [temporary_id]
+
+
+def test_since_older_than_tombstone_retention_gets_full_sync(app, seeded, client, user_headers):
+    days = app.config['SYNC_TOMBSTONE_RETENTION_DAYS'] + 1
+    since = (datetime.utcnow() - timedelta(days=days)).isoformat() + 'Z'
+    data = client.get('/user/sync', query_string={'since': since}, headers=user_headers).get_json()
+    assert data["full"] is True
+
+
+def test_invalid_since_is_rejected(seeded, client, user_headers):
+    response = client.get('/user/sync', query_string={'since': 'kemarin'}, headers=user_headers)
+    assert response.status_code == 400
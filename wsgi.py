@@ -0,0 +1,11 @@
+# /my-api-project/wsgi.py
+# Entry point production, contoh:
+#   gunicorn -c gunicorn.conf.py wsgi:app
+# Profil default di sini 'production' (pool sesuai jumlah thread gunicorn);
+# APP_PROFILE tetap bisa dipakai untuk memilih profil lain.
+
+import os
+from app import create_app
+from app.config import get_config
+
+app = create_app(get_config(os.getenv('APP_PROFILE') or 'production'), cli=False)